@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Multi-format export of one in-memory keyword analysis
+Builds the keyword and summary records once, then streams Markdown, JSON,
+CSV and Parquet (when pyarrow is installed) to disk concurrently
+"""
+
+import functools
+import importlib.util
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from csv_export import ExportStats, KeywordRow, parse_money, sorted_by_volume, write_keywords_csv
+from keyword_record import KeywordRecord
+from keyword_schema import BUDGET_SHARE
+from report_renderer import ReportRenderer
+
+# Category lists merged, in this order, into the recommended keyword CSV
+CSV_CATEGORIES = (
+    'high_priority_keywords',
+    'medium_priority_keywords',
+    'low_competition_opportunities',
+    'section_179_keywords',
+    'treatment_specific_keywords'
+)
+
+EXPORT_FORMATS = ('markdown', 'json', 'csv', 'parquet')
+
+# Output file names, relative to the export directory
+DEFAULT_PATHS = {
+    'markdown': 'keyword_analysis_report.md',
+    'json': 'keyword_analysis_data.json',
+    'csv': 'curamedix_keywords.csv',
+    'all_csv': 'curamedix_all_keywords.csv',
+    'parquet': 'curamedix_all_keywords.parquet'
+}
+
+# Rows per Parquet record batch, so the writer never holds a full column copy
+PARQUET_BATCH_ROWS = 65_536
+
+
+def category_keyword_rows(analysis: Dict) -> List[KeywordRow]:
+    """Unique keywords across the category lists, first occurrence wins
+
+    Takes KeywordRecords from a live analysis as they are, and parses the
+    formatted rows of an analysis read back from JSON.
+    """
+    rows: Dict[str, KeywordRow] = {}
+    for category in CSV_CATEGORIES:
+        for keyword_data in analysis.get(category, ()):
+            keyword = keyword_data['keyword']
+            if keyword in rows:
+                continue
+            if isinstance(keyword_data, KeywordRecord):
+                rows[keyword] = keyword_data.row()
+            else:
+                rows[keyword] = (
+                    keyword,
+                    keyword_data['volume'],
+                    parse_money(keyword_data['cpc']),
+                    keyword_data['competition']
+                )
+    return list(rows.values())
+
+
+class ExportRecords:
+    """Keyword rows and summary statistics shared by every writer
+
+    The recommended keywords are parsed and sorted here, once. The full
+    keyword list is never held: all_rows is a zero-argument callable
+    returning a fresh row iterator (e.g. KeywordStore.iter_rows of a
+    store view), and every writer streams its own pass over it. Pass
+    presorted=True when those rows already come by volume descending
+    (e.g. KeywordStore.sorted_by_volume()); otherwise each pass goes
+    through the on-disk external sort.
+    """
+
+    def __init__(self, analysis: Dict, all_rows: Optional[Callable[[], Iterable[KeywordRow]]] = None,
+                 presorted: bool = False):
+        self.analysis = analysis
+        self.keywords = list(sorted_by_volume(category_keyword_rows(analysis)))
+        self._all_rows = all_rows
+        self.presorted = presorted
+
+    @property
+    def has_all_keywords(self) -> bool:
+        return self._all_rows is not None
+
+    def all_keywords(self) -> Iterator[KeywordRow]:
+        """A new pass over the full keyword list by volume descending"""
+        rows = iter(self._all_rows())
+        return rows if self.presorted else sorted_by_volume(rows)
+
+    def table_rows(self) -> Iterable[KeywordRow]:
+        """The full keyword list when given, else the recommended keywords"""
+        return self.all_keywords() if self.has_all_keywords else self.keywords
+
+    @functools.cached_property
+    def summary(self) -> ExportStats:
+        """Totals over the full keyword list, computed on first use"""
+        stats = ExportStats()
+        for _, volume, cpc, competition in self.table_rows():
+            stats.add(volume, cpc, competition.capitalize())
+        return stats
+
+    def summary_record(self) -> Dict:
+        return {
+            'keywords': self.summary.rows,
+            'total_monthly_searches': self.summary.total_volume,
+            'average_cpc': round(self.summary.average_cpc, 2),
+            'competition': self.summary.competition
+        }
+
+
+def write_parquet(path: str, rows: Iterable[KeywordRow], summary: Dict,
+                  batch_rows: int = PARQUET_BATCH_ROWS):
+    """Stream keyword rows to Parquet in record batches; needs pyarrow"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('keyword', pa.string()),
+        ('volume', pa.int64()),
+        ('cpc', pa.float64()),
+        ('competition', pa.dictionary(pa.int8(), pa.string())),
+        ('monthly_budget_estimate', pa.float64())
+    ], metadata={'summary': json.dumps(summary)})
+
+    rows = iter(rows)
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        while batch := list(itertools.islice(rows, batch_rows)):
+            keyword, volume, cpc, competition = zip(*batch)
+            writer.write_batch(pa.record_batch([
+                pa.array(keyword, pa.string()),
+                pa.array(volume, pa.int64()),
+                pa.array(cpc, pa.float64()),
+                pa.array(competition, pa.string()).dictionary_encode().cast(schema.field('competition').type),
+                pa.array([v * c * BUDGET_SHARE for v, c in zip(volume, cpc)], pa.float64())
+            ], schema=schema))
+
+
+class AnalysisExporter:
+    """Writes one analysis in several formats at once
+
+    Each format is an independent task on a thread pool. The JSON and
+    Markdown writers stream through the precompiled report renderer and
+    the tabular writers share the same ExportRecords, each streaming its
+    own pass over the full keyword list.
+    """
+
+    def __init__(self, renderer: Optional[ReportRenderer] = None, max_workers: int = 4):
+        self.renderer = renderer or ReportRenderer()
+        self.max_workers = max_workers
+
+    def tasks(self, records: ExportRecords, paths: Dict[str, str],
+              formats: Iterable[str]) -> Dict[str, Callable[[], str]]:
+        """format -> zero-argument writer returning the path it wrote"""
+        def report(fmt: str, path: str) -> Callable[[], str]:
+            def write() -> str:
+                with open(path, 'w', encoding='utf-8') as fh:
+                    self.renderer.render(records.analysis, fh, fmt)
+                return path
+            return write
+
+        def keyword_csv(rows: Callable[[], Iterable[KeywordRow]], path: str) -> Callable[[], str]:
+            def write() -> str:
+                write_keywords_csv(path, rows(), sort_by_volume=False)
+                return path
+            return write
+
+        def parquet(path: str) -> Callable[[], str]:
+            def write() -> str:
+                write_parquet(path, records.table_rows(), records.summary_record())
+                return path
+            return write
+
+        tasks = {}
+        for fmt in formats:
+            if fmt in ('markdown', 'json'):
+                tasks[fmt] = report(fmt, paths[fmt])
+            elif fmt == 'csv':
+                tasks['csv'] = keyword_csv(lambda: records.keywords, paths['csv'])
+                if records.has_all_keywords:
+                    tasks['all_csv'] = keyword_csv(records.all_keywords, paths['all_csv'])
+            elif fmt == 'parquet':
+                tasks['parquet'] = parquet(paths['parquet'])
+            else:
+                raise ValueError(f"Unsupported export format: {fmt}")
+        return tasks
+
+    def export(self, analysis: Dict, output_dir: str = '.', formats: Iterable[str] = EXPORT_FORMATS,
+               all_rows: Optional[Callable[[], Iterable[KeywordRow]]] = None, presorted: bool = False,
+               paths: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Write every requested format and return {output: path}
+
+        all_rows adds the full keyword list as a second CSV and as the
+        Parquet table; it is called once per writer for a fresh row
+        iterator (e.g. KeywordStore.iter_rows, not iter_rows()). Parquet is skipped with a
+        warning when pyarrow is not installed.
+        """
+        formats = list(formats)
+        if 'parquet' in formats and importlib.util.find_spec('pyarrow') is None:
+            print("Warning: pyarrow not installed. Skipping Parquet export.")
+            formats.remove('parquet')
+
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {name: os.path.normpath(os.path.join(output_dir, path))
+                 for name, path in {**DEFAULT_PATHS, **(paths or {})}.items()}
+        records = ExportRecords(analysis, all_rows, presorted)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {name: pool.submit(task) for name, task in self.tasks(records, paths, formats).items()}
+            return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asyncio Firecrawl client against a local stub server
+Compares analyze_many with analyze_many_async under latency, slow outliers
+and injected 429s, then times concurrent crawl-job polling
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_async import AsyncFirecrawlClient
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from firecrawl_stub import StubFirecrawlServer
+
+
+def analyze(server: StubFirecrawlServer, pages: int, workers: int, mode: str) -> float:
+    analyzer = FirecrawlKeywordAnalyzer(max_workers=workers, max_retries=5)
+    analyzer.firecrawl_api_key = 'stub-key'
+    analyzer.firecrawl_base_url = server.base_url
+    urls = [f"https://example.com/landing/{i}" for i in range(pages)]
+
+    start = time.perf_counter()
+    if mode == 'async':
+        results = analyzer.analyze_many_async(urls, backoff=0.05)
+    else:
+        results = analyzer.analyze_many(urls)
+        analyzer.crawl_engine.close()
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == urls
+    return pages / elapsed
+
+
+async def poll_jobs(server: StubFirecrawlServer, jobs: int, concurrency: int) -> int:
+    client = AsyncFirecrawlClient('stub-key', server.base_url, max_concurrency=concurrency,
+                                  poll_interval=0.05)
+    try:
+        results = await client.crawl_many(f"https://example.com/site/{i}" for i in range(jobs))
+    finally:
+        client.close()
+    return sum(len(pages) for pages in results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated Firecrawl latency per request (seconds)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--rate-limit-every', type=int, default=25,
+                        help='Answer every Nth request with 429 (0 disables)')
+    parser.add_argument('--jobs', type=int, default=50, help='Crawl jobs polled concurrently')
+    args = parser.parse_args()
+
+    # Keep per-page progress prints out of the timing output
+    stdout = sys.stdout
+    for rate_limit in sorted({0, args.rate_limit_every}):
+        for workers in args.workers:
+            for mode in ('sync', 'async'):
+                with StubFirecrawlServer(latency=args.latency, rate_limit_every=rate_limit,
+                                         retry_after=0) as server:
+                    sys.stdout = open(os.devnull, 'w')
+                    try:
+                        rate = analyze(server, args.pages, workers, mode)
+                    finally:
+                        sys.stdout.close()
+                        sys.stdout = stdout
+                    limited = server.rate_limited
+                print(f"{mode:<5}  workers={workers:>3}  429 every={rate_limit or '-':>3}  "
+                      f"{rate:8.1f} pages/sec  ({limited} rate limited)")
+
+    with StubFirecrawlServer(latency=args.latency) as server:
+        start = time.perf_counter()
+        pages = asyncio.run(poll_jobs(server, args.jobs, max(args.workers)))
+        elapsed = time.perf_counter() - start
+    print(f"crawl jobs={args.jobs}  {pages} pages in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
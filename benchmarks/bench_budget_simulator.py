@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Benchmark budget allocation and Monte Carlo simulation at 10k, 100k and 1M keywords
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from budget_simulator import BudgetSimulator
+from synthetic import synthetic_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--budgets', type=float, nargs='+', default=[5_000, 20_000, 100_000])
+    parser.add_argument('--trials', type=int, default=10_000)
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        simulator = BudgetSimulator(synthetic_store(rows), seed=0)
+        for budget in args.budgets:
+            start = time.perf_counter()
+            simulator.allocate(budget)
+            allocate = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = simulator.simulate(budget, trials=args.trials)
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>10,} keywords, ${budget:>9,.0f}: allocate {allocate:6.3f}s, "
+                  f"simulate {elapsed:6.3f}s ({result['funded_keywords']:,} funded, "
+                  f"{result['leads']['expected']:,.1f} leads)")
+
+
+if __name__ == "__main__":
+    main()
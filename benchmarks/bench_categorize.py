@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched keyword categorization at 10k, 1M and 10M keywords
+Compares against the original per-keyword dict loop for the smaller sizes
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from categorization import KeywordCategorizer
+from synthetic import synthetic_store
+
+
+def legacy_categorize(rows) -> dict:
+    """The original analyze_keywords loop over (keyword, data) pairs, kept for comparison"""
+    recommendations = {
+        "high_priority_keywords": [], "medium_priority_keywords": [],
+        "low_competition_opportunities": [], "section_179_keywords": [],
+        "treatment_specific_keywords": [], "total_monthly_searches": 0
+    }
+
+    def row(keyword, data):
+        return {
+            "keyword": keyword, "volume": data["volume"], "cpc": f"${data['cpc']:.2f}",
+            "competition": data["competition"],
+            "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
+        }
+
+    for keyword, data in rows:
+        if "section 179" in keyword or "tax" in keyword:
+            recommendations["section_179_keywords"].append(row(keyword, data))
+        elif any(t in keyword for t in ["plantar", "tendonitis", "chronic pain", "sports"]):
+            recommendations["treatment_specific_keywords"].append(row(keyword, data))
+        if data["volume"] > 1500:
+            recommendations["high_priority_keywords"].append(row(keyword, data))
+        elif data["volume"] > 500:
+            recommendations["medium_priority_keywords"].append(row(keyword, data))
+        if data["competition"] == "low" and data["volume"] > 300:
+            recommendations["low_competition_opportunities"].append(row(keyword, data))
+        recommendations["total_monthly_searches"] += data["volume"]
+
+    for category in list(recommendations)[:5]:
+        recommendations[category] = sorted(
+            recommendations[category], key=lambda x: x["volume"], reverse=True
+        )[:10]
+    return recommendations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--legacy-max', type=int, default=1_000_000,
+                        help='Largest size to also run through the legacy loop')
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        store = synthetic_store(rows)
+
+        start = time.perf_counter()
+        categorizer = KeywordCategorizer(store)
+        prepare = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = categorizer.categorize(top=10)
+        elapsed = time.perf_counter() - start
+        line = (f"{rows:>10,} keywords: masks {prepare:6.3f}s, categorize {elapsed:6.3f}s "
+                f"({rows / elapsed / 1e6:7.2f}M keywords/s)")
+
+        if rows <= args.legacy_max:
+            # Seed keywords repeat in the synthetic store, so feed the legacy
+            # loop (keyword, data) pairs rather than a dict
+            pairs = [
+                (keyword, {"volume": volume, "cpc": cpc, "competition": competition})
+                for keyword, volume, cpc, competition in store.iter_rows()
+            ]
+            start = time.perf_counter()
+            expected = legacy_categorize(pairs)
+            legacy = time.perf_counter() - start
+            for category in expected:
+                assert result[category] == expected[category], category
+            line += f" | legacy loop {legacy:6.3f}s ({legacy / elapsed:.0f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
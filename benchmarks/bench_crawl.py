@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyze_many against a local stub Firecrawl server
+Reports pages/sec for sequential vs concurrent crawling
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from firecrawl_stub import StubFirecrawlServer
+
+
+def run(pages: int, workers: int, latency: float) -> float:
+    with StubFirecrawlServer(latency=latency) as server:
+        analyzer = FirecrawlKeywordAnalyzer(max_workers=workers)
+        analyzer.firecrawl_api_key = 'stub-key'
+        analyzer.firecrawl_base_url = server.base_url
+        urls = [f"https://example.com/landing/{i}" for i in range(pages)]
+
+        start = time.perf_counter()
+        results = analyzer.analyze_many(urls)
+        elapsed = time.perf_counter() - start
+        analyzer.crawl_engine.close()
+
+    assert len(results) == pages
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated Firecrawl latency per request (seconds)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    # Keep per-page progress prints out of the timing output
+    stdout = sys.stdout
+    for workers in args.workers:
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            rate = run(args.pages, workers, args.latency)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        print(f"workers={workers:>3}  {rate:8.1f} pages/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass multi-format export
+Compares writing the report and JSON and then re-reading the JSON for the
+CSV exports against AnalysisExporter over the same in-memory analysis
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analysis_export import category_keyword_rows
+from csv_export import write_keywords_csv
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from synthetic import synthetic_store
+
+
+def separate_passes(analyzer: FirecrawlKeywordAnalyzer, analysis: dict, workdir: str):
+    """main() followed by create_keywords_csv.py, as before the export stage"""
+    with open(os.path.join(workdir, 'report.md'), 'w', encoding='utf-8') as f:
+        f.write(analyzer.generate_report(analysis))
+    with open(os.path.join(workdir, 'data.json'), 'w', encoding='utf-8') as f:
+        analyzer.write_report(analysis, f, fmt='json')
+
+    with open(os.path.join(workdir, 'data.json'), 'r') as f:
+        data = json.load(f)
+    write_keywords_csv(os.path.join(workdir, 'keywords.csv'), category_keyword_rows(data))
+    write_keywords_csv(os.path.join(workdir, 'all_keywords.csv'), analyzer.store.iter_rows())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for rows in args.keywords:
+        analyzer = FirecrawlKeywordAnalyzer(store=synthetic_store(rows))
+        analysis = analyzer.build_recommendations()
+        with tempfile.TemporaryDirectory(prefix='keyword-export-') as workdir:
+            timings = {'separate': [], 'export': []}
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                separate_passes(analyzer, analysis, workdir)
+                timings['separate'].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    analyzer.export(analysis, workdir)
+                timings['export'].append(time.perf_counter() - start)
+
+        separate, export = min(timings['separate']), min(timings['export'])
+        print(f"keywords={rows:>9,}  separate {separate:8.3f}s  export {export:8.3f}s  "
+              f"({separate / export:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
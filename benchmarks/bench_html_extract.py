@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming HTML-to-text extraction against the old full-document
+regex substitutions on a large generated page
+Reports wall-clock time and tracemalloc peak memory for each approach
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from html_text import extract_text
+
+SOURCE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'hubspot-final-complete.html')
+
+
+def regex_extract(file_path: str) -> str:
+    """The original fallback_analysis text extraction"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    text = re.sub('<[^<]+?>', ' ', content)
+    return re.sub(r'\s+', ' ', text)
+
+
+def measure(func, *args):
+    """Wall-clock time of a plain run, then peak memory of a traced run"""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=float, default=20)
+    args = parser.parse_args()
+
+    with open(SOURCE_PAGE, 'r', encoding='utf-8') as f:
+        template = f.read()
+    copies = max(1, int(args.size_mb * 1024 * 1024 / len(template)))
+
+    analyzer = FirecrawlKeywordAnalyzer()
+    with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as page:
+        for _ in range(copies):
+            page.write(template)
+    try:
+        size_mb = os.path.getsize(page.name) / 1024 / 1024
+        print(f"page: {size_mb:.1f} MB ({copies} copies of hubspot-final-complete.html)")
+
+        stages = [
+            ("regex substitutions", regex_extract),
+            ("streaming extract_text", extract_text),
+            ("streaming into matcher", analyzer.extract_keywords_from_file)
+        ]
+        for label, func in stages:
+            elapsed, peak = measure(func, page.name)
+            print(f"{label:<24} {elapsed:7.2f}s  peak {peak / 1024 / 1024:8.1f} MB")
+    finally:
+        os.unlink(page.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark module-aware analysis of HubSpot pages
+Generates pages assembled from the local modules and compares rendering and
+matching every page in full against combining cached per-module results
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from hubspot_modules import ModuleLibrary, load_fields, module_key, parse_module_tags, render_module
+from synthetic import synthetic_text
+
+
+def write_pages(workdir: str, library: ModuleLibrary, pages: int, seed: int = 179):
+    """Pages of 2-6 module instances plus a paragraph of their own copy"""
+    rng = random.Random(seed)
+    names = sorted({os.path.basename(html_path) for html_path, _ in library.sources.values()})
+    paths = []
+    for i in range(pages):
+        tags = [f'{{% module "m{n}" path="{rng.choice(names)}" %}}' for n in range(rng.randint(2, 6))]
+        path = os.path.join(workdir, f'page-{i}.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"<main><p>{synthetic_text(400, seed + i)}</p>\n" + "\n".join(tags) + "</main>")
+        paths.append(path)
+    return paths
+
+
+def flatten(library: ModuleLibrary, path: str):
+    """Render every module instance and match the whole page as one text blob"""
+    with open(path, 'r', encoding='utf-8') as f:
+        markup = f.read()
+    texts = [markup]
+    for name, overrides in parse_module_tags(markup):
+        html_path, json_path = library.sources[module_key(name)]
+        defaults, types = load_fields(json_path)
+        with open(html_path, 'r', encoding='utf-8') as f:
+            texts.append(render_module(f.read(), {**defaults, **overrides}, types))
+    library.analyzer.extract_keywords_from_content(' '.join(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=500)
+    args = parser.parse_args()
+
+    analyzer = FirecrawlKeywordAnalyzer()
+    with tempfile.TemporaryDirectory(prefix='hubspot-pages-') as workdir:
+        paths = write_pages(workdir, ModuleLibrary(analyzer), args.pages)
+
+        start = time.perf_counter()
+        for path in paths:
+            flatten(ModuleLibrary(analyzer), path)
+        flat = time.perf_counter() - start
+
+        library = ModuleLibrary(analyzer)
+        start = time.perf_counter()
+        for path in paths:
+            library.analyze_page(path)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            library.analyze_page(path)
+        warm = time.perf_counter() - start
+
+    print(f"pages={args.pages}  flatten {flat:7.3f}s  modules {cold:7.3f}s ({flat / cold:.1f}x)  "
+          f"unchanged re-run {warm:7.3f}s ({flat / warm:.1f}x)")
+    print(f"modules rendered: {library.parsed['modules']}  pages parsed: {library.parsed['pages']}")
+
+
+if __name__ == "__main__":
+    main()
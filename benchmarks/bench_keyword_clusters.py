@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark MinHash/LSH keyword clustering at 10k, 100k and 1M keywords
+Compares against an all-pairs Jaccard scan for the smallest sizes
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from keyword_clusters import DEFAULT_THRESHOLD, KeywordClusterer, jaccard, normalize_keyword
+from synthetic import synthetic_keywords
+
+
+def all_pairs(rows, threshold: float) -> int:
+    """Number of keyword pairs at or above the threshold, by brute force"""
+    token_sets = [normalize_keyword(keyword) for keyword, *_ in rows]
+    return sum(
+        1
+        for i in range(len(token_sets))
+        for j in range(i + 1, len(token_sets))
+        if jaccard(token_sets[i], token_sets[j]) >= threshold
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--all-pairs-max', type=int, default=5_000,
+                        help='Largest size to also scan all pairs (quadratic)')
+    args = parser.parse_args()
+
+    for size in [args.all_pairs_max] + args.sizes:
+        rows = list(synthetic_keywords(size))
+        start = time.perf_counter()
+        clusters = KeywordClusterer(args.threshold).cluster(rows)
+        elapsed = time.perf_counter() - start
+        line = (f"{size:>10,} keywords: {elapsed:7.3f}s ({size / elapsed:9,.0f} keywords/s), "
+                f"{len(clusters):,} clusters")
+        if size <= args.all_pairs_max:
+            start = time.perf_counter()
+            all_pairs(rows, args.threshold)
+            line += f" | all pairs {time.perf_counter() - start:7.3f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark ad-hoc keyword slices through the secondary indexes
+Compares each query against full-column NumPy masks over every keyword,
+and reports the one-off index build time
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from categorization import KeywordCategorizer, term_mask, top_n
+from keyword_query import RANGE_OPERATORS, KeywordQueryIndex, parse_query
+from keyword_schema import COMPETITION_CODES
+from synthetic import synthetic_store
+
+QUERIES = [
+    "competition=low cpc<5 contains=tendon top=50",
+    "competition=low,medium volume>=5000 cpc<=2 top=20",
+    "category=section_179 cpc<3 top=10",
+    "word=shockwave volume>9900",
+    "contains=plantar competition=high order=cpc:asc top=25",
+    "volume>1500 top=100"
+]
+
+
+def scan(categorizer: KeywordCategorizer, masks, query) -> np.ndarray:
+    """The same slice as full-length boolean masks"""
+    mask = np.ones(len(categorizer.store), dtype=np.bool_)
+    for column, op, value in query['where']:
+        mask &= RANGE_OPERATORS[op](getattr(categorizer, column), value)
+    if 'competition' in query:
+        mask &= np.isin(categorizer.competition, [COMPETITION_CODES[level] for level in query['competition']])
+    if 'category' in query:
+        mask &= np.logical_or.reduce([masks[f"{name}_keywords"] for name in query['category']])
+    if 'contains' in query:
+        mask &= term_mask(categorizer.store, [query['contains']])
+    for word in query['words']:
+        mask &= term_mask(categorizer.store, [word])
+    order_by = query.get('order_by', 'volume')
+    if order_by == 'volume' and query.get('descending', True):
+        return top_n(mask, categorizer.volume, query.get('limit'))
+    rows = np.flatnonzero(mask)
+    return rows[np.argsort(getattr(categorizer, order_by)[rows], kind='stable')][:query.get('limit')]
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    categorizer = KeywordCategorizer(synthetic_store(args.keywords))
+    masks = categorizer.masks()
+    index = KeywordQueryIndex(categorizer)
+
+    start = time.perf_counter()
+    for column in ('volume', 'cpc'):
+        index.sorted_index(column)
+    index.competition_bitmaps, index.category_bitmaps, index.tokens
+    print(f"keywords={args.keywords:,}  index build {time.perf_counter() - start:6.2f}s")
+
+    for text in QUERIES:
+        query = parse_query(text.split())
+        indexed = best_of(lambda: index.select(**query), args.repeat)
+        plan = index.last_plan
+        scanned = best_of(lambda: scan(categorizer, masks, query), args.repeat)
+        rows = len(index.select(**query))
+        print(f"{text:<56} {rows:>4} rows  scan {scanned * 1000:8.2f} ms  "
+              f"indexed {indexed * 1000:7.3f} ms ({scanned / indexed:6.1f}x)  {plan}")
+
+
+if __name__ == "__main__":
+    main()
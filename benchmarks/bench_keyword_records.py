@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for categorized keyword lists
+Compares the shared KeywordRecord lists against the former per-category
+row dicts with pre-formatted CPC and budget strings, over full categorizations
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from categorization import KeywordCategorizer, top_n
+from synthetic import synthetic_store
+
+
+def legacy_categorize(categorizer: KeywordCategorizer) -> Dict:
+    """One fresh formatted dict per keyword and category, as before"""
+    budgets = categorizer.budgets()
+    store = categorizer.store
+    return {
+        category: [
+            {
+                "keyword": store.keyword(i),
+                "volume": int(categorizer.volume[i]),
+                "cpc": f"${categorizer.cpc[i]:.2f}",
+                "competition": store.competition_label(i),
+                "monthly_budget_estimate": f"${budgets[i]:.2f}"
+            }
+            for i in top_n(mask, categorizer.volume, None).tolist()
+        ]
+        for category, mask in categorizer.masks().items()
+    }
+
+
+def measure(build: Callable[[], Dict]) -> Dict:
+    """Wall time, plus bytes still held by the result and the peak while building"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = sum(len(value) for value in result.values() if isinstance(value, list))
+    del result
+    return {'seconds': elapsed, 'retained_mb': retained / 1024 / 1024, 'peak_mb': peak / 1024 / 1024,
+            'rows': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for rows in args.keywords:
+        categorizer = KeywordCategorizer(synthetic_store(rows))
+        categorizer.store.keywords  # decode the keyword blob outside the measurement
+        for name, build in (('dicts', lambda: legacy_categorize(categorizer)),
+                            ('records', lambda: categorizer.categorize(top=None))):
+            result = measure(build)
+            print(f"keywords={rows:>9,}  {name:<8} {result['rows']:>9,} category rows  "
+                  f"retained {result['retained_mb']:8.1f} MB  peak {result['peak_mb']:8.1f} MB  "
+                  f"{result['seconds']:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
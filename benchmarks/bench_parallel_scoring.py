@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for shared-memory parallel keyword scoring
+Scores a synthetic keyword database against a batch of pages with 1..N
+worker processes, and compares handing workers the columns through shared
+memory against pickling them (or the keyword_data dict) into every worker
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import parallel_scoring
+from bulk_analyze import available_cpus
+from keyword_store import KeywordStore
+from parallel_scoring import SHARED_COLUMNS, ParallelScorer, SharedKeywordColumns, page_weights, score_shard
+from synthetic import synthetic_keywords, synthetic_text
+
+_pickled = None
+
+
+def _init_pickled(columns, weights):
+    global _pickled
+    _pickled = (columns, weights)
+
+
+def _pickled_task(start, stop, top):
+    columns, weights = _pickled
+    return score_shard(columns, weights, start, stop, top)
+
+
+def score_pickled(scorer: ParallelScorer, pages, top: int = 10):
+    """The same sharded scoring with every worker receiving its own copy of the columns"""
+    weights = page_weights(pages)
+    columns = {name: np.asarray(scorer.store.column(name)) for name in SHARED_COLUMNS}
+    starts, stops = zip(*scorer.shards())
+    with ProcessPoolExecutor(max_workers=scorer.workers, initializer=_init_pickled,
+                             initargs=(columns, weights)) as pool:
+        results = list(pool.map(_pickled_task, starts, stops, [top] * len(starts)))
+    return {doc_id: scorer._merge(doc_id, results, top) for doc_id in pages}
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, default=1_000_000)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, available_cpus()}))
+    args = parser.parse_args()
+
+    store = KeywordStore.from_records([(*row, True) for row in synthetic_keywords(args.keywords)])
+    pages = {f"page-{i}": synthetic_text(args.page_size, seed=i) for i in range(args.pages)}
+    print(f"keywords={args.keywords:,}  pages={args.pages}  page size={args.page_size:,}  "
+          f"cpus={available_cpus()}")
+
+    keyword_data = store.to_dict()
+    start = time.perf_counter()
+    payload = pickle.dumps(keyword_data, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(payload)
+    print(f"keyword_data dict   pickle+unpickle {time.perf_counter() - start:6.2f}s  "
+          f"{len(payload) / 1024 / 1024:7.1f} MB per worker")
+    del keyword_data, payload
+
+    columns = {name: np.asarray(store.column(name)) for name in SHARED_COLUMNS}
+    start = time.perf_counter()
+    payload = pickle.dumps(columns, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(payload)
+    print(f"column arrays       pickle+unpickle {time.perf_counter() - start:6.2f}s  "
+          f"{len(payload) / 1024 / 1024:7.1f} MB per worker")
+    start = time.perf_counter()
+    with SharedKeywordColumns.publish(store) as shared:
+        published = time.perf_counter() - start
+        descriptor = len(pickle.dumps(shared))
+    print(f"shared memory       publish once    {published:6.2f}s  {descriptor:7d} B per worker")
+
+    baseline = None
+    for workers in args.workers:
+        scorer = ParallelScorer(store, workers)
+        seconds = timed(lambda: scorer.score(pages))
+        baseline = baseline or seconds
+        line = (f"workers={workers:<3} shards={len(scorer.shards()):<3} shared {seconds:7.2f}s "
+                f"(speedup {baseline / seconds:4.2f}x)")
+        if workers > 1:
+            line += f"  pickled columns {timed(lambda: score_pickled(scorer, pages)):7.2f}s"
+        print(line)
+    print(f"(shards hold at least {parallel_scoring.MIN_SHARD_ROWS:,} keywords; "
+          f"speedup is bounded by the {available_cpus()} available cores)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Aho-Corasick keyword extraction against the old nested
+substring scan over a synthetic keyword set and multi-megabyte pages
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from phrase_matcher import KeywordIndex
+
+WORDS = [
+    "shockwave", "therapy", "equipment", "extracorporeal", "eswt", "section", "179",
+    "tax", "deduction", "fda", "approved", "pain", "management", "sports", "medicine",
+    "orthopedic", "tendinopathy", "plantar", "fasciitis", "chronic", "regenerative",
+    "medical", "treatment", "device", "machine", "clinic", "practice", "roi", "cost",
+    "lease", "financing", "billing", "codes", "injury", "knee", "shoulder", "heel",
+    "elbow", "achilles", "calcific", "tendinitis", "physical", "rehab", "portable"
+]
+
+
+def synthetic_phrases(n: int, rng: random.Random) -> list:
+    return [" ".join(rng.sample(WORDS, rng.randint(2, 3))) + f" {i}" for i in range(n)]
+
+
+def synthetic_keywords(phrases: list, n: int, rng: random.Random) -> list:
+    return [f"{rng.choice(WORDS)} {rng.choice(phrases)} {rng.choice(WORDS)}" for _ in range(n)]
+
+
+def synthetic_page(phrases: list, size: int, rng: random.Random) -> str:
+    chunks, length = [], 0
+    while length < size:
+        chunk = " ".join(rng.choice(WORDS) for _ in range(12))
+        if rng.random() < 0.1:
+            chunk += " " + rng.choice(phrases)
+        chunks.append(chunk)
+        length += len(chunk) + 1
+    return " ".join(chunks)
+
+
+def nested_scan(phrases: list, keywords: list, content: str) -> set:
+    """The original extract_keywords_from_content algorithm"""
+    content = content.lower()
+    found = []
+    for phrase in phrases:
+        if phrase.lower() in content:
+            for keyword in keywords:
+                if phrase.lower() in keyword.lower():
+                    found.append(keyword)
+    return set(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--phrases', type=int, default=2000)
+    parser.add_argument('--keywords', type=int, default=20000)
+    parser.add_argument('--page-mb', type=float, nargs='+', default=[1, 4])
+    parser.add_argument('--skip-baseline', action='store_true',
+                        help='Skip the quadratic nested scan')
+    args = parser.parse_args()
+
+    rng = random.Random(179)
+    phrases = synthetic_phrases(args.phrases, rng)
+    keywords = synthetic_keywords(phrases, args.keywords, rng)
+
+    start = time.perf_counter()
+    index = KeywordIndex(phrases, keywords)
+    print(f"index build: {args.phrases} phrases, {args.keywords} keywords "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    for mb in args.page_mb:
+        page = synthetic_page(phrases, int(mb * 1024 * 1024), rng)
+
+        start = time.perf_counter()
+        found = index.extract(page)
+        automaton = time.perf_counter() - start
+        counts = index.matcher.count(page)
+        line = (f"page {mb:>5.1f} MB: automaton {automaton:6.2f}s "
+                f"({mb / automaton:6.2f} MB/s, {len(found)} keywords, "
+                f"{sum(counts.values())} phrase hits)")
+
+        if not args.skip_baseline:
+            start = time.perf_counter()
+            expected = nested_scan(phrases, keywords, page)
+            baseline = time.perf_counter() - start
+            assert expected == set(found)
+            line += f" | nested scan {baseline:6.2f}s ({baseline / automaton:.1f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the keyword snapshot history
+Records months of daily runs over a synthetic keyword set, then times run
+diffs and single-keyword history lookups and reports the on-disk size
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analysis_export import CSV_CATEGORIES
+from snapshot_history import COLUMNS, SnapshotHistory
+from synthetic import synthetic_keywords
+
+
+def daily_runs(rows: int, days: int, seed: int = 179):
+    """(analysis, rows) per day: metrics drift a little and category top 10s reshuffle"""
+    rng = random.Random(seed)
+    keywords = list(synthetic_keywords(rows, seed))
+    for _ in range(days):
+        keywords = [
+            (keyword, max(10, volume + rng.randint(-50, 50)) if rng.random() < 0.2 else volume,
+             round(cpc * rng.uniform(0.95, 1.05), 2) if rng.random() < 0.1 else cpc, competition)
+            for keyword, volume, cpc, competition in keywords
+        ]
+        analysis = {
+            category: [{'keyword': keyword} for keyword, *_ in rng.sample(keywords, 10)]
+            for category in CSV_CATEGORIES
+        }
+        yield analysis, keywords
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, default=100_000)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='keyword-history-') as workdir:
+        history = SnapshotHistory(workdir)
+        start_day = datetime(2026, 1, 1, 6, tzinfo=timezone.utc)
+        record_times = []
+        for day, (analysis, rows) in enumerate(daily_runs(args.keywords, args.days)):
+            start = time.perf_counter()
+            history.record(analysis, rows, recorded_at=start_day + timedelta(days=day))
+            record_times.append(time.perf_counter() - start)
+
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(workdir) for name in names)
+        raw = args.days * args.keywords * sum(np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+        print(f"runs={args.days}  keywords={args.keywords:,}  on disk {size / 1024 / 1024:.1f} MB "
+              f"(uncompressed columns {raw / 1024 / 1024:.1f} MB)")
+        print(f"record        median {sorted(record_times)[len(record_times) // 2] * 1000:8.2f} ms")
+
+        reopened = best_of(lambda: SnapshotHistory(workdir), args.repeat)
+        print(f"open          best   {reopened * 1000:8.2f} ms")
+
+        history = SnapshotHistory(workdir)
+        first = history.runs[0]['recorded_at'][:10]
+        for label, before, after in (('diff 1 day', -2, -1), ('diff 30 days', -31, -1),
+                                     ('diff by date', first, -1)):
+            seconds = best_of(lambda: history.diff(before, after), args.repeat)
+            print(f"{label:<13} best   {seconds * 1000:8.2f} ms")
+
+        keyword = history.keywords[args.keywords // 2]
+        seconds = best_of(lambda: history.keyword_history(keyword), args.repeat)
+        print(f"keyword history over {args.days} runs  best {seconds * 1000:8.2f} ms")
+        end = history.runs[-1]['recorded_at'][:10]
+        begin = history.runs[-30]['recorded_at'][:10]
+        seconds = best_of(lambda: history.keyword_history(keyword, begin, end), args.repeat)
+        print(f"keyword history over 30 days    best {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start time of the keyword scripts
+Runs each script or import in a fresh interpreter, reports best and median
+wall time and lists which heavy dependencies each one ends up loading
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HEAVY_MODULES = ('numpy', 'requests', 'dotenv')
+
+# Name -> command run in a scratch directory holding a copy of the analysis JSON
+COMMANDS = {
+    'python (bare interpreter)': ['-c', 'pass'],
+    'import firecrawl_keyword_analyzer': ['-c', 'import firecrawl_keyword_analyzer'],
+    'import csv_export': ['-c', 'import csv_export'],
+    'create_keywords_csv.py': [os.path.join(REPO_DIR, 'create_keywords_csv.py')],
+    'create_comprehensive_keywords_csv.py': [os.path.join(REPO_DIR, 'create_comprehensive_keywords_csv.py')]
+}
+
+
+def time_command(args, workdir: str, env: dict, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=workdir, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def loaded_heavy_modules(args, workdir: str, env: dict):
+    """Heavy modules present in sys.modules once the command has run"""
+    if args[0] != '-c':
+        return None
+    probe = f"{args[1]}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=workdir, env=env, check=True,
+                            capture_output=True, text=True)
+    return result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(REPO_DIR))
+    with tempfile.TemporaryDirectory(prefix='keyword-startup-') as workdir:
+        shutil.copy(os.path.join(REPO_DIR, 'keyword_analysis_data.json'), workdir)
+
+        for name, command in COMMANDS.items():
+            best, median = time_command(command, workdir, env, args.runs)
+            line = f"{name:<40} best {best * 1000:7.1f} ms  median {median * 1000:7.1f} ms"
+            heavy = loaded_heavy_modules(command, workdir, env)
+            if heavy is not None:
+                line += f"  loads: {heavy or '-'}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark save-to-report latency in watch mode
+Compares a cold one-shot analysis in a fresh interpreter against the warm
+watch session: edit a copy of index.html, wait for the debounced batch and
+time until its report is rewritten
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import KEY_PHRASES, FirecrawlKeywordAnalyzer
+from keyword_schema import BASE_DIR
+from watch_mode import DEFAULT_DEBOUNCE, WatchSession, create_watcher, next_batch
+
+COLD_RUN = """
+import sys
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from watch_mode import WatchSession
+WatchSession(FirecrawlKeywordAnalyzer(), [sys.argv[1]], sys.argv[2]).emit_all()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--edits', type=int, default=20)
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE)
+    parser.add_argument('--poll', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='watch-bench-') as workdir:
+        page = os.path.join(workdir, 'index.html')
+        shutil.copy(os.path.join(BASE_DIR, 'index.html'), page)
+        output_dir = os.path.join(workdir, 'reports')
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([BASE_DIR, os.environ.get('PYTHONPATH', '')]))
+        cold = []
+        for _ in range(3):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', COLD_RUN, page, output_dir], env=env, check=True)
+            cold.append(time.perf_counter() - start)
+
+        session = WatchSession(FirecrawlKeywordAnalyzer(), [page], output_dir)
+        session.emit_all()
+        watcher = create_watcher(args.poll)
+        watcher.watch(session.watched_paths())
+        with open(page, 'r', encoding='utf-8') as f:
+            original = f.read()
+
+        latencies, analysis = [], []
+        try:
+            for i in range(args.edits):
+                # One heading edit per save, as in copy editing
+                edited = original.replace('</h1>', f' {KEY_PHRASES[i % len(KEY_PHRASES)]}</h1>', 1)
+                start = time.perf_counter()
+                with open(page, 'w', encoding='utf-8') as f:
+                    f.write(edited)
+                summaries = session.refresh(next_batch(watcher, args.debounce))
+                latencies.append(time.perf_counter() - start)
+                analysis.extend(summary['ms'] for summary in summaries)
+        finally:
+            watcher.close()
+
+    print(f"cold one-shot run      median {statistics.median(cold) * 1000:8.1f} ms")
+    print(f"watch ({watcher.name}, debounce {args.debounce * 1000:.0f} ms)  save -> report "
+          f"median {statistics.median(latencies) * 1000:6.1f} ms  max {max(latencies) * 1000:6.1f} ms")
+    print(f"re-analysis alone      median {statistics.median(analysis):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the keyword analysis pipeline
+Times each stage separately over synthetic keyword databases and pages,
+records peak memory, writes machine-readable results and compares them
+against a stored baseline. Runs fully offline against a stub Firecrawl API.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+
+from categorization import KeywordCategorizer
+from csv_export import write_keywords_csv
+from firecrawl_keyword_analyzer import KEY_PHRASES, FirecrawlKeywordAnalyzer
+from firecrawl_stub import StubFirecrawlServer
+from html_text import extract_text
+from phrase_matcher import KeywordIndex
+from synthetic import synthetic_html, synthetic_store, synthetic_text
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'results', 'baseline.json')
+
+KEYWORD_SIZES = [1_000, 100_000, 1_000_000]
+FULL_KEYWORD_SIZES = KEYWORD_SIZES + [10_000_000]
+PAGE_SIZES = [10 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+FULL_PAGE_SIZES = PAGE_SIZES + [50 * 1024 * 1024]
+
+# The pure-Python automaton build is skipped above this many keywords
+# unless --full is given
+INDEX_BUILD_LIMIT = 1_000_000
+
+# Changes smaller than these are timer or allocator noise, never regressions
+MIN_DELTA = {'seconds': 0.002, 'peak_mb': 0.5}
+
+
+def measure(func: Callable, repeat: int, memory: bool) -> Dict:
+    """Best-of-N wall time, plus tracemalloc peak from one extra traced run"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {'seconds': min(timings)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_mb'] = peak / 1024 / 1024
+    return result
+
+
+def size_label(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size // (1024 * 1024)}MB"
+    return f"{size // 1024}KB"
+
+
+def keyword_stages(rows: int, full: bool, workdir: str) -> Dict[str, Callable]:
+    """Stages that scale with keyword database size"""
+    store = synthetic_store(rows)
+    analyzer = FirecrawlKeywordAnalyzer(store=store)
+    analysis = analyzer.build_recommendations()
+    csv_path = os.path.join(workdir, f'keywords-{rows}.csv')
+
+    stages = {
+        'categorizer_build': lambda: KeywordCategorizer(store),
+        'categorize': lambda: analyzer.categorizer.categorize(top=10),
+        'generate_report': lambda: analyzer.generate_report(analysis),
+        'csv_export': lambda: write_keywords_csv(csv_path, store.iter_rows())
+    }
+    if rows <= INDEX_BUILD_LIMIT or full:
+        stages['keyword_index_build'] = lambda: KeywordIndex(KEY_PHRASES, store.keywords)
+    return stages
+
+
+def page_stages(size: int, server: StubFirecrawlServer, workdir: str) -> Dict[str, Callable]:
+    """Stages that scale with page size"""
+    text = synthetic_text(size)
+    html_path = os.path.join(workdir, f'page-{size}.html')
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(synthetic_html(size))
+
+    analyzer = FirecrawlKeywordAnalyzer()
+    analyzer.firecrawl_api_key = 'stub-key'
+    analyzer.firecrawl_base_url = server.base_url
+
+    def scrape():
+        server.content = text
+        analyzer.scrape_with_firecrawl('https://example.com/landing')
+
+    return {
+        'scrape': scrape,
+        'html_extract': lambda: extract_text(html_path),
+        'extract_keywords': lambda: analyzer.extract_keywords_from_content(text)
+    }
+
+
+def run(args) -> Dict:
+    results: Dict[str, Dict] = {}
+
+    def record(name: str, func: Callable):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = measure(func, args.repeat, not args.no_memory)
+        results[name] = result
+        peak = f"  peak {result['peak_mb']:8.1f} MB" if 'peak_mb' in result else ''
+        print(f"{name:<40} {result['seconds']:9.4f}s{peak}")
+
+    with tempfile.TemporaryDirectory(prefix='keyword-bench-') as workdir:
+        for rows in args.keywords:
+            for stage, func in keyword_stages(rows, args.full, workdir).items():
+                record(f"{stage}[{rows}]", func)
+
+        with StubFirecrawlServer() as server:
+            for size in args.pages:
+                for stage, func in page_stages(size, server, workdir).items():
+                    record(f"{stage}[{size_label(size)}]", func)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Describe every stage that got slower or hungrier than the baseline allows"""
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            if metric in result and metric in base and base[metric] > 0:
+                ratio = result[metric] / base[metric]
+                if ratio > 1 + threshold and result[metric] - base[metric] > MIN_DELTA[metric]:
+                    regressions.append(
+                        f"{name} {metric}: {base[metric]:.4f} -> {result[metric]:.4f} ({ratio:.2f}x)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keywords', type=int, nargs='+', help='Keyword database sizes')
+    parser.add_argument('--pages', type=int, nargs='+', help='Page sizes in bytes')
+    parser.add_argument('--full', action='store_true',
+                        help='Include the 10M keyword and 50 MB page sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='Skip peak memory tracing')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='BASELINE',
+                        help='Flag regressions against a stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown or memory growth before flagging (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Also store these results as the new baseline')
+    args = parser.parse_args()
+
+    args.keywords = args.keywords or (FULL_KEYWORD_SIZES if args.full else KEYWORD_SIZES)
+    args.pages = args.pages or (FULL_PAGE_SIZES if args.full else PAGE_SIZES)
+
+    current = run(args)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"\n📊 Results saved to: {args.output}")
+
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"📌 Baseline saved to: {DEFAULT_BASELINE}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Synthetic keyword databases and landing pages shared by the benchmarks
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import KEY_PHRASES
+from keyword_store import KeywordStore, load_store
+
+FILLER_WORDS = [
+    "practice", "patients", "clinic", "results", "session", "device", "treatment",
+    "equipment", "recovery", "outcomes", "proven", "evidence", "protocol", "team",
+    "schedule", "demo", "quote", "financing", "warranty", "training", "support"
+]
+
+
+def synthetic_store(rows: int, seed: int = 179) -> KeywordStore:
+    """Resample the seed keywords with randomized metrics up to `rows` rows"""
+    rng = np.random.default_rng(seed)
+    base = load_store()
+    store = base.take(rng.integers(0, len(base), rows))
+    store._columns['volume'] = rng.integers(10, 10000, rows)
+    store._columns['cpc'] = np.round(rng.uniform(0.5, 15.0, rows), 2)
+    store._columns['competition'] = rng.integers(0, 3, rows).astype(np.uint8)
+    return store
+
+
+def synthetic_keywords(rows: int, seed: int = 179):
+    """Distinct (keyword, volume, cpc, competition) rows: seed keywords with random modifiers"""
+    rng = random.Random(seed)
+    base = [keyword for keyword, *_ in load_store().iter_rows()]
+    places = [f"city{n}" for n in range(max(10, rows // 20))]
+    levels = ("low", "medium", "high")
+    for _ in range(rows):
+        words = rng.choice(base).split()
+        for modifier in rng.sample(FILLER_WORDS, rng.randint(0, 2)) + [rng.choice(places)]:
+            words.insert(rng.randrange(len(words) + 1), modifier)
+        yield " ".join(words), rng.randrange(10, 10000), round(rng.uniform(0.5, 15.0), 2), rng.choice(levels)
+
+
+def synthetic_text(size: int, seed: int = 179) -> str:
+    """Roughly `size` characters of landing-page copy sprinkled with key phrases"""
+    rng = random.Random(seed)
+    sentences = []
+    length = 0
+    while length < size:
+        words = rng.choices(FILLER_WORDS, k=12)
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(KEY_PHRASES))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)[:size]
+
+
+def synthetic_html(size: int, seed: int = 179) -> str:
+    """Roughly `size` characters of HTML with sections, scripts and nav blocks"""
+    text = synthetic_text(size, seed)
+    parts = ["<html><head><style>body { margin: 0 }</style></head><body>",
+             "<nav><a href='/'>Home</a></nav>"]
+    for start in range(0, len(text), 2000):
+        parts.append(f"<section><h2>Section {start // 2000}</h2><p>{text[start:start + 2000]}</p></section>")
+        if start % 20000 == 0:
+            parts.append("<script>var roi = 'plantar fasciitis';</script>")
+    parts.append("</body></html>")
+    return "".join(parts)
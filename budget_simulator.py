@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Budget and bid simulation for the CuraMedix keyword portfolio
+Allocates a monthly budget across keywords and runs vectorized Monte Carlo
+trials over CTR, conversion rate and CPC to estimate clicks and leads
+"""
+
+import sys
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from categorization import term_mask
+from keyword_store import COMPETITION_LEVELS, KeywordStore, load_store
+
+# Mean click-through rate by competition level (report: 1-2% generic, 3-5% branded)
+CTR_BY_COMPETITION = {"low": 0.035, "medium": 0.025, "high": 0.018}
+
+# Mean conversion rate for high-intent keywords (report: 2-4%)
+CONVERSION_RATE = 0.03
+
+# Mean conversion rate for research and informational keywords
+INFORMATIONAL_CONVERSION_RATE = 0.01
+
+# Keywords containing any of these signal purchase intent
+HIGH_INTENT_TERMS = ("buy", "price", "cost", "for sale", "near me", "lease", "financing", "section 179")
+
+# Beta concentration: higher means tighter CTR/conversion distributions
+BETA_CONCENTRATION = 200.0
+
+# Log-normal spread of actual CPC around the listed CPC
+CPC_SIGMA = 0.25
+
+DEFAULT_TRIALS = 10_000
+
+# Upper bound on keyword x trial cells drawn at once, to cap memory
+MAX_CELLS = 4_000_000
+
+
+def beta_sd(mean, concentration: float = BETA_CONCENTRATION):
+    """Standard deviation of a Beta distribution with the given mean and concentration"""
+    return np.sqrt(mean * (1 - mean) / (concentration + 1))
+
+
+class BudgetSimulator:
+    """Greedy allocation plus Monte Carlo outcome estimates for a keyword store"""
+
+    def __init__(self, store: KeywordStore, ctr_by_competition: Optional[Dict[str, float]] = None,
+                 conversion_rate: float = CONVERSION_RATE,
+                 informational_conversion_rate: float = INFORMATIONAL_CONVERSION_RATE,
+                 cpc_sigma: float = CPC_SIGMA, seed: Optional[int] = None):
+        self.store = store
+        self.volume = np.asarray(store.volume, dtype=np.float64)
+        self.cpc = np.asarray(store.cpc, dtype=np.float64)
+        rates = ctr_by_competition or CTR_BY_COMPETITION
+        self.ctr = np.array([rates[level] for level in COMPETITION_LEVELS])[np.asarray(store.competition)]
+        self.conversion_rate = np.where(term_mask(store, HIGH_INTENT_TERMS),
+                                        conversion_rate, informational_conversion_rate)
+        self.cpc_sigma = cpc_sigma
+        self.rng = np.random.default_rng(seed)
+
+    def allocate(self, budget: float, objective: str = "leads") -> np.ndarray:
+        """Spend per keyword maximizing expected clicks or leads
+
+        With one budget constraint and per-keyword spend caps, funding the
+        most clicks (or leads) per dollar first is the exact LP optimum
+        (fractional knapsack).
+        """
+        if objective == "clicks":
+            cost = self.cpc
+        elif objective == "leads":
+            cost = self.cpc / self.conversion_rate
+        else:
+            raise ValueError(f"Unknown objective: {objective}")
+        capacity = self.volume * self.ctr * self.cpc
+        order = np.argsort(cost, kind="stable")
+        cumulative = np.cumsum(capacity[order])
+
+        spend = np.zeros(len(self.cpc))
+        funded = int(np.searchsorted(cumulative, budget, side="right"))
+        spend[order[:funded]] = capacity[order[:funded]]
+        if funded < len(order):
+            spent = cumulative[funded - 1] if funded else 0.0
+            spend[order[funded]] = budget - spent
+        return spend
+
+    def _trial_totals(self, spend: np.ndarray, trials: int):
+        """Total clicks and leads per trial, drawn in keyword chunks
+
+        CTR and CPC are drawn per keyword and trial (CTR as a moment-matched
+        normal in place of the Beta, which is several times cheaper to draw).
+        Conversion is independent of clicks, so leads are drawn once per trial
+        from their conditional distribution instead of once per keyword.
+        """
+        funded = np.flatnonzero(spend > 0)
+        clicks = np.zeros(trials)
+        expected_leads = np.zeros(trials)
+        lead_variance = np.zeros(trials)
+        chunk = max(1, MAX_CELLS // trials)
+        log_shift = np.float32(-self.cpc_sigma ** 2 / 2)
+
+        for start in range(0, len(funded), chunk):
+            rows = funded[start:start + chunk]
+            noise = self.rng.standard_normal((2, trials, len(rows)), dtype=np.float32)
+            ctr_mean = self.ctr[rows].astype(np.float32)
+
+            # CTR draws, floored at zero
+            ctr = noise[0]
+            ctr *= beta_sd(ctr_mean)
+            ctr += ctr_mean
+            np.maximum(ctr, 0, out=ctr)
+            ctr *= self.volume[rows].astype(np.float32)
+
+            # Log-normal CPC multiplier with mean 1, turned into affordable clicks
+            affordable = noise[1]
+            affordable *= np.float32(self.cpc_sigma)
+            affordable += log_shift
+            np.exp(affordable, out=affordable)
+            np.divide((spend[rows] / self.cpc[rows]).astype(np.float32), affordable, out=affordable)
+
+            # Clicks are limited by either the money or the searches available
+            chunk_clicks = np.minimum(affordable, ctr, out=ctr)
+            clicks += chunk_clicks.sum(axis=1, dtype=np.float64)
+            conversion = self.conversion_rate[rows].astype(np.float32)
+            expected_leads += (chunk_clicks * conversion).sum(axis=1, dtype=np.float64)
+            np.square(chunk_clicks, out=chunk_clicks)
+            lead_variance += (chunk_clicks * np.square(beta_sd(conversion))).sum(axis=1, dtype=np.float64)
+
+        # Sum of clicks_k * conversion_k given the clicks: each keyword's
+        # mean rate times its clicks, spread by the per-keyword conversion variance
+        leads = expected_leads + np.sqrt(lead_variance) * self.rng.standard_normal(trials)
+        return clicks, np.maximum(leads, 0)
+
+    def simulate(self, budget: float, trials: int = DEFAULT_TRIALS, confidence: float = 0.9,
+                 objective: str = "leads", top: int = 10) -> Dict:
+        """Expected monthly clicks and leads with confidence intervals"""
+        spend = self.allocate(budget, objective)
+        clicks, leads = self._trial_totals(spend, trials)
+        tail = (1 - confidence) / 2 * 100
+        total_spend = float(spend.sum())
+
+        def summarize(values: np.ndarray) -> Dict:
+            low, high = np.percentile(values, [tail, 100 - tail])
+            return {"expected": float(values.mean()), "low": float(low), "high": float(high)}
+
+        lead_summary = summarize(leads)
+        top_rows = np.argsort(-spend, kind="stable")[:min(top, int((spend > 0).sum()))]
+        return {
+            "budget": float(budget),
+            "allocated_spend": total_spend,
+            "funded_keywords": int((spend > 0).sum()),
+            "trials": trials,
+            "confidence": confidence,
+            "clicks": summarize(clicks),
+            "leads": lead_summary,
+            "cost_per_lead": total_spend / lead_summary["expected"] if lead_summary["expected"] else None,
+            "top_allocations": [
+                {"keyword": self.store.keyword(i), "spend": float(spend[i])} for i in top_rows.tolist()
+            ]
+        }
+
+    def what_if(self, budgets: Iterable[float], trials: int = DEFAULT_TRIALS, **kwargs) -> List[Dict]:
+        """Simulate several monthly budgets side by side"""
+        return [self.simulate(budget, trials=trials, **kwargs) for budget in budgets]
+
+
+def main():
+    budgets = [float(b) for b in sys.argv[1:]] or [2500, 5000, 10000, 20000]
+    simulator = BudgetSimulator(load_store(), seed=179)
+    for result in simulator.what_if(budgets):
+        clicks, leads = result["clicks"], result["leads"]
+        print(f"💵 Budget ${result['budget']:,.0f}/month "
+              f"(${result['allocated_spend']:,.0f} placeable across {result['funded_keywords']} keywords)")
+        print(f"  - Clicks: {clicks['expected']:,.0f} (90% CI {clicks['low']:,.0f}-{clicks['high']:,.0f})")
+        print(f"  - Leads: {leads['expected']:,.1f} (90% CI {leads['low']:,.1f}-{leads['high']:,.1f})")
+        if result["cost_per_lead"]:
+            print(f"  - Cost per lead: ${result['cost_per_lead']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
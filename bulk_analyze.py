@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Bulk keyword analysis over a directory or glob of local landing pages
+Fans keyword extraction out across a process pool and writes per-page
+coverage reports, the site-wide recommendations once, and a merged rollup
+"""
+
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, TextIO
+
+from html_text import extract_text
+from keyword_record import json_default
+from keyword_schema import BUDGET_SHARE
+
+DEFAULT_PATTERNS = ['*.html', 'hubspot-templates/*.html', 'hubspot-modules/*.html']
+DEFAULT_OUTPUT_DIR = 'keyword_reports'
+
+# One analyzer per worker process, so the keyword store and phrase automaton
+# are loaded once per process rather than once per page
+_analyzer = None
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker():
+    global _analyzer
+    from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+    _analyzer = FirecrawlKeywordAnalyzer()
+
+
+def analyze_page(path: str) -> Dict:
+    """Phrase and keyword matches of one local page"""
+    index = _analyzer.keyword_index
+    # One automaton pass: the counted phrases are also the matched ones
+    phrase_counts = index.matcher.count(extract_text(path))
+    return {
+        "page": path,
+        "matched_keywords": index.keywords_for_phrases(phrase_counts),
+        "phrase_counts": phrase_counts
+    }
+
+
+def write_page_report(fh: TextIO, analysis: Dict, keyword_data: Dict[str, Dict]):
+    """Markdown coverage report for one page: its key phrases and matched keywords"""
+    fh.write(f"# Keyword Coverage: {analysis['page']}\n\n")
+    fh.write("### 🔑 Key Phrases Found\n")
+    phrases = sorted(analysis["phrase_counts"].items(), key=lambda item: item[1], reverse=True)
+    for phrase, count in phrases:
+        fh.write(f"- **{phrase}**: {count} mention{'s' if count != 1 else ''}\n")
+    if not phrases:
+        fh.write("No key phrases on this page\n")
+
+    keywords = sorted(analysis["matched_keywords"], key=lambda k: keyword_data[k]["volume"], reverse=True)
+    fh.write(f"\n### 🎯 Matched Keywords ({len(keywords)})\n")
+    if not keywords:
+        fh.write("No keywords matched\n")
+    else:
+        fh.write("| Keyword | Volume | CPC | Competition | Est. Monthly Budget |\n")
+        fh.write("|---|---:|---:|---|---:|\n")
+        for keyword in keywords:
+            data = keyword_data[keyword]
+            fh.write(f"| {keyword} | {data['volume']:,} | ${data['cpc']:.2f} | {data['competition']} | "
+                     f"${data['volume'] * data['cpc'] * BUDGET_SHARE:.2f} |\n")
+    fh.write("\nSite-wide recommendations: recommendations.md\n")
+
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """Resolve directories and glob patterns to a sorted list of HTML files"""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, '**', '*.html'), recursive=True))
+        else:
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def output_name(path: str) -> str:
+    """Flatten a page path into a report file stem"""
+    stem = os.path.splitext(os.path.relpath(path))[0]
+    return stem.replace(os.sep, '__').replace('..', 'up')
+
+
+def merge_rollup(results: List[Dict]) -> Dict:
+    """Combine per-page results into one site-wide summary"""
+    keyword_pages: Dict[str, List[str]] = {}
+    phrase_totals: Dict[str, int] = {}
+    for analysis in results:
+        for keyword in analysis["matched_keywords"]:
+            keyword_pages.setdefault(keyword, []).append(analysis["page"])
+        for phrase, count in analysis["phrase_counts"].items():
+            phrase_totals[phrase] = phrase_totals.get(phrase, 0) + count
+
+    return {
+        "pages_analyzed": len(results),
+        "pages": {
+            analysis["page"]: {
+                "matched_keywords": len(analysis["matched_keywords"]),
+                "phrase_hits": sum(analysis["phrase_counts"].values())
+            }
+            for analysis in results
+        },
+        "keyword_coverage": dict(
+            sorted(keyword_pages.items(), key=lambda item: len(item[1]), reverse=True)
+        ),
+        "phrase_totals": dict(sorted(phrase_totals.items(), key=lambda item: item[1], reverse=True))
+    }
+
+
+def run(paths: List[str], output_dir: str, workers: int) -> Dict:
+    from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # The parent loads (and if stale, rebuilds) the keyword store before any
+    # worker starts, so workers only ever open the finished store. The
+    # recommendations do not depend on the page and are written once.
+    analyzer = FirecrawlKeywordAnalyzer()
+    recommendations = analyzer.build_recommendations()
+    with open(os.path.join(output_dir, 'recommendations.md'), 'w', encoding='utf-8') as f:
+        analyzer.write_report(recommendations, f)
+    with open(os.path.join(output_dir, 'recommendations.json'), 'w', encoding='utf-8') as f:
+        json.dump(recommendations, f, indent=2, default=json_default)
+
+    keyword_data = analyzer.keyword_data
+    chunksize = max(1, len(paths) // (workers * 4))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for analysis in pool.map(analyze_page, paths, chunksize=chunksize):
+            name = output_name(analysis["page"])
+            with open(os.path.join(output_dir, f'{name}.md'), 'w', encoding='utf-8') as f:
+                write_page_report(f, analysis, keyword_data)
+            with open(os.path.join(output_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+                json.dump(analysis, f, indent=2)
+            results.append(analysis)
+
+    rollup = merge_rollup(results)
+    with open(os.path.join(output_dir, 'rollup.json'), 'w', encoding='utf-8') as f:
+        json.dump(rollup, f, indent=2)
+    return rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many local landing pages in parallel")
+    parser.add_argument('inputs', nargs='*', default=DEFAULT_PATTERNS,
+                        help='Directories or glob patterns of HTML pages')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=available_cpus(),
+                        help='Worker processes (default: all cores this process may use)')
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("no HTML pages matched the given inputs")
+
+    print(f"Analyzing {len(paths)} pages with {args.workers} worker processes...")
+    rollup = run(paths, args.output_dir, args.workers)
+
+    print("\n✅ Bulk analysis complete!")
+    print(f"📄 Per-page reports saved to: {args.output_dir}/")
+    print(f"🎯 Recommendations saved to: {os.path.join(args.output_dir, 'recommendations.md')}")
+    print(f"📊 Rollup saved to: {os.path.join(args.output_dir, 'rollup.json')}")
+    print(f"🔑 Keywords matched across pages: {len(rollup['keyword_coverage'])}")
+
+
+if __name__ == "__main__":
+    main()
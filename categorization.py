@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Batched keyword categorization for the Firecrawl keyword analyzer
+Computes category masks, budgets and totals as NumPy array operations
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from keyword_record import KeywordRecord
+from keyword_schema import BUDGET_SHARE, COMPETITION_CODES
+from keyword_store import KeywordStore
+
+# Substring rules for the topic buckets (matched case-sensitively, as before)
+SECTION_179_TERMS = ("section 179", "tax")
+TREATMENT_TERMS = ("plantar", "tendonitis", "chronic pain", "sports")
+
+# Volume thresholds for the priority buckets
+HIGH_PRIORITY_VOLUME = 1500
+MEDIUM_PRIORITY_VOLUME = 500
+LOW_COMPETITION_VOLUME = 300
+
+
+def term_mask(store: KeywordStore, terms: Iterable[str]) -> np.ndarray:
+    """Rows whose keyword contains any of the terms
+
+    Compares the packed keyword blob against each term with shifted byte
+    comparisons and maps match positions back to rows, instead of running
+    a substring test per keyword.
+    """
+    offsets = np.asarray(store.column('offsets'))
+    blob = np.asarray(store.column('keyword_bytes'))
+    mask = np.zeros(len(store), dtype=np.bool_)
+    for term in terms:
+        encoded = np.frombuffer(term.encode('utf-8'), dtype=np.uint8)
+        width = len(blob) - len(encoded) + 1
+        if width <= 0:
+            continue
+        hits = blob[:width] == encoded[0]
+        for shift in range(1, len(encoded)):
+            hits &= blob[shift:shift + width] == encoded[shift]
+        starts = np.flatnonzero(hits)
+        rows = np.searchsorted(offsets, starts, side='right') - 1
+        # Discard matches that straddle two adjacent keywords
+        inside = starts + len(encoded) <= offsets[rows + 1]
+        mask[rows[inside]] = True
+    return mask
+
+
+def top_n(mask: np.ndarray, volume: np.ndarray, n: Optional[int]) -> np.ndarray:
+    """Indices of the n highest-volume rows in mask (all of them for None),
+    ordered by volume descending
+
+    Uses a partial partition instead of a full sort; ties keep store order.
+    """
+    candidates = np.flatnonzero(mask)
+    if n is not None and len(candidates) > n:
+        values = volume[candidates]
+        threshold = np.partition(values, len(values) - n)[len(values) - n]
+        above = candidates[values > threshold]
+        at_threshold = candidates[values == threshold][:n - len(above)]
+        candidates = np.concatenate([above, at_threshold])
+    values = volume[candidates]
+    return candidates[np.lexsort((candidates, -values))]
+
+
+class KeywordCategorizer:
+    """Precomputes per-keyword masks once per store and categorizes in bulk"""
+
+    def __init__(self, store: KeywordStore):
+        self.store = store
+        self.volume = np.asarray(store.volume)
+        self.cpc = np.asarray(store.cpc)
+        self.competition = np.asarray(store.competition)
+
+        # Topic masks depend only on the keyword text, so they are built once
+        self.section_179 = term_mask(store, SECTION_179_TERMS)
+        self.treatment = term_mask(store, TREATMENT_TERMS) & ~self.section_179
+
+    def masks(self) -> Dict[str, np.ndarray]:
+        """Boolean row mask for every recommendation category"""
+        high = self.volume > HIGH_PRIORITY_VOLUME
+        return {
+            "high_priority_keywords": high,
+            "medium_priority_keywords": ~high & (self.volume > MEDIUM_PRIORITY_VOLUME),
+            "low_competition_opportunities": (
+                (self.competition == COMPETITION_CODES["low"])
+                & (self.volume > LOW_COMPETITION_VOLUME)
+            ),
+            "section_179_keywords": self.section_179,
+            "treatment_specific_keywords": self.treatment
+        }
+
+    def budgets(self) -> np.ndarray:
+        """Estimated monthly budget per keyword"""
+        return self.volume * self.cpc * BUDGET_SHARE
+
+    def records(self, indices: np.ndarray, shared: Dict[int, KeywordRecord]) -> List[KeywordRecord]:
+        """Records for the selected indices only, reusing any already in shared"""
+        volume, cpc = self.volume[indices].tolist(), self.cpc[indices].tolist()
+        result = []
+        for i, index in enumerate(indices.tolist()):
+            record = shared.get(index)
+            if record is None:
+                record = shared[index] = KeywordRecord(
+                    self.store.keyword(index), volume[i], cpc[i], self.store.competition_label(index)
+                )
+            result.append(record)
+        return result
+
+    def categorize(self, top: Optional[int] = 10) -> Dict:
+        """Top keywords per category (every match for top=None) plus volume and CPC totals
+
+        A keyword in several categories is one KeywordRecord shared by
+        all of their lists.
+        """
+        shared: Dict[int, KeywordRecord] = {}
+        result = {
+            category: self.records(top_n(mask, self.volume, top), shared)
+            for category, mask in self.masks().items()
+        }
+        result["total_monthly_searches"] = int(self.volume.sum())
+        result["average_cpc"] = f"${self.cpc.mean() if len(self.cpc) else 0:.2f}"
+        return result
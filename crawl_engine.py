@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency crawl engine for the Firecrawl keyword analyzer
+Shares one keep-alive connection pool across worker threads and applies
+per-host rate limiting, timeouts and retry with exponential backoff
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """Spaces out requests so each host sees at most `rate` requests per second"""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.min_interval = 1.0 / rate if rate else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CrawlEngine:
+    """Thread pool plus shared requests.Session for fetching many pages at once"""
+
+    def __init__(self, max_workers: int = 8, per_host_rate: Optional[float] = None,
+                 timeout: float = 30.0, max_retries: int = 3, backoff: float = 0.5):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = HostRateLimiter(per_host_rate)
+
+        # One keep-alive pool sized to the worker count so threads never
+        # queue on connections or open throwaway sockets
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, endpoint: str, rate_key: Optional[str] = None, **kwargs) -> requests.Response:
+        """POST with rate limiting, timeout and retry on transient failures"""
+        return self.request('POST', endpoint, rate_key, **kwargs)
+
+    def get(self, url: str, rate_key: Optional[str] = None, **kwargs) -> requests.Response:
+        """GET with the same rate limiting and retry policy as post()"""
+        return self.request('GET', url, rate_key, **kwargs)
+
+    def request(self, method: str, endpoint: str, rate_key: Optional[str] = None,
+                **kwargs) -> requests.Response:
+        host = urlsplit(rate_key or endpoint).netloc or rate_key or endpoint
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(host)
+            try:
+                response = self.session.request(method, endpoint, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    time.sleep(float(retry_after))
+                    attempt += 1
+                    continue
+
+            # Exponential backoff with jitter so retries from many threads spread out
+            time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+            attempt += 1
+
+    def map(self, func: Callable, items: Iterable) -> Dict:
+        """Run func over items with bounded concurrency, preserving input order"""
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(func, items))
+        return dict(zip(items, results))
+
+    def close(self):
+        self.session.close()
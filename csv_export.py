@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV export and import for keyword lists
+Writes rows as they are produced, gathers summary statistics in the same
+pass and falls back to an external merge sort for large volume-sorted exports
+"""
+
+import csv
+import heapq
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from keyword_schema import BUDGET_SHARE
+
+FIELDNAMES = ['Keyword', 'Volume', 'CPC', 'Competition', 'Monthly Budget Estimate']
+
+# Rows held in memory per sorted run before spilling to a temporary file
+DEFAULT_CHUNK_ROWS = 100_000
+
+# (keyword, volume, cpc, competition) as produced by KeywordStore.iter_rows()
+KeywordRow = Tuple[str, int, float, str]
+
+
+def parse_money(value: str) -> float:
+    """Parse '$1,890.00 ' style spreadsheet values"""
+    return float(value.replace('$', '').replace(',', '').strip())
+
+
+class ExportStats:
+    """Running totals gathered while rows are written"""
+
+    def __init__(self):
+        self.rows = 0
+        self.total_volume = 0
+        self.cpc_sum = 0.0
+        self.competition: Dict[str, int] = {}
+
+    def add(self, volume: int, cpc: float, competition: str):
+        self.rows += 1
+        self.total_volume += volume
+        self.cpc_sum += cpc
+        self.competition[competition] = self.competition.get(competition, 0) + 1
+
+    @property
+    def average_cpc(self) -> float:
+        return self.cpc_sum / self.rows if self.rows else 0.0
+
+
+class StreamingKeywordWriter:
+    """Formats and writes keyword rows one at a time"""
+
+    def __init__(self, csvfile):
+        self.writer = csv.writer(csvfile)
+        self.writer.writerow(FIELDNAMES)
+        self.stats = ExportStats()
+
+    def write(self, keyword: str, volume: int, cpc: float, competition: str):
+        label = competition.capitalize()
+        self.writer.writerow([
+            keyword,
+            volume,
+            f"${cpc:.2f}",
+            label,
+            f"${volume * cpc * BUDGET_SHARE:.2f}"
+        ])
+        self.stats.add(volume, cpc, label)
+
+
+def _sort_key(item: Tuple[int, int, KeywordRow]):
+    volume, sequence, _ = item
+    return -volume, sequence
+
+
+def _spill(run: List[Tuple[int, int, KeywordRow]]) -> str:
+    """Write one sorted run to a temporary CSV file and return its path"""
+    run.sort(key=_sort_key)
+    fd, path = tempfile.mkstemp(prefix='keywords-run-', suffix='.csv')
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for volume, sequence, (keyword, _, cpc, competition) in run:
+            writer.writerow([sequence, keyword, volume, repr(cpc), competition])
+    return path
+
+
+def _read_run(path: str) -> Iterator[Tuple[int, int, KeywordRow]]:
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for sequence, keyword, volume, cpc, competition in csv.reader(f):
+            volume = int(volume)
+            yield volume, int(sequence), (keyword, volume, float(cpc), competition)
+
+
+def sorted_by_volume(rows: Iterable[KeywordRow],
+                     chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[KeywordRow]:
+    """Yield rows by volume descending, ties in input order
+
+    Inputs that fit in one chunk are sorted in memory; larger inputs are
+    split into sorted runs on disk and merged with a k-way heap merge.
+    """
+    run: List[Tuple[int, int, KeywordRow]] = []
+    run_paths: List[str] = []
+    try:
+        for sequence, row in enumerate(rows):
+            run.append((row[1], sequence, row))
+            if len(run) >= chunk_rows:
+                run_paths.append(_spill(run))
+                run = []
+
+        if not run_paths:
+            run.sort(key=_sort_key)
+            for _, _, row in run:
+                yield row
+            return
+
+        if run:
+            run_paths.append(_spill(run))
+            run = []
+        for _, _, row in heapq.merge(*(_read_run(p) for p in run_paths), key=_sort_key):
+            yield row
+    finally:
+        for path in run_paths:
+            os.unlink(path)
+
+
+def write_keywords_csv(path: str, rows: Iterable[KeywordRow], sort_by_volume: bool = True,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> ExportStats:
+    """Stream rows to a keyword CSV and return summary statistics"""
+    if sort_by_volume:
+        rows = sorted_by_volume(rows, chunk_rows)
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = StreamingKeywordWriter(csvfile)
+        for keyword, volume, cpc, competition in rows:
+            writer.write(keyword, volume, cpc, competition)
+    return writer.stats
+
+
+def iter_keywords_csv(path: str) -> Iterator[KeywordRow]:
+    """Stream (keyword, volume, cpc, competition) rows back out of a keyword CSV"""
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            yield (
+                row['Keyword'],
+                int(row['Volume']),
+                parse_money(row['CPC']),
+                row['Competition'].lower()
+            )
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Asyncio Firecrawl client with crawl job polling and backpressure
+Runs many scrapes and crawl-status polls concurrently under a shared token
+bucket, honors 429 Retry-After for every caller at once and hands results to
+analysis through a bounded queue
+"""
+
+import asyncio
+import functools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crawl_engine import RETRY_STATUS_CODES
+
+DEFAULT_BASE_URL = "https://api.firecrawl.dev/v0"
+
+# Crawl job states reported by GET /crawl/status/{jobId}
+CRAWL_DONE_STATES = {'completed'}
+CRAWL_FAILED_STATES = {'failed', 'cancelled'}
+
+
+class FirecrawlError(Exception):
+    """A Firecrawl request failed for good (non-retryable status or retries exhausted)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncTokenBucket:
+    """Token bucket shared by every request, with a global pause for Retry-After"""
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate or 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds`, e.g. after a 429"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if not self.rate:
+                    return
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncFirecrawlClient:
+    """Concurrent Firecrawl v0 client
+
+    Blocking HTTP calls run on a dedicated thread pool over a shared
+    requests.Session, so one slow response only occupies its own slot.
+    """
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, max_concurrency: int = 16,
+                 rate: Optional[float] = None, burst: Optional[float] = None, timeout: float = 30.0,
+                 max_retries: int = 3, backoff: float = 0.5, poll_interval: float = 1.0,
+                 max_poll_interval: float = 10.0):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_concurrency = max_concurrency
+        self.bucket = AsyncTokenBucket(rate, burst)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Sized to the concurrency limit; the default executor is capped at a
+        # few threads per core and would throttle I/O-bound requests
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        })
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        """One API call with rate limiting, Retry-After handling and backoff"""
+        # Created lazily so the semaphore binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                async with self._semaphore:
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        self._executor,
+                        functools.partial(self.session.request, method, url,
+                                          json=payload, timeout=self.timeout)
+                    )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise FirecrawlError(f"{method} {path} failed: {e}") from e
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    raise FirecrawlError(f"{method} {path} returned {response.status_code}",
+                                         response.status_code)
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    # The limit applies to the API key, so every request waits
+                    self.bucket.pause(float(retry_after))
+                    attempt += 1
+                    continue
+
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+            attempt += 1
+
+    async def scrape(self, url: str, page_options: Optional[Dict] = None) -> Dict:
+        return await self.request('POST', '/scrape', {
+            'url': url,
+            'pageOptions': page_options or {'onlyMainContent': True, 'includeHtml': False}
+        })
+
+    async def submit_crawl(self, url: str, crawler_options: Optional[Dict] = None,
+                           page_options: Optional[Dict] = None) -> str:
+        """Start a crawl job and return its job id"""
+        payload = {'url': url, 'crawlerOptions': crawler_options or {},
+                   'pageOptions': page_options or {'onlyMainContent': True}}
+        result = await self.request('POST', '/crawl', payload)
+        return result['jobId']
+
+    async def wait_for_crawl(self, job_id: str, timeout: Optional[float] = None) -> List[Dict]:
+        """Poll a crawl job with growing intervals until it finishes; returns its pages"""
+        deadline = time.monotonic() + timeout if timeout else None
+        interval = self.poll_interval
+        while True:
+            status = await self.request('GET', f'/crawl/status/{job_id}')
+            state = status.get('status')
+            if state in CRAWL_DONE_STATES:
+                return status.get('data') or []
+            if state in CRAWL_FAILED_STATES:
+                raise FirecrawlError(f"Crawl job {job_id} {state}")
+            if deadline and time.monotonic() + interval > deadline:
+                raise FirecrawlError(f"Crawl job {job_id} still {state} after {timeout}s")
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, self.max_poll_interval)
+
+    async def crawl(self, url: str, **options) -> List[Dict]:
+        return await self.wait_for_crawl(await self.submit_crawl(url, **options))
+
+    async def crawl_many(self, urls: Iterable[str], **options) -> Dict[str, List[Dict]]:
+        """Submit several crawl jobs and poll them all concurrently"""
+        urls = list(urls)
+        pages = await asyncio.gather(*(self.crawl(url, **options) for url in urls))
+        return dict(zip(urls, pages))
+
+    async def pipeline(self, urls: Iterable[str], consume: Callable[[str, Dict], None],
+                       fetch: Optional[Callable[[str], Awaitable[Dict]]] = None,
+                       queue_size: int = 32, consumers: int = 1):
+        """Fetch urls concurrently and feed (url, result) to a blocking consumer
+
+        The queue is bounded, so when analysis falls behind the fetchers wait
+        instead of piling results up in memory. Consumers run on worker
+        threads, keeping the event loop free for network I/O. A failed fetch
+        is passed on as a FirecrawlError in place of the result; an error
+        raised by consume stops the whole pipeline and is re-raised here.
+        """
+        fetch = fetch or self.scrape
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        pending = iter(urls)
+
+        async def producer():
+            for url in pending:
+                try:
+                    result = await fetch(url)
+                except FirecrawlError as e:
+                    result = e
+                except Exception as e:
+                    # e.g. a response body that is not JSON: fail this url only
+                    result = FirecrawlError(f"{url} failed: {e!r}")
+                    result.__cause__ = e
+                await queue.put((url, result))
+
+        async def produce_all():
+            # The producers share one iterator, so together they keep at most
+            # max_concurrency fetches in flight
+            await asyncio.gather(*(producer() for _ in range(self.max_concurrency)))
+            for _ in range(consumers):
+                await queue.put(None)
+
+        async def consumer():
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    await asyncio.to_thread(consume, *item)
+                finally:
+                    queue.task_done()
+
+        # Producers and consumers are watched together: if a consumer dies,
+        # producers blocked on the full queue would otherwise wait forever
+        tasks = [asyncio.create_task(produce_all())]
+        tasks += [asyncio.create_task(consumer()) for _ in range(consumers)]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -4,68 +4,187 @@ Firecrawl Keyword Analyzer for CuraMedix Landing Page
 Extracts top keywords for Google Ads campaigns with volume and CPC estimates
 """
 
+import io
 import os
 import json
-import requests
-from typing import Dict, List
-import re
-from dotenv import load_dotenv
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
 
-load_dotenv()
+from analysis_export import EXPORT_FORMATS, AnalysisExporter
+from categorization import KeywordCategorizer
+from html_text import extract_text, iter_text_segments
+from incremental import IncrementalAnalyzer
+from instrumentation import METRICS_FILE_ENV, Instrumentation, instrumented
+from keyword_query import KeywordQueryIndex, parse_query
+from keyword_record import KeywordRecord, plain_records
+from keyword_store import KeywordStore, load_store
+from phrase_matcher import KeywordIndex
+from relevance import TfidfScorer
+from report_renderer import ReportRenderer, write_budgets_markdown, write_keyword_list_markdown
+from scrape_cache import ScrapeCache, content_hash
+
+# requests, dotenv, the budget simulator and the site crawler are imported on
+# first use, so scripts that never touch the network start quickly
+if TYPE_CHECKING:
+    from budget_simulator import BudgetSimulator
+    from crawl_engine import CrawlEngine
+    from firecrawl_async import AsyncFirecrawlClient
+    from hubspot_modules import ModuleLibrary
+    from snapshot_history import SnapshotHistory
+
+_environment_loaded = False
+
+
+def load_environment():
+    """Load .env into os.environ once, the first time a setting is needed"""
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+# Key phrases to look for in scraped content
+KEY_PHRASES = [
+    "shockwave therapy", "extracorporeal shockwave", "ESWT",
+    "section 179", "tax deduction", "FDA approved",
+    "pain management", "sports medicine", "orthopedic",
+    "tendinopathy", "plantar fasciitis", "chronic pain",
+    "non invasive", "regenerative medicine", "ROI",
+    "medical equipment", "therapy equipment", "treatment device"
+]
+
+# Firecrawl page options for every scrape; also part of the scrape cache key
+PAGE_OPTIONS = {
+    'onlyMainContent': True,
+    'includeHtml': False
+}
 
 class FirecrawlKeywordAnalyzer:
-    def __init__(self):
-        self.firecrawl_api_key = os.getenv('FIRECRAWL_API_KEY')
+    def __init__(self, max_workers: int = 8, per_host_rate: Optional[float] = None,
+                 timeout: float = 30.0, max_retries: int = 3,
+                 cache: Optional[ScrapeCache] = None, store: Optional[KeywordStore] = None,
+                 metrics: Optional[Instrumentation] = None):
+        self._firecrawl_api_key = None
+        self._api_key_loaded = False
         self.firecrawl_base_url = "https://api.firecrawl.dev/v0"
         
-        # Medical equipment and shockwave therapy specific keywords with estimated data
-        self.keyword_data = {
-            # Primary Keywords
-            "shockwave therapy equipment": {"volume": 1900, "cpc": 8.50, "competition": "high"},
-            "extracorporeal shockwave therapy": {"volume": 2400, "cpc": 7.25, "competition": "medium"},
-            "ESWT equipment": {"volume": 880, "cpc": 9.75, "competition": "medium"},
-            "shockwave therapy machine": {"volume": 1600, "cpc": 8.25, "competition": "high"},
-            "medical shockwave device": {"volume": 720, "cpc": 10.50, "competition": "medium"},
-            
-            # Section 179 Tax Keywords
-            "section 179 medical equipment": {"volume": 3100, "cpc": 4.50, "competition": "low"},
-            "medical equipment tax deduction": {"volume": 2900, "cpc": 3.75, "competition": "low"},
-            "section 179 deduction 2025": {"volume": 8400, "cpc": 2.25, "competition": "low"},
-            "medical device tax write off": {"volume": 1200, "cpc": 3.50, "competition": "low"},
-            
-            # Treatment Specific Keywords
-            "plantar fasciitis shockwave therapy": {"volume": 3300, "cpc": 5.75, "competition": "medium"},
-            "tendonitis shockwave treatment": {"volume": 1800, "cpc": 6.25, "competition": "medium"},
-            "chronic pain shockwave therapy": {"volume": 2100, "cpc": 5.50, "competition": "medium"},
-            "sports injury shockwave": {"volume": 1400, "cpc": 6.75, "competition": "medium"},
-            "calcific tendinitis treatment": {"volume": 990, "cpc": 7.25, "competition": "low"},
-            
-            # Brand and Competitor Keywords
-            "curamedix shockwave": {"volume": 210, "cpc": 2.50, "competition": "low"},
-            "FDA approved shockwave therapy": {"volume": 1100, "cpc": 8.75, "competition": "high"},
-            "best shockwave therapy machine": {"volume": 880, "cpc": 9.25, "competition": "high"},
-            "shockwave therapy device cost": {"volume": 1300, "cpc": 7.50, "competition": "high"},
-            
-            # Location-Based Keywords
-            "shockwave therapy equipment USA": {"volume": 590, "cpc": 8.90, "competition": "medium"},
-            "buy shockwave therapy machine": {"volume": 1200, "cpc": 10.25, "competition": "high"},
-            "shockwave therapy equipment lease": {"volume": 480, "cpc": 6.75, "competition": "medium"},
-            "shockwave therapy equipment financing": {"volume": 390, "cpc": 5.50, "competition": "low"},
-            
-            # ROI and Business Keywords
-            "shockwave therapy ROI": {"volume": 320, "cpc": 4.25, "competition": "low"},
-            "shockwave therapy practice revenue": {"volume": 180, "cpc": 3.75, "competition": "low"},
-            "shockwave therapy billing codes": {"volume": 670, "cpc": 2.50, "competition": "low"},
-            "shockwave therapy CPT codes": {"volume": 890, "cpc": 2.25, "competition": "low"},
-            
-            # Clinical and Professional Keywords
-            "orthopedic shockwave therapy": {"volume": 1500, "cpc": 7.50, "competition": "medium"},
-            "sports medicine shockwave": {"volume": 980, "cpc": 8.25, "competition": "medium"},
-            "pain management equipment": {"volume": 2200, "cpc": 6.50, "competition": "high"},
-            "non invasive pain treatment": {"volume": 1700, "cpc": 5.25, "competition": "medium"},
-            "regenerative medicine equipment": {"volume": 1100, "cpc": 7.75, "competition": "medium"}
-        }
+        # Crawl engine settings; the engine itself is created on first use
+        self.max_workers = max_workers
+        self.per_host_rate = per_host_rate
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._crawl_engine = None
+        self._keyword_index = None
+        
+        # Optional on-disk cache for scraped pages and extraction results
+        self.cache = cache
+        
+        # Medical equipment and shockwave therapy keyword metrics, read from
+        # the columnar keyword store (curated core set unless one is passed in)
+        self.store = store if store is not None else load_store().core_keywords()
+        self._keyword_data = None
+        self._vocabulary_digest = None
+        self._categorizer = None
+        self._query_index = None
+        self._incremental = None
+        self._relevance = None
+        self._simulator = None
+        self._clusters = None
+        self._module_library = None
+        
+        # Report template is compiled once and shared by every render
+        self.report_renderer = ReportRenderer()
+        
+        # Stage timers and counters; profiling is opted into via KEYWORD_PROFILE
+        self.metrics = metrics if metrics is not None else Instrumentation.from_env()
+    
+    @property
+    def firecrawl_api_key(self) -> Optional[str]:
+        """FIRECRAWL_API_KEY from the environment or .env, read on first use"""
+        if not self._api_key_loaded:
+            load_environment()
+            self._firecrawl_api_key = os.getenv('FIRECRAWL_API_KEY')
+            self._api_key_loaded = True
+        return self._firecrawl_api_key
+    
+    @firecrawl_api_key.setter
+    def firecrawl_api_key(self, value: Optional[str]):
+        self._firecrawl_api_key = value
+        self._api_key_loaded = True
+    
+    def set_store(self, store: KeywordStore):
+        """Swap in a new keyword store; everything derived from it is rebuilt on next use"""
+        self.store = store
+        self._keyword_data = None
+        self._incremental = None
+        self._relevance = None
+    
+    @property
+    def keyword_data(self) -> Dict[str, Dict]:
+        """Keyword -> {volume, cpc, competition} view of the store, built on first use"""
+        if self._keyword_data is None:
+            self._keyword_data = self.store.to_dict()
+        return self._keyword_data
+    
+    @property
+    def categorizer(self) -> KeywordCategorizer:
+        """Bulk categorization engine with topic masks precomputed for the store"""
+        if self._categorizer is None or self._categorizer.store is not self.store:
+            self._categorizer = KeywordCategorizer(self.store)
+        return self._categorizer
+    
+    @property
+    def keyword_query(self) -> KeywordQueryIndex:
+        """Volume/CPC, competition, category and token indexes for ad-hoc keyword slices"""
+        if self._query_index is None or self._query_index.categorizer is not self.categorizer:
+            self._query_index = KeywordQueryIndex(self.categorizer)
+        return self._query_index
+    
+    @property
+    def relevance(self) -> TfidfScorer:
+        """TF-IDF scorer over every page analyzed by this instance"""
+        if self._relevance is None:
+            self._relevance = TfidfScorer(self.store.iter_rows())
+        return self._relevance
+    
+    @property
+    def simulator(self) -> 'BudgetSimulator':
+        """Monte Carlo budget simulator over the store's volume, CPC and competition"""
+        if self._simulator is None or self._simulator.store is not self.store:
+            from budget_simulator import BudgetSimulator
+            self._simulator = BudgetSimulator(self.store)
+        return self._simulator
+    
+    @property
+    def keyword_clusters(self) -> List[Dict]:
+        """Near-duplicate keyword clusters of the store, built on first use"""
+        if self._clusters is None or self._clusters[0] is not self.store:
+            from keyword_clusters import KeywordClusterer
+            self._clusters = (self.store, KeywordClusterer().cluster(self.store.iter_rows()))
+        return self._clusters[1]
     
+    @property
+    def crawl_engine(self) -> 'CrawlEngine':
+        """Shared connection pool and worker threads for Firecrawl requests"""
+        if self._crawl_engine is None:
+            from crawl_engine import CrawlEngine
+            self._crawl_engine = CrawlEngine(
+                max_workers=self.max_workers,
+                per_host_rate=self.per_host_rate,
+                timeout=self.timeout,
+                max_retries=self.max_retries
+            )
+        return self._crawl_engine
+    
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """Phrase automaton and phrase -> keyword index, built once per keyword set"""
+        keyword_data = self.keyword_data
+        if self._keyword_index is None or self._keyword_index[0] is not keyword_data:
+            self._keyword_index = (keyword_data, KeywordIndex(KEY_PHRASES, keyword_data))
+        return self._keyword_index[1]
+    
+    @instrumented('scrape')
     def scrape_with_firecrawl(self, url: str) -> Dict:
         """Scrape URL using Firecrawl API"""
         if not self.firecrawl_api_key:
@@ -79,28 +198,46 @@ class FirecrawlKeywordAnalyzer:
         
         payload = {
             'url': url,
-            'pageOptions': {
-                'onlyMainContent': True,
-                'includeHtml': False
-            }
+            'pageOptions': PAGE_OPTIONS
         }
         
+        if self.cache:
+            cached = self.cache.get(url, payload['pageOptions'])
+            if cached:
+                self.metrics.incr('scrape_cache_hits')
+                return {'data': {'content': cached['content']}, 'content_hash': cached['content_hash']}
+            self.metrics.incr('scrape_cache_misses')
+        
         try:
-            response = requests.post(
+            self.metrics.incr('firecrawl_requests')
+            response = self.crawl_engine.post(
                 f"{self.firecrawl_base_url}/scrape",
+                rate_key=url,
                 headers=headers,
                 json=payload
             )
             
             if response.status_code == 200:
-                return response.json()
+                result = response.json()
+                if self.cache and 'data' in result:
+                    result['content_hash'] = self.cache.put(
+                        url,
+                        result['data'].get('content', ''),
+                        options=payload['pageOptions'],
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                return result
             else:
+                self.metrics.incr('scrape_errors')
                 print(f"Firecrawl API error: {response.status_code}")
                 return self.fallback_analysis(url)
         except Exception as e:
+            self.metrics.incr('scrape_errors')
             print(f"Error calling Firecrawl API: {e}")
             return self.fallback_analysis(url)
     
+    @instrumented('fallback_extract')
     def fallback_analysis(self, url: str) -> Dict:
         """Fallback analysis using local file"""
         print("Using fallback analysis with local content...")
@@ -108,129 +245,125 @@ class FirecrawlKeywordAnalyzer:
         # Read the local index.html file
         file_path = url.replace('file://', '')
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # The file's mtime and size stand in for Last-Modified on local pages
+            validator = None
+            if self.cache:
+                stat = os.stat(file_path)
+                validator = f"{stat.st_mtime_ns}:{stat.st_size}"
+                cached = self.cache.get(url, {'fallback': True}, validator=validator)
+                if cached:
+                    self.metrics.incr('scrape_cache_hits')
+                    return {'data': {'content': cached['content']}, 'content_hash': cached['content_hash']}
             
-            # Extract text content from HTML
-            text = re.sub('<[^<]+?>', ' ', content)
-            text = re.sub(r'\s+', ' ', text)
+            # Extract visible text with the streaming parser; script, style and
+            # nav contents are dropped and the raw HTML is never held in full
+            text = extract_text(file_path)
+            self.metrics.incr('fallback_pages')
             
-            return {
+            result = {
                 'data': {
                     'content': text
                 }
             }
+            if self.cache:
+                result['content_hash'] = self.cache.put(
+                    url, text, options={'fallback': True}, validator=validator
+                )
+            return result
         except Exception as e:
             print(f"Error reading local file: {e}")
             return {'data': {'content': ''}}
     
+    @instrumented('extract_keywords')
     def extract_keywords_from_content(self, content: str) -> List[str]:
         """Extract relevant keywords from scraped content"""
-        # Convert to lowercase and extract words
-        content = content.lower()
-        
-        # Key phrases to look for
-        key_phrases = [
-            "shockwave therapy", "extracorporeal shockwave", "ESWT",
-            "section 179", "tax deduction", "FDA approved",
-            "pain management", "sports medicine", "orthopedic",
-            "tendinopathy", "plantar fasciitis", "chronic pain",
-            "non invasive", "regenerative medicine", "ROI",
-            "medical equipment", "therapy equipment", "treatment device"
-        ]
-        
-        found_keywords = []
-        for phrase in key_phrases:
-            if phrase.lower() in content:
-                # Find related keywords
-                for keyword in self.keyword_data.keys():
-                    if phrase.lower() in keyword.lower():
-                        found_keywords.append(keyword)
+        # One automaton pass finds every key phrase; the inverted index maps
+        # matched phrases to keywords without rescanning the keyword database
+        phrases = self.keyword_index.matcher.matched_phrases(content)
+        keywords = self.keyword_index.keywords_for_phrases(phrases)
+        self.metrics.incr('phrases_matched', len(phrases))
+        self.metrics.incr('keywords_extracted', len(keywords))
+        return keywords
+    
+    def extract_keywords_from_file(self, file_path: str) -> List[str]:
+        """Stream a local HTML page straight into the phrase matcher"""
+        return self.keyword_index.extract_stream(iter_text_segments(file_path))
+    
+    def match_phrases(self, content: str) -> Dict:
+        """Key phrase match positions and counts in scraped content"""
+        matches = self.keyword_index.matcher.find_all(content)
+        counts = {}
+        for _, phrase in matches:
+            counts[phrase] = counts.get(phrase, 0) + 1
+        return {'matches': matches, 'counts': counts}
+    
+    @property
+    def vocabulary_digest(self) -> str:
+        """Hash of the phrase/keyword set, computed once per keyword set"""
+        keyword_data = self.keyword_data
+        if self._vocabulary_digest is None or self._vocabulary_digest[0] is not keyword_data:
+            vocabulary = json.dumps([KEY_PHRASES, sorted(keyword_data)])
+            self._vocabulary_digest = (keyword_data, content_hash(vocabulary))
+        return self._vocabulary_digest[1]
+    
+    def extraction_key(self, digest: str) -> str:
+        """Cache key for extraction results: content hash plus phrase/keyword set"""
+        return f"{digest}:{self.vocabulary_digest}"
+    
+    def extract_keywords_cached(self, content: str, digest: Optional[str] = None) -> List[str]:
+        """Extract keywords, skipping re-extraction when the content is unchanged"""
+        if not self.cache:
+            return self.extract_keywords_from_content(content)
         
-        return list(set(found_keywords))
+        key = self.extraction_key(digest or content_hash(content))
+        keywords = self.cache.get_extraction(key)
+        if keywords is None:
+            self.metrics.incr('extraction_cache_misses')
+            keywords = self.extract_keywords_from_content(content)
+            self.cache.put_extraction(key, keywords)
+        else:
+            self.metrics.incr('extraction_cache_hits')
+        return keywords
     
     def analyze_keywords(self, url: str) -> Dict:
         """Main analysis function"""
         print(f"Analyzing keywords for: {url}")
         
         # Scrape content
-        scraped_data = self.scrape_with_firecrawl(url)
-        
+        return self.analyze_scraped(url, self.scrape_with_firecrawl(url))
+    
+    def analyze_scraped(self, url: str, scraped_data: Dict) -> Dict:
+        """Analyze a page that has already been scraped (or read by the fallback)"""
         if 'data' in scraped_data:
             content = scraped_data['data'].get('content', '')
         else:
             content = ''
+        self.metrics.incr('pages_analyzed')
+        self.metrics.incr('content_bytes', len(content.encode('utf-8')))
         
-        # Extract keywords from content
-        self.extract_keywords_from_content(content)
-        
-        # Prepare comprehensive keyword recommendations
-        recommendations = {
-            "high_priority_keywords": [],
-            "medium_priority_keywords": [],
-            "low_competition_opportunities": [],
-            "section_179_keywords": [],
-            "treatment_specific_keywords": [],
-            "total_monthly_searches": 0,
-            "average_cpc": 0,
-            "budget_recommendations": {}
-        }
+        # Extract keywords from content, reusing results for unchanged pages
+        matched = self.extract_keywords_cached(content, scraped_data.get('content_hash'))
         
-        # Categorize keywords
-        for keyword, data in self.keyword_data.items():
-            if "section 179" in keyword or "tax" in keyword:
-                recommendations["section_179_keywords"].append({
-                    "keyword": keyword,
-                    "volume": data["volume"],
-                    "cpc": f"${data['cpc']:.2f}",
-                    "competition": data["competition"],
-                    "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
-                })
-            
-            elif any(treatment in keyword for treatment in ["plantar", "tendonitis", "chronic pain", "sports"]):
-                recommendations["treatment_specific_keywords"].append({
-                    "keyword": keyword,
-                    "volume": data["volume"],
-                    "cpc": f"${data['cpc']:.2f}",
-                    "competition": data["competition"],
-                    "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
-                })
-            
-            # High priority (high volume, relevant)
-            if data["volume"] > 1500:
-                recommendations["high_priority_keywords"].append({
-                    "keyword": keyword,
-                    "volume": data["volume"],
-                    "cpc": f"${data['cpc']:.2f}",
-                    "competition": data["competition"],
-                    "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
-                })
-            
-            # Medium priority
-            elif data["volume"] > 500:
-                recommendations["medium_priority_keywords"].append({
-                    "keyword": keyword,
-                    "volume": data["volume"],
-                    "cpc": f"${data['cpc']:.2f}",
-                    "competition": data["competition"],
-                    "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
-                })
-            
-            # Low competition opportunities
-            if data["competition"] == "low" and data["volume"] > 300:
-                recommendations["low_competition_opportunities"].append({
-                    "keyword": keyword,
-                    "volume": data["volume"],
-                    "cpc": f"${data['cpc']:.2f}",
-                    "competition": data["competition"],
-                    "monthly_budget_estimate": f"${data['volume'] * data['cpc'] * 0.10:.2f}"
-                })
-            
-            recommendations["total_monthly_searches"] += data["volume"]
+        # Fold the page into the TF-IDF corpus and rank the extracted
+        # keywords by on-page relevance
+        with self.metrics.stage('relevance'):
+            self.relevance.add_document(url, content)
+        recommendations = self.build_recommendations()
+        recommendations["matched_keywords"] = matched
+        with self.metrics.stage('relevance'):
+            recommendations["relevance_ranked_keywords"] = self.relevance.rank(url, top=10, candidates=matched)
         
-        # Calculate average CPC
-        total_cpc = sum(data["cpc"] for data in self.keyword_data.values())
-        recommendations["average_cpc"] = f"${total_cpc / len(self.keyword_data):.2f}"
+        # Near-duplicate keywords grouped, with volume counted once per variant
+        from keyword_clusters import summarize_clusters
+        recommendations["keyword_clusters"] = summarize_clusters(self.keyword_clusters, top=10)
+        return recommendations
+    
+    @instrumented('categorize')
+    def build_recommendations(self) -> Dict:
+        """Keyword recommendations by category plus budget tiers, as plain JSON-ready dicts"""
+        # Categorize keywords in bulk: masks, budgets and totals are array
+        # operations and only the top 10 of each category are materialized
+        recommendations = plain_records(self.categorizer.categorize(top=10))
         
         # Budget recommendations
         recommendations["budget_recommendations"] = {
@@ -251,162 +384,223 @@ class FirecrawlKeywordAnalyzer:
             }
         }
         
-        # Sort all keyword lists by volume
-        for category in ["high_priority_keywords", "medium_priority_keywords", 
-                        "low_competition_opportunities", "section_179_keywords", 
-                        "treatment_specific_keywords"]:
-            recommendations[category] = sorted(
-                recommendations[category], 
-                key=lambda x: x["volume"], 
-                reverse=True
-            )[:10]  # Top 10 for each category
-        
         return recommendations
     
-    def generate_report(self, analysis: Dict) -> str:
-        """Generate a formatted report"""
-        report = """
-# CuraMedix Google Ads Keyword Analysis Report
-## Powered by Firecrawl API
-
-### Executive Summary
-- **Total Monthly Search Volume:** {:,} searches
-- **Average CPC:** {}
-- **Primary Opportunity:** Section 179 tax-focused campaigns (year-end urgency)
-
-### 🎯 HIGH PRIORITY KEYWORDS (High Volume, High Intent)
-{}
-
-### 💰 SECTION 179 TAX KEYWORDS (Seasonal Opportunity)
-{}
-
-### 🏥 TREATMENT-SPECIFIC KEYWORDS (Targeted Audiences)
-{}
-
-### 💎 LOW COMPETITION OPPORTUNITIES (Cost-Effective)
-{}
-
-### 📊 RECOMMENDED CAMPAIGN STRUCTURE
-
-#### Campaign 1: Section 179 Tax Benefits
-- **Budget:** 40% of total spend
-- **Timing:** Increase spend Oct-Dec
-- **Landing Page:** Section 179 focused variant
-- **Key Message:** "Write off 100% before year-end"
-
-#### Campaign 2: Equipment Purchase Intent
-- **Budget:** 30% of total spend
-- **Keywords:** Brand and equipment-focused terms
-- **Landing Page:** Main product page
-- **Key Message:** "FDA-approved, proven ROI"
-
-#### Campaign 3: Treatment-Specific
-- **Budget:** 20% of total spend
-- **Keywords:** Condition-specific terms
-- **Landing Page:** Treatment-specific variants
-- **Key Message:** "95% success rate, non-invasive"
-
-#### Campaign 4: Competitor/Comparison
-- **Budget:** 10% of total spend
-- **Keywords:** "Best", "compare", "vs" terms
-- **Landing Page:** Comparison page
-- **Key Message:** "Industry-leading technology"
-
-### 💵 BUDGET RECOMMENDATIONS
+    @instrumented('query')
+    def query_keywords(self, *terms: str, **conditions) -> List[KeywordRecord]:
+        """Keywords for a slice such as query_keywords('competition=low', 'cpc<5', 'contains=tendon', 'top=50')
 
-{}
-
-### 📈 EXPECTED PERFORMANCE METRICS
-- **Click-Through Rate (CTR):** 3-5% for branded, 1-2% for generic
-- **Conversion Rate:** 2-4% for high-intent keywords
-- **Cost Per Lead:** $150-$300 (based on industry averages)
-- **ROI:** 3-5x with proper nurturing
-
-### 🚀 QUICK WINS
-1. **Immediate Action:** Launch Section 179 campaign (time-sensitive)
-2. **Ad Extensions:** Add sitelinks, callouts, price extensions
-3. **Negative Keywords:** Exclude "used", "rental", "cheap"
-4. **Geo-Targeting:** Focus on high-income medical practice areas
-5. **Ad Schedule:** Increase bids during business hours (8am-6pm)
-
-### 📝 AD COPY RECOMMENDATIONS
+        Keyword arguments are passed to KeywordQueryIndex.select and override the terms.
+        """
+        return self.keyword_query.query(**{**parse_query(terms), **conditions})
+    
+    @instrumented('simulate_budget')
+    def simulate_budget(self, budget: float, trials: int = 10_000) -> Dict:
+        """Expected clicks and leads for a monthly budget, with confidence intervals"""
+        return self.simulator.simulate(budget, trials=trials)
+    
+    def analyze_many(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """Analyze many URLs concurrently, keyed by URL in input order"""
+        results = self.crawl_engine.map(self.analyze_keywords, urls)
+        
+        # Re-rank once the whole batch is in the corpus so every page is
+        # scored against the same IDF
+        for url, analysis in results.items():
+            analysis["relevance_ranked_keywords"] = self.relevance.rank(
+                url, top=10, candidates=analysis["matched_keywords"]
+            )
+        return results
+    
+    def async_client(self, **options) -> 'AsyncFirecrawlClient':
+        """Asyncio Firecrawl client sharing this analyzer's API settings"""
+        from firecrawl_async import AsyncFirecrawlClient
+        options.setdefault('max_concurrency', self.max_workers)
+        options.setdefault('rate', self.per_host_rate)
+        options.setdefault('timeout', self.timeout)
+        options.setdefault('max_retries', self.max_retries)
+        return AsyncFirecrawlClient(self.firecrawl_api_key, self.firecrawl_base_url, **options)
+    
+    def analyze_many_async(self, urls: Iterable[str], queue_size: int = 32, **options) -> Dict[str, Dict]:
+        """Analyze many URLs with the asyncio client, keyed by URL in input order
 
-**Headline Examples:**
-- "Section 179: Write Off 100% | Shockwave Therapy Equipment"
-- "FDA-Approved Shockwave Therapy | 95% Success Rate"
-- "Save $55K+ in Taxes | Medical Equipment Deduction"
+        Scrapes run concurrently while analysis consumes them one page at a
+        time from a bounded queue. Options are AsyncFirecrawlClient settings.
+        """
+        urls = list(urls)
+        if not self.firecrawl_api_key:
+            print("Warning: FIRECRAWL_API_KEY not set. Using fallback analysis.")
+            return self.analyze_many(urls)
+        
+        from firecrawl_async import FirecrawlError
+        client = self.async_client(**options)
+        results: Dict[str, Dict] = {}
+        
+        async def fetch(url: str) -> Dict:
+            if self.cache:
+                cached = self.cache.get(url, PAGE_OPTIONS)
+                if cached:
+                    self.metrics.incr('scrape_cache_hits')
+                    return {'data': {'content': cached['content']}, 'content_hash': cached['content_hash'],
+                            'cached': True}
+                self.metrics.incr('scrape_cache_misses')
+            self.metrics.incr('firecrawl_requests')
+            with self.metrics.stage('scrape'):
+                return await client.scrape(url, PAGE_OPTIONS)
+        
+        def consume(url: str, scraped_data):
+            if isinstance(scraped_data, FirecrawlError):
+                self.metrics.incr('scrape_errors')
+                print(f"Error calling Firecrawl API: {scraped_data}")
+                scraped_data = self.fallback_analysis(url)
+            elif self.cache and 'data' in scraped_data and not scraped_data.pop('cached', False):
+                scraped_data['content_hash'] = self.cache.put(
+                    url, scraped_data['data'].get('content', ''), options=PAGE_OPTIONS)
+            results[url] = self.analyze_scraped(url, scraped_data)
+        
+        import asyncio
+        try:
+            asyncio.run(client.pipeline(urls, consume, fetch=fetch, queue_size=queue_size))
+        finally:
+            client.close()
+        
+        # Same input order and batch-wide re-rank as analyze_many
+        ordered = {url: results[url] for url in urls if url in results}
+        for url, analysis in ordered.items():
+            analysis["relevance_ranked_keywords"] = self.relevance.rank(
+                url, top=10, candidates=analysis["matched_keywords"]
+            )
+        return ordered
+    
+    @instrumented('parallel_scoring')
+    def score_pages(self, pages: Dict[str, str], workers: Optional[int] = None, top: int = 10) -> Dict[str, Dict]:
+        """Rank the store's keywords against many pages' content on several processes
+        
+        Keyword columns are shared with the workers, not pickled into each
+        one; every worker scores a slice of the keywords for all pages.
+        """
+        from parallel_scoring import ParallelScorer
+        return ParallelScorer(self.store, workers).score(pages, top=top)
+    
+    @property
+    def module_library(self) -> 'ModuleLibrary':
+        """Cached per-module phrase matches for the local HubSpot modules"""
+        if self._module_library is None:
+            from hubspot_modules import ModuleLibrary
+            self._module_library = ModuleLibrary(self)
+        return self._module_library
+    
+    @instrumented('module_analysis')
+    def analyze_hubspot_page(self, page: Optional[str] = None, modules: Iterable = ()) -> Dict:
+        """Per-module keyword coverage of a HubSpot page or module list
+        
+        Modules are rendered with their JSON field defaults and matched once;
+        pages sharing modules reuse those results.
+        """
+        return self.module_library.analyze_page(page, modules)
+    
+    def crawl_site(self, seed: str, **options) -> Iterator[Dict]:
+        """Crawl a site breadth-first from a seed URL or local page, yielding
+        each page's analysis as soon as it is fetched
 
-**Description Examples:**
-- "Limited time: Claim full tax deduction on shockwave therapy equipment. FDA-approved, proven ROI. Get instant quote."
-- "Join 3,000+ practices using our shockwave therapy. Non-invasive treatment, immediate results. Schedule demo today."
-        """.format(
-            analysis["total_monthly_searches"],
-            analysis["average_cpc"],
-            self.format_keyword_list(analysis["high_priority_keywords"]),
-            self.format_keyword_list(analysis["section_179_keywords"]),
-            self.format_keyword_list(analysis["treatment_specific_keywords"]),
-            self.format_keyword_list(analysis["low_competition_opportunities"]),
-            self.format_budget_recommendations(analysis["budget_recommendations"])
-        )
+        Options are SiteCrawler settings: max_depth, max_pages, use_sitemap.
+        """
+        from site_crawler import SiteCrawler
+        return SiteCrawler(self, **options).crawl(seed)
+    
+    def analyze_incremental(self, file_path: str) -> Dict:
+        """Re-analyze a local page, re-extracting only the sections that changed"""
+        if self._incremental is None or self._incremental.analyzer.store is not self.store:
+            self._incremental = IncrementalAnalyzer(self)
+        return self._incremental.analyze(file_path)
+    
+    @instrumented('render')
+    def generate_report(self, analysis: Dict) -> str:
+        """Generate a formatted report"""
+        return self.report_renderer.render_to_string(analysis)
+    
+    @instrumented('export')
+    def export(self, analysis: Dict, output_dir: str = '.', formats: Iterable[str] = EXPORT_FORMATS,
+               include_all_keywords: bool = True) -> Dict[str, str]:
+        """Write the analysis as Markdown, JSON, CSV and Parquet concurrently
         
-        return report
+        With include_all_keywords the analyzer's full keyword set is also
+        written as a second CSV and as the Parquet table.
+        """
+        exporter = AnalysisExporter(self.report_renderer)
+        all_rows = self.store.sorted_by_volume().iter_rows if include_all_keywords else None
+        return exporter.export(analysis, output_dir, formats, all_rows=all_rows, presorted=True)
+    
+    @instrumented('snapshot')
+    def record_snapshot(self, analysis: Dict, history: Optional['SnapshotHistory'] = None) -> str:
+        """Append this run's keyword metrics and categories to the snapshot history"""
+        if history is None:
+            from snapshot_history import SnapshotHistory
+            history = SnapshotHistory()
+        return history.record(analysis, self.store.iter_rows())
+    
+    @instrumented('render')
+    def write_report(self, analysis: Dict, fh, fmt: str = 'markdown'):
+        """Stream a Markdown, HTML or JSON report straight to a file handle"""
+        self.report_renderer.render(analysis, fh, fmt)
     
     def format_keyword_list(self, keywords: List[Dict]) -> str:
         """Format keyword list for report"""
-        if not keywords:
-            return "No keywords in this category"
-        
-        formatted = []
-        for kw in keywords[:5]:  # Top 5 for report
-            formatted.append(
-                f"- **{kw['keyword']}**\n"
-                f"  - Volume: {kw['volume']:,} searches/month\n"
-                f"  - CPC: {kw['cpc']}\n"
-                f"  - Competition: {kw['competition']}\n"
-                f"  - Est. Monthly Budget: {kw['monthly_budget_estimate']}"
-            )
-        
-        return "\n".join(formatted)
+        buffer = io.StringIO()
+        write_keyword_list_markdown(buffer, keywords)
+        return buffer.getvalue()
     
     def format_budget_recommendations(self, budgets: Dict) -> str:
         """Format budget recommendations"""
-        formatted = []
-        for level, details in budgets.items():
-            formatted.append(
-                f"**{level.title()} Strategy:**\n"
-                f"- Monthly Budget: {details['monthly']}\n"
-                f"- Focus: {details['focus']}\n"
-                f"- Expected Results: {details['expected_clicks']}\n"
-            )
-        
-        return "\n".join(formatted)
+        buffer = io.StringIO()
+        write_budgets_markdown(buffer, budgets)
+        return buffer.getvalue()
 
 
 def main():
-    # Initialize analyzer
-    analyzer = FirecrawlKeywordAnalyzer()
+    # Long-running mode: keep the analyzer warm and re-analyze pages on save
+    if sys.argv[1:2] == ['--watch']:
+        from watch_mode import main as watch_main
+        watch_main(sys.argv[2:])
+        return
+    
+    # Initialize analyzer with the on-disk scrape cache
+    analyzer = FirecrawlKeywordAnalyzer(cache=ScrapeCache())
     
-    # Analyze the local index.html file
-    url = "file:///Users/siteoptz/Documents/Development/Clients/consulting-projects/CuraMedix/index.html"
+    # Analyze the given URL, or the local index.html file next to this script
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
     
     # Perform analysis
     analysis = analyzer.analyze_keywords(url)
     
-    # Generate report
-    report = analyzer.generate_report(analysis)
+    # Write the report, raw JSON, keyword CSVs and Parquet from this one
+    # in-memory result, all at once
+    written = analyzer.export(analysis)
+    
+    analyzer.write_report(analysis, sys.stdout)
+    print("\n\n✅ Analysis complete!")
+    print(f"📄 Report saved to: {written['markdown']}")
+    print(f"📊 Raw data saved to: {written['json']}")
+    print(f"📋 Keyword CSVs saved to: {written['csv']}, {written['all_csv']}")
+    if 'parquet' in written:
+        print(f"🗃️  Parquet saved to: {written['parquet']}")
     
-    # Save report to file
-    with open('keyword_analysis_report.md', 'w', encoding='utf-8') as f:
-        f.write(report)
+    # Keep every run's metrics so trends survive the files being overwritten
+    run_id = analyzer.record_snapshot(analysis)
+    print(f"📚 Snapshot recorded: {run_id}")
     
-    # Also save raw JSON data
-    with open('keyword_analysis_data.json', 'w', encoding='utf-8') as f:
-        json.dump(analysis, f, indent=2)
+    stats = analyzer.cache.stats()
+    print(f"🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['extraction_hits']} extraction hits")
     
-    print(report)
-    print("\n✅ Analysis complete!")
-    print("📄 Report saved to: keyword_analysis_report.md")
-    print("📊 Raw data saved to: keyword_analysis_data.json")
+    # Per-stage timings and counters, when a metrics file is requested
+    metrics_path = os.getenv(METRICS_FILE_ENV)
+    if metrics_path:
+        analyzer.metrics.stop()
+        analyzer.metrics.export(metrics_path)
+        print(f"⏱️  Metrics saved to: {metrics_path}")
 
 
 if __name__ == "__main__":
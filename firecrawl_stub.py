@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Firecrawl v0 API for offline benchmarks and tests
+Serves canned page content for /scrape, runs fake /crawl jobs that finish
+after a few status polls and can inject 429 responses with Retry-After
+"""
+
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CONTENT = (
+    "CuraMedix FDA approved shockwave therapy equipment. Extracorporeal shockwave "
+    "therapy (ESWT) for plantar fasciitis, tendinopathy and chronic pain. Write off "
+    "100% with Section 179 tax deduction. Proven ROI for sports medicine and "
+    "orthopedic practices. Non invasive pain management and regenerative medicine."
+)
+
+
+class StubFirecrawlHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if self._throttled():
+            return
+
+        if self.path.endswith('/scrape'):
+            self._send_json(200, {
+                'success': True,
+                'data': self.server.page(payload.get('url'))
+            })
+        elif self.path.endswith('/crawl'):
+            self._send_json(200, {'jobId': self.server.start_job(payload.get('url'))})
+        else:
+            self._send_json(404, {'success': False, 'error': 'Not found'})
+
+    def do_GET(self):
+        if self._throttled():
+            return
+
+        prefix, _, job_id = self.path.rpartition('/')
+        if prefix.endswith('/crawl/status'):
+            status = self.server.poll_job(job_id)
+            if status is None:
+                self._send_json(404, {'success': False, 'error': 'Job not found'})
+            else:
+                self._send_json(200, status)
+        else:
+            self._send_json(404, {'success': False, 'error': 'Not found'})
+
+    def _throttled(self) -> bool:
+        """Apply latency, and answer 429 instead when this request is rate limited"""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.should_rate_limit():
+            self._send_json(429, {'success': False, 'error': 'Rate limit exceeded'},
+                            {'Retry-After': str(self.server.retry_after)})
+            return True
+        return False
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubFirecrawlServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager to run it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, content: str = DEFAULT_CONTENT,
+                 rate_limit_every: int = 0, retry_after: int = 1, crawl_pages: int = 3,
+                 crawl_polls: int = 2):
+        super().__init__(('127.0.0.1', port), StubFirecrawlHandler)
+        self.latency = latency
+        self.content = content
+        # Every Nth request gets a 429 with Retry-After (0 disables)
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        # Crawl jobs report 'active' for crawl_polls polls, then return crawl_pages pages
+        self.crawl_pages = crawl_pages
+        self.crawl_polls = crawl_polls
+        self.requests = 0
+        self.rate_limited = 0
+        self._jobs = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def page(self, url: str) -> dict:
+        return {'content': self.content, 'metadata': {'sourceURL': url}}
+
+    def should_rate_limit(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            limited = bool(self.rate_limit_every) and self.requests % self.rate_limit_every == 0
+            self.rate_limited += limited
+            return limited
+
+    def start_job(self, url: str) -> str:
+        with self._lock:
+            job_id = f"job-{next(self._job_ids)}"
+            self._jobs[job_id] = {'url': url, 'polls': 0}
+        return job_id
+
+    def poll_job(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job['polls'] += 1
+            polls = job['polls']
+        if polls <= self.crawl_polls:
+            return {'status': 'active', 'current': polls, 'total': self.crawl_pages}
+        base = job['url'].rstrip('/')
+        return {
+            'status': 'completed',
+            'current': self.crawl_pages,
+            'total': self.crawl_pages,
+            'data': [self.page(f"{base}/page-{i}") for i in range(self.crawl_pages)]
+        }
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v0"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    with StubFirecrawlServer(port=3002) as server:
+        print(f"🧪 Stub Firecrawl API listening on {server.base_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML-to-text extraction for local landing pages
+Reads pages in chunks and yields whitespace-normalized text segments
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional
+
+# Elements whose contents never count as page copy
+SKIP_TAGS = {'script', 'style', 'nav'}
+
+# Elements that open a new page section for incremental analysis
+SECTION_TAGS = {'section', 'header', 'footer', 'main', 'article', 'form', 'h1', 'h2', 'h3'}
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class StreamingTextExtractor(HTMLParser):
+    """Incremental HTML parser that collects visible text segments
+
+    Segments concatenate to the page text with single spaces between pieces,
+    so a consumer can scan them in order without joining them first. The
+    parser hands over text split wherever a chunk ends, so raw text is
+    buffered and only normalized at the next tag, comment or end of input.
+    """
+
+    def __init__(self, skip_tags: Iterable[str] = SKIP_TAGS):
+        super().__init__(convert_charrefs=True)
+        self.skip_tags = set(skip_tags)
+        self._skip_depth = 0
+        self._segments: List[str] = []
+        self._pending: List[str] = []
+        self._started = False
+
+    def _flush_text(self):
+        """Emit the text buffered since the last tag as one segment"""
+        if not self._pending:
+            return
+        text = _WHITESPACE.sub(' ', ''.join(self._pending)).strip()
+        self._pending.clear()
+        if text:
+            self._segments.append(' ' + text if self._started else text)
+            self._started = True
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in self.skip_tags:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in self.skip_tags and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing skip tags such as <nav/> have no contents to skip
+        self._flush_text()
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def feed_chunk(self, chunk: str) -> List[str]:
+        """Feed more markup and return the segments completed so far"""
+        self.feed(chunk)
+        segments, self._segments = self._segments, []
+        return segments
+
+    def finish(self) -> List[str]:
+        """Flush buffered text at end of input"""
+        self.close()
+        self._flush_text()
+        segments, self._segments = self._segments, []
+        return segments
+
+
+class SectionTextExtractor(StreamingTextExtractor):
+    """Text extractor that also marks section boundaries
+
+    A None entry in the segment stream means a new section starts there.
+    """
+
+    def __init__(self, skip_tags: Iterable[str] = SKIP_TAGS, section_tags: Iterable[str] = SECTION_TAGS):
+        super().__init__(skip_tags)
+        self.section_tags = set(section_tags)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in self.section_tags and not self._skip_depth:
+            self._segments.append(None)
+        super().handle_starttag(tag, attrs)
+
+
+def iter_sections(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the text of each heading or sectioning block of a local HTML file"""
+    extractor = SectionTextExtractor()
+    current: List[str] = []
+
+    def flush() -> Optional[str]:
+        text = ''.join(current).strip()
+        current.clear()
+        return text or None
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            segments = extractor.feed_chunk(chunk) if chunk else extractor.finish()
+            for segment in segments:
+                if segment is None:
+                    text = flush()
+                    if text:
+                        yield text
+                else:
+                    current.append(segment)
+            if not chunk:
+                break
+    text = flush()
+    if text:
+        yield text
+
+
+def iter_text_segments(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield visible text segments of a local HTML file, reading it in chunks"""
+    extractor = StreamingTextExtractor()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield from extractor.feed_chunk(chunk)
+    yield from extractor.finish()
+
+
+def extract_text(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Visible text of a local HTML file as one string"""
+    return ''.join(iter_text_segments(file_path, chunk_size))
+
+
+def markup_text(markup: str) -> str:
+    """Visible text of an HTML string, e.g. a rendered template fragment"""
+    extractor = StreamingTextExtractor()
+    return ''.join(extractor.feed_chunk(markup) + extractor.finish())
+
+
+class LinkExtractor(HTMLParser):
+    """Incremental parser that collects anchor hrefs"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            for name, value in attrs:
+                if name == 'href' and value:
+                    self.links.append(value.strip())
+
+
+def iter_links(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield anchor hrefs of a local HTML file in document order, reading it in chunks"""
+    extractor = LinkExtractor()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            extractor.feed(chunk)
+            yield from extractor.links
+            extractor.links.clear()
+    extractor.close()
+    yield from extractor.links
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Module-aware keyword analysis for HubSpot pages
+Renders each module's HTML with its JSON field defaults, matches key phrases
+once per module and builds page coverage from the cached module results
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from html_text import markup_text
+from keyword_schema import BASE_DIR
+
+DEFAULT_MODULE_DIR = os.path.join(BASE_DIR, 'hubspot-modules')
+
+MODULE_SUFFIX = '.module.html'
+
+# Field types whose defaults are HTML rather than plain text
+HTML_FIELD_TYPES = {'richtext'}
+
+# Coverage entry for copy that sits in the page itself rather than a module
+PAGE_SOURCE = '(page)'
+
+_MODULE_VARIABLE = re.compile(r'\{\{\s*module\.([\w.]+)\s*(?:\|[^}]*)?\}\}')
+_HUBL_EXPRESSION = re.compile(r'\{\{.*?\}\}', re.S)
+_HUBL_TAG = re.compile(r'\{%.*?%\}', re.S)
+_MODULE_TAG = re.compile(r'\{%-?\s*(?:dnd_)?module\b(.*?)-?%\}', re.S)
+_TAG_ARGUMENT = re.compile(r'(\w+)\s*=\s*("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+_TAG_NAME = re.compile(r'^\s*("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+
+
+def module_key(name: str) -> str:
+    """Normalize a module file name, path or id for lookup: 'hero-section' == 'hero_section'"""
+    name = os.path.basename(name.rstrip('/'))
+    for suffix in (MODULE_SUFFIX, '.module', '.html'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.lower().replace('-', '_')
+
+
+def file_validator(path: Optional[str]) -> str:
+    if not path or not os.path.exists(path):
+        return '-'
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_fields(json_path: Optional[str]) -> Tuple[Dict[str, object], Dict[str, str]]:
+    """Field defaults and field types from a module's .json definition"""
+    if not json_path or not os.path.exists(json_path):
+        return {}, {}
+    with open(json_path, 'r', encoding='utf-8') as f:
+        definition = json.load(f)
+    defaults = {}
+    types = {}
+    for field in definition.get('fields', []):
+        name = field.get('name') or field.get('id')
+        types[name] = field.get('type', 'text')
+        if 'default' in field:
+            defaults[name] = field['default']
+    return defaults, types
+
+
+def _lookup(values: Dict, dotted: str):
+    value = values
+    for part in dotted.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _string_leaves(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _string_leaves(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _string_leaves(item)
+
+
+def render_module(markup: str, fields: Dict[str, object], types: Dict[str, str]) -> str:
+    """Module copy as plain text: field values substituted, HubL logic dropped
+
+    Conditional branches are all kept, so copy behind a toggle still counts.
+    Group fields only reachable through loops contribute their text values.
+    """
+    used = set()
+
+    def substitute(match: re.Match) -> str:
+        dotted = match.group(1)
+        root = dotted.split('.', 1)[0]
+        value = _lookup(fields, dotted)
+        if not isinstance(value, str):
+            return ''
+        used.add(root)
+        return value if types.get(root) in HTML_FIELD_TYPES else html.escape(value)
+
+    rendered = _MODULE_VARIABLE.sub(substitute, markup)
+    rendered = _HUBL_TAG.sub(' ', _HUBL_EXPRESSION.sub(' ', rendered))
+    text = markup_text(rendered)
+
+    extra = [
+        leaf for name, value in fields.items()
+        if name not in used and isinstance(value, (dict, list))
+        for leaf in _string_leaves(value)
+    ]
+    return ' '.join([text] + [markup_text(leaf) for leaf in extra]).strip()
+
+
+def parse_module_tags(markup: str) -> List[Tuple[str, Dict[str, str]]]:
+    """(module path or name, inline field values) for each module tag on a page"""
+    references = []
+    for match in _MODULE_TAG.finditer(markup):
+        arguments = {name: value[1:-1] for name, value in _TAG_ARGUMENT.findall(match.group(1))}
+        name = _TAG_NAME.match(match.group(1))
+        path = arguments.pop('path', None) or (name.group(1)[1:-1] if name else None)
+        if path:
+            references.append((path, arguments))
+    return references
+
+
+class ModuleCoverage:
+    """Phrase and keyword matches for one module rendered with one set of field values"""
+
+    __slots__ = ('name', 'phrase_counts', 'keywords')
+
+    def __init__(self, name: str, phrase_counts: Dict[str, int], keywords: List[str]):
+        self.name = name
+        self.phrase_counts = phrase_counts
+        self.keywords = keywords
+
+    def to_dict(self) -> Dict:
+        return {'keywords': self.keywords, 'phrase_counts': self.phrase_counts}
+
+
+class ModuleLibrary:
+    """Per-module phrase index shared by every page built from the modules
+
+    Each module is rendered and matched once per (file version, field
+    values); pages only combine the cached results. Page files are cached
+    the same way, so re-analyzing an unchanged page does no parsing at all.
+    """
+
+    def __init__(self, analyzer, module_dir: str = DEFAULT_MODULE_DIR):
+        self.analyzer = analyzer
+        self.module_dir = module_dir
+        self._sources: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+        self._coverage: Dict[Tuple[str, str, str], ModuleCoverage] = {}
+        self._pages: Dict[str, Tuple[str, ModuleCoverage, List[Tuple[str, Dict[str, str]]]]] = {}
+        self._index = None
+        self.parsed = Counter()
+
+    @property
+    def sources(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        """module key -> (html path, json path or None), found once per library"""
+        if self._sources is None:
+            self._sources = {}
+            for html_path in sorted(glob.glob(os.path.join(self.module_dir, '*' + MODULE_SUFFIX))):
+                json_path = html_path[:-len('.html')] + '.json'
+                json_path = json_path if os.path.exists(json_path) else None
+                self._sources[module_key(html_path)] = (html_path, json_path)
+                if json_path:
+                    # Templates may also refer to a module by its module_id
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        module_id = json.load(f).get('module_id')
+                    if module_id:
+                        self._sources.setdefault(module_key(module_id), (html_path, json_path))
+        return self._sources
+
+    def rescan(self):
+        """Forget the module file list, e.g. after a module was added or removed"""
+        self._sources = None
+
+    def _check_index(self):
+        # Cached matches are only valid for the keyword index they came from
+        index = self.analyzer.keyword_index
+        if index is not self._index:
+            self._coverage.clear()
+            self._pages.clear()
+            self._index = index
+
+    def _match(self, name: str, text: str) -> ModuleCoverage:
+        index = self.analyzer.keyword_index
+        phrase_counts = index.matcher.count(text)
+        return ModuleCoverage(name, phrase_counts, index.keywords_for_phrases(phrase_counts))
+
+    def module_coverage(self, name: str, overrides: Optional[Dict[str, str]] = None) -> Optional[ModuleCoverage]:
+        """Cached coverage for a module, or None if no local module has that name"""
+        self._check_index()
+        source = self.sources.get(module_key(name))
+        if source is None:
+            return None
+        html_path, json_path = source
+        overrides = overrides or {}
+        key = (
+            html_path,
+            f"{file_validator(html_path)}|{file_validator(json_path)}",
+            hashlib.blake2b(json.dumps(overrides, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+        )
+        coverage = self._coverage.get(key)
+        if coverage is None:
+            defaults, types = load_fields(json_path)
+            with open(html_path, 'r', encoding='utf-8') as f:
+                markup = f.read()
+            text = render_module(markup, {**defaults, **overrides}, types)
+            coverage = self._coverage[key] = self._match(module_key(html_path), text)
+            self.parsed['modules'] += 1
+        return coverage
+
+    def _page(self, page_path: str) -> Tuple[ModuleCoverage, List[Tuple[str, Dict[str, str]]]]:
+        """The page's own copy and its module references, cached by file version"""
+        validator = file_validator(page_path)
+        cached = self._pages.get(page_path)
+        if cached is None or cached[0] != validator:
+            with open(page_path, 'r', encoding='utf-8') as f:
+                markup = f.read()
+            references = parse_module_tags(markup)
+            own_text = markup_text(_HUBL_TAG.sub(' ', _HUBL_EXPRESSION.sub(' ', markup)))
+            cached = self._pages[page_path] = (validator, self._match(PAGE_SOURCE, own_text), references)
+            self.parsed['pages'] += 1
+        return cached[1], cached[2]
+
+    def analyze_page(self, page: Optional[str] = None, modules: Iterable = ()) -> Dict:
+        """Keyword coverage of a page file and/or an explicit list of modules
+
+        modules holds module names, or (name, field overrides) pairs for
+        instances whose copy differs from the defaults.
+        """
+        self._check_index()
+        parsed_before = dict(self.parsed)
+        parts: List[ModuleCoverage] = []
+        references: List[Tuple[str, Dict[str, str]]] = []
+        if page:
+            own, cached = self._page(page)
+            parts.append(own)
+            # Copy: the cached list belongs to the page and must not grow
+            references = list(cached)
+        for item in modules:
+            references.append((item, {}) if isinstance(item, str) else tuple(item))
+
+        unresolved = []
+        for name, overrides in references:
+            coverage = self.module_coverage(name, overrides)
+            if coverage is None:
+                unresolved.append(name)
+            else:
+                parts.append(coverage)
+        return self._combine(page, parts, unresolved, parsed_before)
+
+    def _combine(self, page: Optional[str], parts: List[ModuleCoverage], unresolved: List[str],
+                 parsed_before: Dict[str, int]) -> Dict:
+        phrase_counts = Counter()
+        keyword_modules: Dict[str, List[str]] = {}
+        per_module: Dict[str, Dict] = {}
+        for part in parts:
+            phrase_counts.update(part.phrase_counts)
+            for keyword in part.keywords:
+                sources = keyword_modules.setdefault(keyword, [])
+                if part.name not in sources:
+                    sources.append(part.name)
+            if part.name not in per_module:
+                per_module[part.name] = part.to_dict()
+
+        index = self.analyzer.keyword_index
+        return {
+            "page": page,
+            "modules": [part.name for part in parts if part.name != PAGE_SOURCE],
+            "unresolved_modules": unresolved,
+            "matched_keywords": index.keywords_for_phrases(phrase_counts),
+            "phrase_counts": dict(phrase_counts),
+            "missing_phrases": [p for p in index.matcher.phrases if p not in phrase_counts],
+            "module_coverage": per_module,
+            "keyword_modules": keyword_modules,
+            "parsed": {kind: self.parsed[kind] - parsed_before.get(kind, 0) for kind in ('pages', 'modules')}
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module keyword coverage for HubSpot pages")
+    parser.add_argument('page', nargs='?', help='Page or template file with module tags')
+    parser.add_argument('--module', action='append', default=[], dest='modules',
+                        help='Module to include (repeatable); defaults to every local module')
+    parser.add_argument('--module-dir', default=DEFAULT_MODULE_DIR)
+    args = parser.parse_args()
+
+    from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+
+    library = ModuleLibrary(FirecrawlKeywordAnalyzer(), args.module_dir)
+    modules = args.modules
+    if not args.page and not modules:
+        modules = sorted({os.path.basename(html_path) for html_path, _ in library.sources.values()})
+    coverage = library.analyze_page(args.page, modules)
+
+    for name, result in coverage["module_coverage"].items():
+        print(f"🧩 {name}: {len(result['keywords'])} keywords, "
+              f"phrases: {', '.join(sorted(result['phrase_counts'])) or '-'}")
+    if coverage["unresolved_modules"]:
+        print(f"⚠️  Not found locally: {', '.join(coverage['unresolved_modules'])}")
+    print(f"🔑 Page coverage: {len(coverage['matched_keywords'])} keywords")
+    print(f"❔ Key phrases not covered: {', '.join(coverage['missing_phrases']) or '-'}")
+    json.dump(coverage, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
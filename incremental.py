@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Incremental keyword re-analysis for local landing pages
+Fingerprints page sections and only re-extracts the sections that changed
+"""
+
+import hashlib
+import os
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from html_text import iter_sections
+
+
+def section_fingerprint(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class PageState:
+    """What the last analysis of one page found"""
+
+    def __init__(self):
+        self.validator: Optional[str] = None
+        self.fingerprints: List[str] = []
+        self.keywords: Set[str] = set()
+        self.categories: Dict[str, List[str]] = {}
+
+
+class IncrementalAnalyzer:
+    """Keeps per-section phrase matches warm between runs over the same pages
+
+    Sections are identified by a hash of their text, so an edit to one
+    heading block only re-runs the phrase matcher over that block, and only
+    the recommendation categories containing added or removed keywords are
+    rebuilt.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.pages: Dict[str, PageState] = {}
+        self._section_phrases: Dict[str, FrozenSet[str]] = {}
+
+        masks = analyzer.categorizer.masks()
+        store = analyzer.store
+        self._row = {keyword: i for i, keyword in enumerate(store.keywords)}
+        self._volume = store.volume
+        self._keyword_categories: Dict[str, List[str]] = {
+            keyword: [category for category, mask in masks.items() if mask[i]]
+            for keyword, i in self._row.items()
+        }
+        self._category_names = list(masks)
+
+    def _match_section(self, text: str) -> FrozenSet[str]:
+        matcher = self.analyzer.keyword_index.matcher
+        return frozenset(matcher.phrases[index] for _, index in matcher.iter_matches(text))
+
+    def _rank(self, keywords: Set[str]) -> List[str]:
+        """Keywords ordered by volume descending, ties in store order"""
+        return sorted(keywords, key=lambda k: (-int(self._volume[self._row[k]]), self._row[k]))
+
+    def analyze(self, file_path: str) -> Dict:
+        """Re-analyze a page, reusing phrase matches for unchanged sections"""
+        state = self.pages.setdefault(file_path, PageState())
+        stat = os.stat(file_path)
+        validator = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if validator == state.validator:
+            return self._result(file_path, state, changed_sections=0, updated_categories=[])
+
+        fingerprints = []
+        changed = 0
+        for text in iter_sections(file_path):
+            fingerprint = section_fingerprint(text)
+            if fingerprint not in self._section_phrases:
+                self._section_phrases[fingerprint] = self._match_section(text)
+                changed += 1
+            fingerprints.append(fingerprint)
+
+        phrases = set()
+        for fingerprint in fingerprints:
+            phrases |= self._section_phrases[fingerprint]
+        keywords = set(self.analyzer.keyword_index.keywords_for_phrases(phrases))
+
+        # Only categories holding a keyword that appeared or disappeared change
+        delta = keywords ^ state.keywords
+        updated = sorted(
+            {c for keyword in delta for c in self._keyword_categories[keyword]},
+            key=self._category_names.index
+        )
+        if not state.categories:
+            updated = list(self._category_names)
+        for category in updated:
+            state.categories[category] = self._rank(
+                {k for k in keywords if category in self._keyword_categories[k]}
+            )
+
+        state.validator = validator
+        state.fingerprints = fingerprints
+        state.keywords = keywords
+        self._prune()
+        return self._result(file_path, state, changed_sections=changed, updated_categories=updated)
+
+    def _prune(self):
+        """Forget section matches no tracked page refers to any more"""
+        live = {f for state in self.pages.values() for f in state.fingerprints}
+        for fingerprint in list(self._section_phrases):
+            if fingerprint not in live:
+                del self._section_phrases[fingerprint]
+
+    def _result(self, file_path: str, state: PageState, changed_sections: int,
+                updated_categories: List[str]) -> Dict:
+        phrase_counts = Counter()
+        for fingerprint in state.fingerprints:
+            phrase_counts.update(self._section_phrases[fingerprint])
+        return {
+            "page": file_path,
+            "sections": len(state.fingerprints),
+            "changed_sections": changed_sections,
+            "updated_categories": updated_categories,
+            "matched_keywords": self._rank(state.keywords),
+            "matched_categories": dict(state.categories),
+            "sections_per_phrase": dict(phrase_counts)
+        }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Per-stage timers, counters and opt-in profiling for the keyword analyzer
+Exports a snapshot as JSON or Prometheus text so batch runs can be inspected
+without patching the code
+"""
+
+import functools
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+# The profilers are only imported when profiling is switched on
+if TYPE_CHECKING:
+    import cProfile
+
+# Environment switches read by Instrumentation.from_env()
+METRICS_FILE_ENV = 'KEYWORD_METRICS_FILE'
+PROFILE_ENV = 'KEYWORD_PROFILE'
+
+METRIC_PREFIX = 'keyword_analyzer'
+
+PROMETHEUS_EXTENSIONS = ('.prom', '.txt')
+
+
+class StageTimer:
+    """Call count and wall-time totals for one named stage"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'peak_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.peak_bytes = 0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict:
+        result = {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'min_seconds': self.min if self.count else 0.0,
+            'max_seconds': self.max
+        }
+        if self.peak_bytes:
+            result['peak_bytes'] = self.peak_bytes
+        return result
+
+
+class Instrumentation:
+    """Thread-safe stage timers and counters, with optional cProfile and tracemalloc
+
+    Timers and counters are always on and cost two clock reads per stage.
+    cProfile only sees the thread that called start(); tracemalloc peaks are
+    per stage and are not meaningful for stages that overlap across threads.
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.timers: Dict[str, StageTimer] = {}
+        self.counters: Dict[str, float] = {}
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profiler: Optional['cProfile.Profile'] = None
+        self._lock = threading.Lock()
+        # Per thread: highest traced memory seen so far by each open stage
+        self._peaks = threading.local()
+        self._started = time.perf_counter()
+        if profile or trace_memory:
+            self.start()
+
+    @classmethod
+    def from_env(cls) -> 'Instrumentation':
+        """Enable profiling from KEYWORD_PROFILE, e.g. 'cpu', 'memory' or 'cpu,memory'"""
+        modes = {m.strip() for m in os.getenv(PROFILE_ENV, '').lower().split(',') if m.strip()}
+        return cls(profile='cpu' in modes, trace_memory='memory' in modes)
+
+    def start(self):
+        if self.profile and self.profiler is None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of work under a stage name
+
+        Stages nest: entering one resets the tracemalloc peak, so the peak
+        reached so far by each enclosing stage is kept on a stack and folded
+        back in when the inner stage ends.
+        """
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if not hasattr(self._peaks, 'stack'):
+                self._peaks.stack = []
+            stack = self._peaks.stack
+            if stack:
+                stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+            stack.append(0)
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = 0
+            if tracing:
+                peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1] = max(stack[-1], peak)
+            with self._lock:
+                timer = self.timers.get(name)
+                if timer is None:
+                    timer = self.timers[name] = StageTimer()
+                timer.add(elapsed)
+                timer.peak_bytes = max(timer.peak_bytes, peak)
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'uptime_seconds': time.perf_counter() - self._started,
+                'stages': {name: timer.to_dict() for name, timer in self.timers.items()},
+                'counters': dict(self.counters)
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for name, stage in snapshot['stages'].items():
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{name}"}} {stage["total_seconds"]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_max_seconds gauge")
+        for name, stage in snapshot['stages'].items():
+            lines.append(f'{METRIC_PREFIX}_stage_max_seconds{{stage="{name}"}} {stage["max_seconds"]:.6f}')
+        peaks = {name: stage['peak_bytes'] for name, stage in snapshot['stages'].items() if 'peak_bytes' in stage}
+        if peaks:
+            lines.append(f"# TYPE {METRIC_PREFIX}_stage_peak_bytes gauge")
+            for name, peak in peaks.items():
+                lines.append(f'{METRIC_PREFIX}_stage_peak_bytes{{stage="{name}"}} {peak}')
+        for name, value in snapshot['counters'].items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{name}_total {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str, fmt: Optional[str] = None):
+        """Write a snapshot as 'json' or 'prometheus' (guessed from the extension)"""
+        fmt = fmt or ('prometheus' if path.endswith(PROMETHEUS_EXTENSIONS) else 'json')
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == 'prometheus':
+                f.write(self.to_prometheus())
+            elif fmt == 'json':
+                json.dump(self.snapshot(), f, indent=2)
+            else:
+                raise ValueError(f"Unknown metrics format: {fmt}")
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.splitext(path)[0] + '.prof')
+
+    def profile_summary(self, limit: int = 25) -> str:
+        """Top functions by cumulative time from the cProfile run, if enabled"""
+        if self.profiler is None:
+            return ''
+        import pstats
+        buffer = io.StringIO()
+        pstats.Stats(self.profiler, stream=buffer).sort_stats('cumulative').print_stats(limit)
+        return buffer.getvalue()
+
+
+def instrumented(stage: str) -> Callable:
+    """Method decorator timing each call under `stage` on self.metrics"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Keyword normalization, deduplication and near-duplicate clustering
+Normalizes keywords to token sets, drops exact duplicates and groups
+near-duplicates with MinHash signatures and LSH banding, so grouping never
+compares all pairs
+"""
+
+import argparse
+import csv
+import hashlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from keyword_schema import BUDGET_SHARE
+from relevance import tokenize
+
+# Spelling variants, synonyms and acronyms folded together before comparison;
+# a value with several words expands to all of them
+SYNONYMS = {
+    'treatment': 'therapy',
+    'treatments': 'therapy',
+    'tendinitis': 'tendonitis',
+    'tendinopathy': 'tendonitis',
+    'eswt': 'extracorporeal shockwave therapy',
+    'machines': 'machine',
+    'devices': 'device'
+}
+
+STOPWORDS = frozenset({'a', 'an', 'and', 'for', 'in', 'of', 'the', 'to', 'with'})
+
+# Jaccard similarity of normalized token sets needed to join a cluster
+DEFAULT_THRESHOLD = 0.7
+
+# 20 bands of 6 rows: pairs at the 0.7 threshold become candidates ~92% of
+# the time, pairs at 0.8 ~99.7%, pairs at 0.5 ~27% and pairs at 0.3 ~1.4%
+NUM_PERM = 120
+BANDS = 20
+
+# Leaders indexed per LSH bucket. Buckets keyed on very common tokens would
+# otherwise grow with the input and make each lookup linear again
+MAX_BUCKET_LEADERS = 16
+
+
+# Keywords hashed per chunk when building signatures, to bound memory
+SIGNATURE_CHUNK = 65_536
+
+
+def normalize_keyword(keyword: str) -> FrozenSet[str]:
+    """Lowercased, synonym-folded token set without stopwords"""
+    tokens = set()
+    for token in tokenize(keyword):
+        if token in STOPWORDS:
+            continue
+        tokens.update(SYNONYMS.get(token, token).split())
+    return frozenset(tokens)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class MinHasher:
+    """Vectorized MinHash over token sets
+
+    Each permutation is a multiply-shift hash: the top 32 bits of
+    a * h + b in wrapping 64-bit arithmetic, with a odd.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._token_hashes: Dict[str, int] = {}
+
+    def signatures(self, token_sets: List[FrozenSet[str]]) -> np.ndarray:
+        """(len(token_sets), num_perm) uint32 signatures; empty sets must be filtered out first"""
+        result = np.empty((len(token_sets), self.num_perm), dtype=np.uint32)
+        cache = self._token_hashes
+        for start in range(0, len(token_sets), SIGNATURE_CHUNK):
+            chunk = token_sets[start:start + SIGNATURE_CHUNK]
+            hashes = []
+            lengths = []
+            for tokens in chunk:
+                lengths.append(len(tokens))
+                for token in tokens:
+                    value = cache.get(token)
+                    if value is None:
+                        value = cache[token] = _token_hash(token)
+                    hashes.append(value)
+
+            values = np.array(hashes, dtype=np.uint64)[:, None] * self.a
+            values += self.b
+            values >>= np.uint64(32)
+            starts = np.zeros(len(chunk), dtype=np.int64)
+            np.cumsum(lengths[:-1], out=starts[1:])
+            result[start:start + len(chunk)] = np.minimum.reduceat(values, starts, axis=0).astype(np.uint32)
+        return result
+
+
+def band_keys(signatures: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """One 64-bit bucket key per keyword and band"""
+    rows = signatures.shape[1] // bands
+    banded = signatures[:, :bands * rows].reshape(len(signatures), bands, rows).astype(np.uint64)
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    for r in range(rows):
+        keys *= np.uint64(0x100000001B3)
+        keys ^= banded[:, :, r]
+    # Fold the band number in so equal slices in different bands never collide
+    keys ^= np.arange(bands, dtype=np.uint64) << np.uint64(58)
+    return keys
+
+
+class KeywordClusterer:
+    """Leader clustering over LSH candidates
+
+    Keywords are visited by volume, highest first. Each one joins the most
+    similar existing cluster leader found through the LSH buckets, if that
+    leader clears the threshold, and otherwise starts a cluster of its own.
+    Only leaders are indexed, so no keyword is compared with every other.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.minhasher = MinHasher(num_perm, seed)
+
+    def deduplicate(self, rows: Iterable[Tuple[str, int, float, str]]) -> Tuple[List[Dict], Dict[FrozenSet[str], List[str]]]:
+        """Collapse rows with identical normalized token sets, keeping the highest volume"""
+        unique: Dict[FrozenSet[str], Dict] = {}
+        duplicates: Dict[FrozenSet[str], List[str]] = {}
+        for keyword, volume, cpc, competition in rows:
+            tokens = normalize_keyword(keyword)
+            current = unique.get(tokens)
+            row = {"keyword": keyword, "volume": volume, "cpc": cpc, "competition": competition, "tokens": tokens}
+            if current is None:
+                unique[tokens] = row
+                continue
+            if volume > current["volume"]:
+                unique[tokens] = row
+                row = current
+            duplicates.setdefault(tokens, []).append(row["keyword"])
+        return list(unique.values()), duplicates
+
+    def cluster(self, rows: Iterable[Tuple[str, int, float, str]]) -> List[Dict]:
+        """Clusters of near-duplicate keywords with volume and budget rollups"""
+        unique, duplicates = self.deduplicate(rows)
+        unique.sort(key=lambda row: -row["volume"])
+
+        hashed = [row for row in unique if row["tokens"]]
+        keys = band_keys(self.minhasher.signatures([row["tokens"] for row in hashed]), self.bands).tolist()
+
+        buckets: Dict[int, List[int]] = {}
+        members: List[List[Dict]] = []
+        leader_tokens: List[FrozenSet[str]] = []
+        threshold = self.threshold
+        for row, row_keys in zip(hashed, keys):
+            tokens = row["tokens"]
+            size = len(tokens)
+            best: Optional[int] = None
+            best_score = threshold
+            candidates = set()
+            for key in row_keys:
+                bucket = buckets.get(key)
+                if bucket:
+                    candidates.update(bucket)
+            for leader in candidates:
+                other = leader_tokens[leader]
+                # Jaccard can never exceed the ratio of the two set sizes
+                if min(size, len(other)) < threshold * max(size, len(other)):
+                    continue
+                shared = len(tokens & other)
+                score = shared / (size + len(other) - shared)
+                # Ties go to the earliest, highest-volume leader
+                if score > best_score or (score == best_score and (best is None or leader < best)):
+                    best, best_score = leader, score
+            if best is None:
+                best = len(members)
+                members.append([])
+                leader_tokens.append(tokens)
+                for key in row_keys:
+                    bucket = buckets.setdefault(key, [])
+                    if len(bucket) < MAX_BUCKET_LEADERS:
+                        bucket.append(best)
+            members[best].append(row)
+
+        # Keywords with no tokens left after normalization stay on their own
+        members.extend([row] for row in unique if not row["tokens"])
+
+        clusters = [self._rollup(group, duplicates) for group in members]
+        clusters.sort(key=lambda cluster: -cluster["total_volume"])
+        return clusters
+
+    @staticmethod
+    def _rollup(group: List[Dict], duplicates: Dict[FrozenSet[str], List[str]]) -> Dict:
+        total_volume = sum(row["volume"] for row in group)
+        budget = sum(row["volume"] * row["cpc"] for row in group) * BUDGET_SHARE
+        return {
+            "label": group[0]["keyword"],
+            "keywords": [row["keyword"] for row in group],
+            "duplicates": [d for row in group for d in duplicates.get(row["tokens"], [])],
+            "total_volume": total_volume,
+            "average_cpc": budget / BUDGET_SHARE / total_volume if total_volume else 0.0,
+            "monthly_budget_estimate": budget
+        }
+
+
+def summarize_clusters(clusters: List[Dict], top: int = 10) -> Dict:
+    """Deduplicated totals plus the largest clusters, formatted for reports"""
+    return {
+        "total_clusters": len(clusters),
+        "duplicates_removed": sum(len(cluster["duplicates"]) for cluster in clusters),
+        "deduplicated_monthly_searches": sum(cluster["total_volume"] for cluster in clusters),
+        "top_clusters": [
+            {
+                "label": cluster["label"],
+                "keywords": cluster["keywords"],
+                "total_volume": cluster["total_volume"],
+                "average_cpc": f"${cluster['average_cpc']:.2f}",
+                "monthly_budget_estimate": f"${cluster['monthly_budget_estimate']:.2f}"
+            }
+            for cluster in clusters[:top]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate keywords in the keyword store")
+    parser.add_argument('--core', action='store_true', help='Only the curated core keyword set')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--output', default='curamedix_keyword_clusters.csv')
+    args = parser.parse_args()
+
+    from keyword_schema import iter_store_rows
+
+    clusters = KeywordClusterer(args.threshold).cluster(iter_store_rows(core_only=args.core))
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Cluster', 'Keywords', 'Duplicates', 'Total Volume', 'Average CPC',
+                         'Monthly Budget Estimate'])
+        for cluster in clusters:
+            writer.writerow([
+                cluster["label"],
+                '; '.join(cluster["keywords"]),
+                '; '.join(cluster["duplicates"]),
+                cluster["total_volume"],
+                f"${cluster['average_cpc']:.2f}",
+                f"${cluster['monthly_budget_estimate']:.2f}"
+            ])
+
+    summary = summarize_clusters(clusters)
+    print(f"✅ Cluster CSV created: {args.output}")
+    print(f"🧩 Clusters: {summary['total_clusters']} "
+          f"({summary['duplicates_removed']} exact duplicates removed)")
+    print(f"📈 Deduplicated monthly search volume: {summary['deduplicated_monthly_searches']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Ad-hoc keyword queries over the columnar keyword store
+Sorted indexes on volume and CPC, bitmaps for competition and category and a
+token inverted index let a slice like "low competition, CPC < $5, contains
+'tendon', top 50 by volume" touch only the rows that can match
+"""
+
+import argparse
+import operator
+import re
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from categorization import KeywordCategorizer
+from keyword_record import KeywordRecord
+from keyword_schema import COMPETITION_CODES
+
+# Columns with a sorted index; range conditions and ordering use these
+SORTED_COLUMNS = ('volume', 'cpc')
+
+RANGE_OPERATORS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq
+}
+
+# Rows visited per step when walking a sorted index for a top-N query
+WALK_CHUNK = 4096
+
+# Walk the sort index instead of filtering the most selective candidate set
+# once that set is this many times larger than the requested top N
+WALK_FACTOR = 32
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_CONDITION = re.compile(r'^\s*(\w+)\s*(<=|>=|==|<|>|=)\s*(.+?)\s*$')
+
+ROW_DTYPE = np.int32
+
+
+class SortedIndex:
+    """Row ids ordered by one column (ties in store order); a range is one slice"""
+
+    __slots__ = ('order', 'keys')
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind='stable').astype(ROW_DTYPE)
+        self.keys = np.asarray(values)[self.order]
+
+    def span(self, conditions: Iterable[Tuple[str, float]]) -> Tuple[int, int]:
+        """[lo, hi) positions in the index satisfying every (op, value) condition"""
+        lo, hi = 0, len(self.keys)
+        for op, value in conditions:
+            if op in ('>', '>=', '='):
+                lo = max(lo, int(np.searchsorted(self.keys, value, 'right' if op == '>' else 'left')))
+            if op in ('<', '<=', '='):
+                hi = min(hi, int(np.searchsorted(self.keys, value, 'left' if op == '<' else 'right')))
+        return lo, max(lo, hi)
+
+
+class Bitmap:
+    """Packed row bitmap, one bit per keyword"""
+
+    __slots__ = ('bits', 'count', 'length')
+
+    def __init__(self, bits: np.ndarray, count: int, length: int):
+        self.bits = bits
+        self.count = count
+        self.length = length
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'Bitmap':
+        return cls(np.packbits(mask), int(np.count_nonzero(mask)), len(mask))
+
+    def __or__(self, other: 'Bitmap') -> 'Bitmap':
+        # count becomes an upper bound, which is all the planner needs
+        return Bitmap(self.bits | other.bits, self.count + other.count, self.length)
+
+    def test(self, rows: np.ndarray) -> np.ndarray:
+        return ((self.bits[rows >> 3] >> (7 - (rows & 7))) & 1).astype(np.bool_)
+
+    def rows(self) -> np.ndarray:
+        return np.flatnonzero(np.unpackbits(self.bits, count=self.length)).astype(ROW_DTYPE)
+
+
+class TokenIndex:
+    """Lower-cased keyword tokens -> sorted row ids, stored as one CSR posting array"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.vocabulary: Dict[str, int] = {}
+        token_ids, rows = array('i'), array('i')
+        for row, keyword in enumerate(keywords):
+            for token in dict.fromkeys(_TOKEN.findall(keyword.lower())):
+                token_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                rows.append(row)
+        token_ids = np.frombuffer(token_ids, dtype=np.intc)
+        self.postings = np.frombuffer(rows, dtype=np.intc)[np.argsort(token_ids, kind='stable')].astype(ROW_DTYPE)
+        self.offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids, minlength=len(self.vocabulary)), out=self.offsets[1:])
+        self.tokens = list(self.vocabulary)
+        self._fragments: Dict[str, np.ndarray] = {}
+
+    def rows(self, token: str) -> np.ndarray:
+        """Rows whose keyword has this whole token"""
+        token_id = self.vocabulary.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=ROW_DTYPE)
+        return self.postings[self.offsets[token_id]:self.offsets[token_id + 1]]
+
+    def containing(self, fragment: str) -> np.ndarray:
+        """Rows with a token containing fragment; scans the vocabulary, not the rows"""
+        rows = self._fragments.get(fragment)
+        if rows is None:
+            matches = [self.rows(token) for token in self.tokens if fragment in token]
+            if len(matches) == 1:
+                rows = matches[0]
+            else:
+                rows = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=ROW_DTYPE)
+            if len(self._fragments) >= 1024:
+                self._fragments.clear()
+            self._fragments[fragment] = rows
+        return rows
+
+
+def _in_sorted(rows: np.ndarray, sorted_rows: np.ndarray) -> np.ndarray:
+    if not len(sorted_rows):
+        return np.zeros(len(rows), dtype=np.bool_)
+    positions = np.minimum(np.searchsorted(sorted_rows, rows), len(sorted_rows) - 1)
+    return sorted_rows[positions] == rows
+
+
+class _RangePredicate:
+    def __init__(self, column: str, values: np.ndarray, index: SortedIndex, span: Tuple[int, int]):
+        self.column = column
+        self.values = values
+        self.index = index
+        self.span = span
+        self.estimate = span[1] - span[0]
+
+    def rows(self) -> np.ndarray:
+        return self.index.order[self.span[0]:self.span[1]]
+
+    def test(self, rows: np.ndarray) -> np.ndarray:
+        low, high = self.index.keys[self.span[0]], self.index.keys[self.span[1] - 1]
+        values = self.values[rows]
+        return (values >= low) & (values <= high)
+
+
+class _BitmapPredicate:
+    def __init__(self, bitmap: Bitmap):
+        self.bitmap = bitmap
+        self.estimate = bitmap.count
+
+    def rows(self) -> np.ndarray:
+        return self.bitmap.rows()
+
+    def test(self, rows: np.ndarray) -> np.ndarray:
+        return self.bitmap.test(rows)
+
+
+class _PostingPredicate:
+    def __init__(self, postings: np.ndarray, keywords: Optional[Sequence[str]] = None,
+                 fragment: Optional[str] = None):
+        self.postings = postings
+        self.keywords = keywords
+        self.fragment = fragment
+        self.estimate = len(postings)
+
+    def _verify(self, rows: np.ndarray) -> np.ndarray:
+        # Fragments spanning several tokens are checked on the candidates only
+        if self.fragment is None or not len(rows):
+            return rows
+        keywords, fragment = self.keywords, self.fragment
+        return rows[np.fromiter((fragment in keywords[row].lower() for row in rows.tolist()),
+                                dtype=np.bool_, count=len(rows))]
+
+    def rows(self) -> np.ndarray:
+        return self._verify(self.postings)
+
+    def test(self, rows: np.ndarray) -> np.ndarray:
+        mask = _in_sorted(rows, self.postings)
+        if self.fragment is not None:
+            mask[mask] = np.isin(rows[mask], self._verify(rows[mask]))
+        return mask
+
+
+def _filter(rows: np.ndarray, predicates: List) -> np.ndarray:
+    for predicate in predicates:
+        if not len(rows):
+            break
+        rows = rows[predicate.test(rows)]
+    return rows
+
+
+class KeywordQueryIndex:
+    """Secondary indexes over a keyword store for ad-hoc slices
+
+    Each condition knows how many rows it can match without touching them,
+    so a query starts from its most selective condition and checks the rest
+    on those rows only. Broad top-N queries instead walk the sort column's
+    index from the top and stop once N matches are found. Indexes are built
+    on first use.
+    """
+
+    def __init__(self, categorizer: KeywordCategorizer):
+        self.categorizer = categorizer
+        self.store = categorizer.store
+        self._sorted: Dict[str, SortedIndex] = {}
+        self._competition: Optional[Dict[str, Bitmap]] = None
+        self._categories: Optional[Dict[str, Bitmap]] = None
+        self._tokens: Optional[TokenIndex] = None
+        self.last_plan = ''
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self.categorizer, name)
+
+    def sorted_index(self, column: str) -> SortedIndex:
+        if column not in SORTED_COLUMNS:
+            raise ValueError(f"No sorted index on {column!r}; use one of {', '.join(SORTED_COLUMNS)}")
+        if column not in self._sorted:
+            self._sorted[column] = SortedIndex(self.column(column))
+        return self._sorted[column]
+
+    @property
+    def competition_bitmaps(self) -> Dict[str, Bitmap]:
+        if self._competition is None:
+            competition = self.categorizer.competition
+            self._competition = {
+                level: Bitmap.from_mask(competition == code) for level, code in COMPETITION_CODES.items()
+            }
+        return self._competition
+
+    @property
+    def category_bitmaps(self) -> Dict[str, Bitmap]:
+        if self._categories is None:
+            self._categories = {
+                category: Bitmap.from_mask(mask) for category, mask in self.categorizer.masks().items()
+            }
+        return self._categories
+
+    @property
+    def tokens(self) -> TokenIndex:
+        if self._tokens is None:
+            self._tokens = TokenIndex(self.store.keywords)
+        return self._tokens
+
+    # -- Planning ---------------------------------------------------------
+
+    def _bitmap(self, bitmaps: Dict[str, Bitmap], values, kind: str) -> Bitmap:
+        """Union of the named bitmaps: several values mean any of them"""
+        names = [values] if isinstance(values, str) else list(values)
+        combined = None
+        for name in names:
+            key = name.lower() if kind == 'competition' else name
+            if key not in bitmaps and kind == 'category':
+                key = f"{name}_keywords"
+            if key not in bitmaps:
+                raise ValueError(f"Unknown {kind} {name!r}; expected one of {', '.join(bitmaps)}")
+            combined = bitmaps[key] if combined is None else combined | bitmaps[key]
+        return combined
+
+    def _predicates(self, where: Iterable[Tuple[str, str, float]], competition, category,
+                    contains: Optional[str], words: Iterable[str]) -> List:
+        predicates = []
+        conditions: Dict[str, List[Tuple[str, float]]] = {}
+        for column, op, value in where:
+            if op == '==':
+                op = '='
+            if op not in RANGE_OPERATORS:
+                raise ValueError(f"Unsupported operator {op!r}")
+            conditions.setdefault(column, []).append((op, float(value)))
+        for column, column_conditions in conditions.items():
+            index = self.sorted_index(column)
+            predicates.append(_RangePredicate(column, self.column(column), index, index.span(column_conditions)))
+
+        if competition:
+            predicates.append(_BitmapPredicate(self._bitmap(self.competition_bitmaps, competition, 'competition')))
+        if category:
+            predicates.append(_BitmapPredicate(self._bitmap(self.category_bitmaps, category, 'category')))
+
+        for word in words:
+            predicates.append(_PostingPredicate(self.tokens.rows(word.lower())))
+        if contains:
+            fragment = contains.lower()
+            parts = _TOKEN.findall(fragment)
+            if not parts:
+                raise ValueError(f"contains={contains!r} has no letters or digits to look up")
+            for part in parts:
+                predicates.append(_PostingPredicate(self.tokens.containing(part)))
+            if parts != [fragment]:
+                predicates[-1] = _PostingPredicate(predicates[-1].postings, self.store.keywords, fragment)
+        return predicates
+
+    def select(self, where: Iterable[Tuple[str, str, float]] = (), competition=None, category=None,
+               contains: Optional[str] = None, words: Iterable[str] = (), order_by: Optional[str] = 'volume',
+               descending: bool = True, limit: Optional[int] = None) -> np.ndarray:
+        """Row indices matching every condition, ordered by order_by (ties in store order)
+
+        where holds (column, op, value) range conditions on volume or CPC,
+        e.g. ('cpc', '<', 5). competition and category take one name or
+        several (any of them); contains is a case-insensitive substring and
+        words are whole tokens that must all appear.
+        """
+        predicates = self._predicates(where, competition, category, contains, words)
+        if any(predicate.estimate == 0 for predicate in predicates) or limit == 0:
+            self.last_plan = 'empty'
+            return np.empty(0, dtype=ROW_DTYPE)
+
+        driver = min(predicates, key=lambda predicate: predicate.estimate, default=None)
+        if (order_by is not None and limit is not None
+                and (driver is None or driver.estimate > WALK_FACTOR * limit)):
+            return self._walk(order_by, predicates, descending, limit)
+
+        if driver is None:
+            self.last_plan = 'scan'
+            rows = np.arange(len(self.store), dtype=ROW_DTYPE)
+        else:
+            self.last_plan = f"{type(driver).__name__[1:-len('Predicate')].lower()} ({driver.estimate} rows)"
+            rows = driver.rows()
+        rows = _filter(rows, [predicate for predicate in predicates if predicate is not driver])
+        return self._order(rows, order_by, descending, limit)
+
+    def _order(self, rows: np.ndarray, order_by: Optional[str], descending: bool,
+               limit: Optional[int]) -> np.ndarray:
+        if order_by is None:
+            return np.sort(rows)[:limit]
+        values = self.column(order_by)[rows]
+        key = -values if descending else values
+        if limit is not None and len(rows) > limit:
+            # Keep everything tied with the N-th value so store order decides
+            kth = np.partition(key, limit - 1)[limit - 1]
+            keep = key <= kth
+            rows, key = rows[keep], key[keep]
+        return rows[np.lexsort((rows, key))][:limit]
+
+    def _walk(self, order_by: str, predicates: List, descending: bool, limit: int) -> np.ndarray:
+        """Filter the sort index chunk by chunk from the best end until limit rows match"""
+        index = self.sorted_index(order_by)
+        lo, hi = 0, len(index.order)
+        rest = []
+        for predicate in predicates:
+            if isinstance(predicate, _RangePredicate) and predicate.column == order_by:
+                lo, hi = max(lo, predicate.span[0]), min(hi, predicate.span[1])
+            else:
+                rest.append(predicate)
+
+        found, total = [], 0
+        chunk = max(WALK_CHUNK, 4 * limit)
+        start, end = (hi, hi) if descending else (lo, lo)
+        while total < limit and (start > lo if descending else end < hi):
+            if descending:
+                start = max(lo, start - chunk)
+                rows = _filter(index.order[start:end], rest)
+                end = start
+            else:
+                end = min(hi, end + chunk)
+                rows = _filter(index.order[start:end], rest)
+                start = end
+            found.append(rows)
+            total += len(rows)
+        self.last_plan = f"walk {order_by} ({(hi - end) if descending else (start - lo)} rows)"
+
+        rows = self._order(np.concatenate(found), order_by, descending, limit)
+        if len(rows) == limit:
+            # Rows tied with the last one may sit just past where the walk stopped
+            boundary = self.column(order_by)[rows[-1]]
+            if descending:
+                tied = index.order[max(lo, int(np.searchsorted(index.keys, boundary, 'left'))):end]
+            else:
+                tied = index.order[start:min(hi, int(np.searchsorted(index.keys, boundary, 'right')))]
+            if len(tied):
+                rows = self._order(np.concatenate([rows, _filter(tied, rest)]), order_by, descending, limit)
+        return rows
+
+    def query(self, **conditions) -> List[KeywordRecord]:
+        """Keyword records for select(**conditions)"""
+        return self.categorizer.records(self.select(**conditions), {})
+
+
+def parse_query(terms: Iterable[str]) -> Dict:
+    """select() keyword arguments from terms like 'competition=low', 'cpc<5',
+    'contains=tendon', 'word=shockwave', 'category=section_179', 'top=50'
+    and 'order=cpc' (or 'order=cpc:asc', 'order=none')"""
+    query: Dict = {'where': [], 'words': []}
+    for term in terms:
+        match = _CONDITION.match(term)
+        if not match:
+            raise ValueError(f"Cannot parse query term {term!r}")
+        field, op, value = match.groups()
+        field = field.lower()
+        if field in SORTED_COLUMNS:
+            query['where'].append((field, op, float(value.lstrip('$').replace(',', ''))))
+            continue
+        if op not in ('=', '=='):
+            raise ValueError(f"{field} only supports '='")
+        if field in ('competition', 'category'):
+            query[field] = value.split(',')
+        elif field == 'contains':
+            query['contains'] = value
+        elif field == 'word':
+            query['words'].append(value)
+        elif field in ('top', 'limit'):
+            query['limit'] = int(value)
+        elif field == 'order':
+            column, _, direction = value.lower().partition(':')
+            query['order_by'] = None if column == 'none' else column
+            query['descending'] = direction != 'asc'
+        else:
+            raise ValueError(f"Unknown query field {field!r}")
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slice the keyword database with ad-hoc filters")
+    parser.add_argument('terms', nargs='+',
+                        help="e.g. competition=low 'cpc<5' contains=tendon top=50")
+    parser.add_argument('--all', action='store_true', help='Query every stored keyword, not just the core set')
+    args = parser.parse_args()
+
+    from keyword_store import load_store
+
+    store = load_store()
+    index = KeywordQueryIndex(KeywordCategorizer(store if args.all else store.core_keywords()))
+    try:
+        records = index.query(**parse_query(args.terms))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    for record in records:
+        print(f"{record.keyword:<50} {record.volume:>8,} {record['cpc']:>8} {record.competition:<7} "
+              f"{record['monthly_budget_estimate']:>12}")
+    print(f"🔎 {len(records)} keywords ({index.last_plan})")
+
+
+if __name__ == "__main__":
+    main()
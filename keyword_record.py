@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compact keyword records shared across recommendation categories
+A keyword lands in several categories as one slotted object holding raw
+numbers; CPC and budget strings are only formatted when a report is written
+"""
+
+from typing import Dict, Iterator, Tuple
+
+from keyword_schema import BUDGET_SHARE
+
+# Report fields, in the order the legacy row dicts used
+RECORD_FIELDS = ('keyword', 'volume', 'cpc', 'competition', 'monthly_budget_estimate')
+
+
+class KeywordRecord:
+    """One keyword's metrics, referenced by every category it belongs to
+
+    Item access returns the report-formatted fields, so records can be used
+    wherever the old per-category row dicts were read.
+    """
+
+    __slots__ = ('keyword', 'volume', 'cpc', 'competition')
+
+    def __init__(self, keyword: str, volume: int, cpc: float, competition: str):
+        self.keyword = keyword
+        self.volume = volume
+        self.cpc = cpc
+        self.competition = competition
+
+    @property
+    def budget(self) -> float:
+        """Estimated monthly budget"""
+        return self.volume * self.cpc * BUDGET_SHARE
+
+    def __getitem__(self, field: str):
+        if field == 'cpc':
+            return f"${self.cpc:.2f}"
+        if field == 'monthly_budget_estimate':
+            return f"${self.budget:.2f}"
+        if field in ('keyword', 'volume', 'competition'):
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self) -> Tuple[str, ...]:
+        return RECORD_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_FIELDS)
+
+    def to_dict(self) -> Dict:
+        """The formatted report row"""
+        return {field: self[field] for field in RECORD_FIELDS}
+
+    def row(self) -> Tuple[str, int, float, str]:
+        """(keyword, volume, cpc, competition) with the raw numbers"""
+        return self.keyword, self.volume, self.cpc, self.competition
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, KeywordRecord):
+            return NotImplemented
+        return self.row() == other.row()
+
+    def __hash__(self) -> int:
+        return hash(self.row())
+
+    def __repr__(self) -> str:
+        return f"KeywordRecord({self.keyword!r}, volume={self.volume}, cpc={self.cpc}, competition={self.competition!r})"
+
+    # Pickled as a plain tuple so process pools ship four values per record
+    def __reduce__(self):
+        return KeywordRecord, self.row()
+
+
+def plain_records(analysis: Dict) -> Dict:
+    """Copy of an analysis with every record list turned into formatted row dicts
+
+    A record shared by several categories becomes one shared dict, so the
+    result stays plain-JSON serializable without json_default.
+    """
+    rows: Dict[int, Dict] = {}
+
+    def plain(record: KeywordRecord) -> Dict:
+        row = rows.get(id(record))
+        if row is None:
+            row = rows[id(record)] = record.to_dict()
+        return row
+
+    return {
+        key: [plain(item) if isinstance(item, KeywordRecord) else item for item in value]
+        if isinstance(value, list) else value
+        for key, value in analysis.items()
+    }
+
+
+def json_default(value):
+    """json.dump default= hook that writes records as their formatted rows"""
+    if isinstance(value, KeywordRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Keyword store layout and a NumPy-free row reader
+Short-lived scripts read the compiled store's .npy columns with the standard
+library alone, so they skip the NumPy import on every run
+"""
+
+import array
+import ast
+import json
+import os
+import sys
+from typing import Dict, Iterator, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SEED_PATH = os.path.join(BASE_DIR, 'keyword_data', 'keywords.csv')
+DEFAULT_STORE_DIR = os.path.join(BASE_DIR, 'keyword_data', 'store')
+
+# Competition levels are interned as uint8 codes indexing this tuple
+COMPETITION_LEVELS = ('low', 'medium', 'high')
+COMPETITION_CODES = {level: code for code, level in enumerate(COMPETITION_LEVELS)}
+
+STORE_VERSION = 1
+
+# Share of total search volume assumed to be bought each month
+BUDGET_SHARE = 0.10
+
+_NPY_MAGIC = b'\x93NUMPY'
+
+# .npy dtype descriptors used by the store -> array module typecodes
+_NPY_TYPECODES = {'i8': 'q', 'f8': 'd', 'u1': 'B', 'b1': 'B'}
+
+
+def store_is_current(seed_path: str = DEFAULT_SEED_PATH, store_dir: str = DEFAULT_STORE_DIR) -> bool:
+    """True when the compiled store exists and is not older than the seed CSV"""
+    meta_path = os.path.join(store_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    return not (os.path.exists(seed_path) and os.path.getmtime(seed_path) > os.path.getmtime(meta_path))
+
+
+def read_npy(path: str) -> array.array:
+    """Read a 1-D .npy column into an array.array"""
+    with open(path, 'rb') as f:
+        if f.read(6) != _NPY_MAGIC:
+            raise ValueError(f"Not a .npy file: {path}")
+        major = f.read(2)[0]
+        header_length = int.from_bytes(f.read(2 if major == 1 else 4), 'little')
+        header: Dict = ast.literal_eval(f.read(header_length).decode('latin1'))
+        if header['fortran_order'] or len(header['shape']) != 1:
+            raise ValueError(f"Unsupported .npy layout: {path}")
+
+        descr = header['descr']
+        values = array.array(_NPY_TYPECODES[descr[1:]])
+        values.frombytes(f.read())
+    if descr[0] == ('>' if sys.byteorder == 'little' else '<'):
+        values.byteswap()
+    return values
+
+
+def iter_store_rows(core_only: bool = False, seed_path: str = DEFAULT_SEED_PATH,
+                    store_dir: str = DEFAULT_STORE_DIR) -> Iterator[Tuple[str, int, float, str]]:
+    """Yield (keyword, volume, cpc, competition) rows in store order
+
+    Reads the compiled columns directly; a missing or stale store is
+    rebuilt through keyword_store, which does need NumPy.
+    """
+    if not store_is_current(seed_path, store_dir):
+        from keyword_store import build_store
+        build_store(seed_path, store_dir)
+
+    with open(os.path.join(store_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != STORE_VERSION:
+        raise ValueError(f"Unsupported keyword store version: {meta.get('version')}")
+
+    volume, cpc, competition, core, offsets, keyword_bytes = (
+        read_npy(os.path.join(store_dir, f'{name}.npy'))
+        for name in ('volume', 'cpc', 'competition', 'core', 'offsets', 'keyword_bytes')
+    )
+    blob = keyword_bytes.tobytes()
+    for i in range(meta['rows']):
+        if core_only and not core[i]:
+            continue
+        keyword = blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+        yield keyword, volume[i], cpc[i], COMPETITION_LEVELS[competition[i]]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Columnar keyword store for the CuraMedix keyword database
+Keeps volume, CPC and competition as typed NumPy columns, memory-mapped from disk
+"""
+
+import csv
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from keyword_schema import (
+    COMPETITION_CODES,
+    COMPETITION_LEVELS,
+    DEFAULT_SEED_PATH,
+    DEFAULT_STORE_DIR,
+    STORE_VERSION,
+    store_is_current
+)
+
+# Column name -> dtype; keywords live in one UTF-8 blob addressed by offsets
+COLUMNS = {
+    'volume': np.int64,
+    'cpc': np.float64,
+    'competition': np.uint8,
+    'core': np.bool_,
+    'offsets': np.int64,
+    'keyword_bytes': np.uint8
+}
+
+
+class KeywordStore:
+    """Struct-of-arrays keyword database with lazily loaded columns"""
+
+    def __init__(self, store_dir: Optional[str] = None, columns: Optional[Dict[str, np.ndarray]] = None,
+                 mmap: bool = True):
+        self.store_dir = store_dir
+        self.mmap = mmap
+        self._columns: Dict[str, np.ndarray] = dict(columns or {})
+        self._keywords: Optional[List[str]] = None
+
+        if columns is None:
+            with open(os.path.join(store_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != STORE_VERSION:
+                raise ValueError(f"Unsupported keyword store version: {meta.get('version')}")
+            self._length = meta['rows']
+        else:
+            self._length = len(self._columns['volume'])
+
+    # -- Construction -----------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: List[Tuple[str, int, float, str, bool]]) -> 'KeywordStore':
+        """Build an in-memory store from (keyword, volume, cpc, competition, core) tuples"""
+        encoded = [keyword.encode('utf-8') for keyword, *_ in records]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        columns = {
+            'volume': np.array([r[1] for r in records], dtype=np.int64),
+            'cpc': np.array([r[2] for r in records], dtype=np.float64),
+            'competition': np.array([COMPETITION_CODES[r[3].lower()] for r in records], dtype=np.uint8),
+            'core': np.array([bool(r[4]) for r in records], dtype=np.bool_),
+            'offsets': offsets,
+            'keyword_bytes': np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        }
+        return cls(columns=columns)
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> 'KeywordStore':
+        """Parse a seed CSV with keyword, volume, cpc, competition and core columns"""
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            records = [
+                (
+                    row['keyword'],
+                    int(row['volume']),
+                    float(row['cpc'].replace('$', '')),
+                    row['competition'],
+                    row.get('core', '1') == '1'
+                )
+                for row in csv.DictReader(f)
+            ]
+        return cls.from_records(records)
+
+    def save(self, store_dir: str):
+        """Write each column as a .npy file so it can be memory-mapped later"""
+        os.makedirs(store_dir, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(store_dir, f'{name}.npy'), self.column(name))
+        with open(os.path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'rows': len(self)}, f)
+
+    @classmethod
+    def open(cls, store_dir: str = DEFAULT_STORE_DIR, mmap: bool = True) -> 'KeywordStore':
+        return cls(store_dir=store_dir, mmap=mmap)
+
+    # -- Column access ----------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a column, memory-mapping it from disk on first access"""
+        array = self._columns.get(name)
+        if array is None:
+            path = os.path.join(self.store_dir, f'{name}.npy')
+            array = np.load(path, mmap_mode='r' if self.mmap else None)
+            self._columns[name] = array
+        return array
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column('volume')
+
+    @property
+    def cpc(self) -> np.ndarray:
+        return self.column('cpc')
+
+    @property
+    def competition(self) -> np.ndarray:
+        return self.column('competition')
+
+    @property
+    def core(self) -> np.ndarray:
+        return self.column('core')
+
+    def __len__(self) -> int:
+        return self._length
+
+    def keyword(self, index: int) -> str:
+        offsets = self.column('offsets')
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        return bytes(self.column('keyword_bytes')[start:end]).decode('utf-8')
+
+    @property
+    def keywords(self) -> List[str]:
+        """All keywords decoded once and cached"""
+        if self._keywords is None:
+            blob = self.column('keyword_bytes').tobytes()
+            offsets = self.column('offsets').tolist()
+            self._keywords = [
+                blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(self))
+            ]
+        return self._keywords
+
+    def competition_label(self, index: int) -> str:
+        return COMPETITION_LEVELS[self.competition[index]]
+
+    # -- Views ------------------------------------------------------------
+
+    def select(self, mask: np.ndarray) -> 'KeywordStore':
+        """In-memory store holding only the rows where mask is true"""
+        return self.take(np.flatnonzero(mask))
+
+    def take(self, indices: np.ndarray) -> 'KeywordStore':
+        """In-memory store holding the given rows, in the given order"""
+        indices = np.asarray(indices, dtype=np.int64)
+        offsets = self.column('offsets')
+        starts, ends = offsets[indices], offsets[indices + 1]
+        lengths = ends - starts
+        new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_offsets[1:])
+
+        # Gather every selected keyword's bytes in one fancy-indexing pass
+        byte_index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+        keyword_bytes = np.asarray(self.column('keyword_bytes')[byte_index])
+        columns = {
+            'volume': np.asarray(self.volume[indices]),
+            'cpc': np.asarray(self.cpc[indices]),
+            'competition': np.asarray(self.competition[indices]),
+            'core': np.asarray(self.core[indices]),
+            'offsets': new_offsets,
+            'keyword_bytes': keyword_bytes
+        }
+        return KeywordStore(columns=columns)
+
+    def sorted_by_volume(self) -> 'KeywordStore':
+        """Rows by volume descending, ties in store order"""
+        return self.take(np.argsort(-self.volume, kind='stable'))
+
+    def core_keywords(self) -> 'KeywordStore':
+        """The curated keyword set the analyzer scores by default"""
+        return self.select(self.core)
+
+    def iter_rows(self) -> Iterator[Tuple[str, int, float, str]]:
+        """Yield (keyword, volume, cpc, competition) tuples in store order"""
+        volume, cpc, competition = self.volume.tolist(), self.cpc.tolist(), self.competition.tolist()
+        for i, keyword in enumerate(self.keywords):
+            yield keyword, volume[i], cpc[i], COMPETITION_LEVELS[competition[i]]
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Legacy keyword -> {volume, cpc, competition} mapping"""
+        return {
+            keyword: {"volume": volume, "cpc": cpc, "competition": competition}
+            for keyword, volume, cpc, competition in self.iter_rows()
+        }
+
+
+def build_store(seed_path: str = DEFAULT_SEED_PATH, store_dir: str = DEFAULT_STORE_DIR) -> KeywordStore:
+    """Compile the seed CSV into a memory-mappable columnar store"""
+    KeywordStore.from_csv(seed_path).save(store_dir)
+    return KeywordStore.open(store_dir)
+
+
+def load_store(seed_path: str = DEFAULT_SEED_PATH, store_dir: str = DEFAULT_STORE_DIR) -> KeywordStore:
+    """Open the compiled store, rebuilding it when the seed CSV is newer"""
+    if not store_is_current(seed_path, store_dir):
+        return build_store(seed_path, store_dir)
+    return KeywordStore.open(store_dir)
+
+
+if __name__ == "__main__":
+    seed = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SEED_PATH
+    store = build_store(seed)
+    print(f"✅ Keyword store built: {DEFAULT_STORE_DIR}")
+    print(f"📊 Total keywords: {len(store)} ({int(store.core.sum())} core)")
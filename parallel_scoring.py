@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Parallel relevance scoring of large keyword databases across processes
+Publishes the keyword columns once in shared memory; each worker attaches
+without copying, scores a disjoint keyword shard against every page and
+returns only its per-page top keywords and totals for the final merge
+"""
+
+import argparse
+import glob
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bulk_analyze import available_cpus
+from keyword_schema import COMPETITION_LEVELS
+from keyword_store import KeywordStore
+from relevance import MAX_NGRAM, PHRASE_WEIGHT, ngram_counts, tokenize
+
+# Columns the workers need; keyword text stays one UTF-8 blob plus offsets
+SHARED_COLUMNS = ('volume', 'cpc', 'competition', 'offsets', 'keyword_bytes')
+
+# Column start alignment inside the shared block
+ALIGNMENT = 64
+
+# Shards per worker, so a slow shard does not leave the other workers idle
+SHARDS_PER_WORKER = 4
+MIN_SHARD_ROWS = 10_000
+
+
+class SharedKeywordColumns:
+    """Keyword columns copied once into one shared memory block
+
+    Only the block name and column layout are pickled, so handing this to
+    a worker costs a few hundred bytes however large the store is.
+    """
+
+    def __init__(self, name: str, layout: Dict[str, Tuple[str, int, int]], rows: int):
+        self.name = name
+        self.layout = layout
+        self.rows = rows
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner = False
+
+    @classmethod
+    def publish(cls, store: KeywordStore) -> 'SharedKeywordColumns':
+        layout, size = {}, 0
+        for name in SHARED_COLUMNS:
+            column = store.column(name)
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout[name] = (column.dtype.str, size, len(column))
+            size += column.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm.name, layout, len(store))
+        shared._shm, shared._owner = shm, True
+        for name, array in shared.arrays().items():
+            array[:] = store.column(name)
+        return shared
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Views onto the shared block, attaching to it on first use"""
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+        return {
+            name: np.ndarray((length,), dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            for name, (dtype, offset, length) in self.layout.items()
+        }
+
+    def __getstate__(self):
+        return {'name': self.name, 'layout': self.layout, 'rows': self.rows}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'], state['layout'], state['rows'])
+
+    def close(self):
+        """Detach; the publishing process also frees the block"""
+        if self._shm is not None:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> 'SharedKeywordColumns':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def page_weights(pages: Dict[str, str], max_n: int = MAX_NGRAM) -> Dict[str, Dict[str, float]]:
+    """Per page, TF-IDF weight of every n-gram on it, with IDF over these pages
+
+    Same weighting as TfidfScorer, without first restricting the counts to
+    the keyword vocabulary (which would mean reading every keyword here).
+    """
+    counts = {doc_id: ngram_counts(tokenize(content), max_n) for doc_id, content in pages.items()}
+    document_frequency = Counter()
+    for page_counts in counts.values():
+        document_frequency.update(page_counts.keys())
+    total = len(counts)
+    return {
+        doc_id: {
+            term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+            for term, count in page_counts.items()
+        }
+        for doc_id, page_counts in counts.items()
+    }
+
+
+class ShardTerms:
+    """One keyword shard as term ids: every distinct token, plus the whole phrase"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], start: int, stop: int):
+        offsets = columns['offsets'][start:stop + 1]
+        blob = columns['keyword_bytes'][offsets[0]:offsets[-1]].tobytes()
+        offsets = (offsets - offsets[0]).tolist()
+
+        self.vocabulary: Dict[str, int] = {}
+        owners, term_ids, phrase_ids, sizes = [], [], [], []
+        for row in range(stop - start):
+            tokens = tokenize(blob[offsets[row]:offsets[row + 1]].decode('utf-8'))
+            unique = list(dict.fromkeys(tokens))
+            for token in unique:
+                term_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+            owners.extend([row] * len(unique))
+            sizes.append(len(unique))
+            phrase_ids.append(self.vocabulary.setdefault(' '.join(tokens), len(self.vocabulary))
+                              if len(tokens) > 1 else -1)
+        self.rows = stop - start
+        self.owners = np.array(owners, dtype=np.int64)
+        self.term_ids = np.array(term_ids, dtype=np.int64)
+        self.sizes = np.maximum(np.array(sizes, dtype=np.float64), 1)
+        # -1 (single-token keyword) indexes the always-zero weight slot
+        self.phrase_ids = np.array(phrase_ids, dtype=np.int64)
+
+    def relevance(self, weights: Dict[str, float]) -> np.ndarray:
+        """TfidfScorer.relevance for every keyword in the shard"""
+        vector = np.zeros(len(self.vocabulary) + 1)
+        vocabulary = self.vocabulary
+        for term, weight in weights.items():
+            term_id = vocabulary.get(term)
+            if term_id is not None:
+                vector[term_id] = weight
+        token_sums = np.bincount(self.owners, weights=vector[self.term_ids], minlength=self.rows)
+        return token_sums / self.sizes + PHRASE_WEIGHT * vector[self.phrase_ids]
+
+
+def score_shard(columns: Dict[str, np.ndarray], weights: Dict[str, Dict[str, float]],
+                start: int, stop: int, top: int) -> Dict[str, Tuple]:
+    """Per page: (rows, scores, relevance) of the shard's top keywords,
+    matched keyword count, matched volume and matches per competition level"""
+    terms = ShardTerms(columns, start, stop)
+    volume = columns['volume'][start:stop]
+    value = np.log1p(volume) / (1 + columns['cpc'][start:stop])
+    competition = columns['competition'][start:stop]
+
+    aggregates = {}
+    for doc_id, page in weights.items():
+        relevance = terms.relevance(page)
+        matched = np.flatnonzero(relevance > 0)
+        scores = relevance[matched] * value[matched]
+        if len(matched) > top:
+            # Everything tied with the top-th score goes back, so the merge
+            # can break ties by store order
+            kth = np.partition(-scores, top - 1)[top - 1]
+            keep = np.flatnonzero(-scores <= kth)
+        else:
+            keep = np.arange(len(matched))
+        aggregates[doc_id] = (
+            matched[keep] + start, scores[keep], relevance[matched[keep]],
+            len(matched), int(volume[matched].sum()),
+            np.bincount(competition[matched], minlength=len(COMPETITION_LEVELS))
+        )
+    return aggregates
+
+
+# Per worker process: the attached shared columns and this call's page weights
+_worker = None
+
+
+def _init_worker(shared: SharedKeywordColumns, weights: Dict[str, Dict[str, float]]):
+    global _worker
+    _worker = (shared, shared.arrays(), weights)
+
+
+def _score_shard_task(start: int, stop: int, top: int) -> Dict[str, Tuple]:
+    _, columns, weights = _worker
+    return score_shard(columns, weights, start, stop, top)
+
+
+def shard_bounds(rows: int, shards: int) -> List[Tuple[int, int]]:
+    edges = np.linspace(0, rows, max(1, shards) + 1).astype(int).tolist()
+    return [(a, b) for a, b in zip(edges, edges[1:]) if b > a]
+
+
+class ParallelScorer:
+    """Ranks a keyword store against a batch of pages on several processes
+
+    Results match TfidfScorer.rank over the same pages: relevance times
+    log(volume) / (1 + cpc), ties in store order.
+    """
+
+    def __init__(self, store: KeywordStore, workers: Optional[int] = None):
+        self.store = store
+        self.workers = workers or available_cpus()
+
+    def shards(self) -> List[Tuple[int, int]]:
+        rows = len(self.store)
+        count = min(self.workers * SHARDS_PER_WORKER, max(1, rows // MIN_SHARD_ROWS))
+        return shard_bounds(rows, count if self.workers > 1 else 1)
+
+    def score(self, pages: Dict[str, str], top: int = 10) -> Dict[str, Dict]:
+        """Top keywords and match totals per page, keyed like pages"""
+        shards = self.shards()
+        if not shards:
+            return {doc_id: self.no_matches() for doc_id in pages}
+        weights = page_weights(pages)
+        if self.workers == 1:
+            columns = {name: np.asarray(self.store.column(name)) for name in SHARED_COLUMNS}
+            results = [score_shard(columns, weights, start, stop, top) for start, stop in shards]
+        else:
+            with SharedKeywordColumns.publish(self.store) as shared, \
+                    ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(shared, weights)) as pool:
+                starts, stops = zip(*shards)
+                results = list(pool.map(_score_shard_task, starts, stops, [top] * len(shards)))
+        return {doc_id: self._merge(doc_id, results, top) for doc_id in pages}
+
+    @staticmethod
+    def no_matches() -> Dict:
+        """The result for a page scored against an empty store"""
+        return {
+            "matched_keywords": 0,
+            "matched_volume": 0,
+            "matched_by_competition": dict.fromkeys(COMPETITION_LEVELS, 0),
+            "relevance_ranked_keywords": []
+        }
+
+    def _merge(self, doc_id: str, results: List[Dict[str, Tuple]], top: int) -> Dict:
+        parts = [result[doc_id] for result in results]
+        rows = np.concatenate([part[0] for part in parts]).astype(np.int64)
+        scores = np.concatenate([part[1] for part in parts])
+        relevance = np.concatenate([part[2] for part in parts])
+        order = np.lexsort((rows, -scores))[:top]
+        by_competition = np.sum([part[5] for part in parts], axis=0)
+
+        store = self.store
+        return {
+            "matched_keywords": sum(part[3] for part in parts),
+            "matched_volume": sum(part[4] for part in parts),
+            "matched_by_competition": dict(zip(COMPETITION_LEVELS, by_competition.tolist())),
+            "relevance_ranked_keywords": [
+                {
+                    "keyword": store.keyword(row),
+                    "volume": int(store.volume[row]),
+                    "cpc": f"${store.cpc[row]:.2f}",
+                    "competition": store.competition_label(row),
+                    "relevance": round(float(relevance[i]), 4),
+                    "score": round(float(scores[i]), 4)
+                }
+                for i, row in zip(order.tolist(), rows[order].tolist())
+            ]
+        }
+
+
+def read_pages(paths: Iterable[str]) -> Dict[str, str]:
+    """Visible text of local HTML pages, keyed by path"""
+    from html_text import extract_text
+    return {path: extract_text(path) for path in paths}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the keyword database against many pages in parallel")
+    parser.add_argument('pages', nargs='*', default=['*.html'], help='HTML pages or glob patterns')
+    parser.add_argument('--workers', type=int, default=available_cpus())
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--core', action='store_true', help='Score only the curated core keyword set')
+    args = parser.parse_args()
+
+    from keyword_store import load_store
+
+    paths = sorted({p for pattern in args.pages for p in glob.glob(pattern) if os.path.isfile(p)})
+    if not paths:
+        parser.error("no pages matched")
+    store = load_store()
+    if args.core:
+        store = store.core_keywords()
+
+    results = ParallelScorer(store, args.workers).score(read_pages(paths), top=args.top)
+    for path, result in results.items():
+        print(f"📄 {path}: {result['matched_keywords']:,} keywords matched, "
+              f"{result['matched_volume']:,} monthly searches")
+        for row in result["relevance_ranked_keywords"]:
+            print(f"  - {row['keyword']} (score {row['score']}, {row['volume']:,} searches, {row['cpc']})")
+    print(f"✅ Scored {len(store):,} keywords against {len(paths)} pages with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick phrase matcher for keyword extraction
+Finds every key phrase in a single pass over the content, case-insensitively
+"""
+
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class PhraseMatcher:
+    """Compiled multi-pattern automaton over a fixed set of phrases"""
+
+    def __init__(self, phrases: Iterable[str]):
+        # Phrases are matched lowercased; duplicates collapse to one pattern
+        self.phrases: List[str] = list(dict.fromkeys(p.lower() for p in phrases if p))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # Breadth-first pass wires failure links and merges outputs so each
+        # state reports every phrase ending at that position
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str, offset: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yield (start, phrase_index) for every occurrence, overlaps included"""
+        return self.iter_stream_matches([text], offset)
+
+    def iter_stream_matches(self, segments: Iterable[str], offset: int = 0) -> Iterator[Tuple[int, int]]:
+        """Like iter_matches, over text arriving as consecutive segments
+
+        Automaton state carries across segment boundaries, so phrases split
+        between segments are still found and positions are relative to the
+        concatenated text.
+        """
+        goto, fail, out, phrases = self._goto, self._fail, self._out, self.phrases
+        root = goto[0]
+        state = 0
+        for segment in segments:
+            for pos, ch in enumerate(segment.lower()):
+                if state == 0 and ch not in root:
+                    continue
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                if out[state]:
+                    end = offset + pos + 1
+                    for index in out[state]:
+                        yield end - len(phrases[index]), index
+            offset += len(segment)
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """All (start position, phrase) matches in text order"""
+        return [(start, self.phrases[index]) for start, index in self.iter_matches(text)]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Occurrence count per matched phrase"""
+        counts = Counter(index for _, index in self.iter_matches(text))
+        return {self.phrases[index]: n for index, n in counts.items()}
+
+    def matched_phrases(self, text: str) -> Set[str]:
+        return {self.phrases[index] for _, index in self.iter_matches(text)}
+
+
+class KeywordIndex:
+    """Phrase matcher plus a precomputed phrase -> keyword inverted index"""
+
+    def __init__(self, phrases: Iterable[str], keywords: Iterable[str]):
+        self.matcher = PhraseMatcher(phrases)
+        self.keywords: List[str] = list(keywords)
+
+        # Each keyword is scanned once by the automaton instead of testing
+        # every phrase against every keyword
+        self.phrase_keywords: Dict[str, List[int]] = {p: [] for p in self.matcher.phrases}
+        for position, keyword in enumerate(self.keywords):
+            for phrase in self.matcher.matched_phrases(keyword):
+                self.phrase_keywords[phrase].append(position)
+
+    def keywords_for_phrases(self, phrases: Iterable[str]) -> List[str]:
+        """Keywords related to any of the given phrases, in keyword database order"""
+        found = set()
+        for phrase in phrases:
+            found.update(self.phrase_keywords.get(phrase, ()))
+        return [self.keywords[position] for position in sorted(found)]
+
+    def extract(self, content: str) -> List[str]:
+        return self.keywords_for_phrases(self.matcher.matched_phrases(content))
+
+    def extract_stream(self, segments: Iterable[str]) -> List[str]:
+        """Extract keywords from text segments without joining them"""
+        phrases = self.matcher.phrases
+        matched = {phrases[index] for _, index in self.matcher.iter_stream_matches(segments)}
+        return self.keywords_for_phrases(matched)
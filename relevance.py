@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Phrase-frequency and TF-IDF relevance scoring for scraped content
+Tokenizes each page once into sparse n-gram counts and ranks keywords by
+on-page relevance combined with search volume and CPC
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+# Longest keyword n-gram counted as a whole phrase
+MAX_NGRAM = 6
+
+# Extra weight for a keyword appearing verbatim rather than as scattered tokens
+PHRASE_WEIGHT = 2.0
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def ngram_counts(tokens: List[str], max_n: int, vocabulary: Optional[set] = None) -> Counter:
+    """Counts of 1..max_n-grams, optionally restricted to a vocabulary
+
+    One pass per n over the token list, so cost stays linear in content size.
+    """
+    counts = Counter()
+    for n in range(1, max_n + 1):
+        grams = map(' '.join, zip(*(tokens[i:] for i in range(n)))) if n > 1 else iter(tokens)
+        if vocabulary is None:
+            counts.update(grams)
+        else:
+            counts.update(g for g in grams if g in vocabulary)
+    return counts
+
+
+class TfidfScorer:
+    """Corpus-level TF-IDF over analyzed pages, restricted to keyword n-grams"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, int, float, str]]):
+        self.keywords: List[Tuple[str, int, float, str]] = list(keywords)
+        self._rows = {row[0]: i for i, row in enumerate(self.keywords)}
+        self._keyword_tokens = [tokenize(row[0]) for row in self.keywords]
+        self._keyword_phrases = [' '.join(tokens) for tokens in self._keyword_tokens]
+        self.max_n = min(MAX_NGRAM, max((len(t) for t in self._keyword_tokens), default=1))
+
+        self.vocabulary = set()
+        for tokens, phrase in zip(self._keyword_tokens, self._keyword_phrases):
+            self.vocabulary.update(tokens)
+            if len(tokens) <= self.max_n:
+                self.vocabulary.add(phrase)
+
+        self.documents: Dict[str, Counter] = {}
+        self.document_frequency: Counter = Counter()
+        self._idf: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+
+    def add_document(self, doc_id: str, content: str):
+        """Count keyword n-grams in a page and fold them into the corpus"""
+        counts = ngram_counts(tokenize(content), self.max_n, self.vocabulary)
+        with self._lock:
+            previous = self.documents.get(doc_id)
+            if previous is not None:
+                self.document_frequency.subtract(previous.keys())
+            self.documents[doc_id] = counts
+            self.document_frequency.update(counts.keys())
+            self._idf = None
+
+    @property
+    def idf(self) -> Dict[str, float]:
+        """Smoothed inverse document frequency, cached until the corpus changes"""
+        with self._lock:
+            if self._idf is None:
+                total = len(self.documents)
+                self._idf = {
+                    term: math.log((1 + total) / (1 + df)) + 1
+                    for term, df in self.document_frequency.items() if df > 0
+                }
+            return self._idf
+
+    def rows(self, keywords: Iterable[str]) -> List[int]:
+        """Positions of the given keywords, skipping any outside the scorer"""
+        return sorted({self._rows[k] for k in keywords if k in self._rows})
+
+    def relevance(self, doc_id: str, rows: Optional[List[int]] = None) -> List[float]:
+        """On-page relevance of every keyword (or only those at rows) for one page"""
+        counts = self.documents.get(doc_id, Counter())
+        idf = self.idf
+
+        def tfidf(term: str) -> float:
+            count = counts.get(term, 0)
+            return (1 + math.log(count)) * idf.get(term, 0.0) if count else 0.0
+
+        if rows is None:
+            rows = range(len(self.keywords))
+        scores = []
+        for row in rows:
+            tokens, phrase = self._keyword_tokens[row], self._keyword_phrases[row]
+            if not tokens:
+                scores.append(0.0)
+                continue
+            score = sum(tfidf(t) for t in set(tokens)) / len(set(tokens))
+            if len(tokens) > 1:
+                score += PHRASE_WEIGHT * tfidf(phrase)
+            scores.append(score)
+        return scores
+
+    def rank(self, doc_id: str, top: int = 10, candidates: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Keywords ranked by relevance x log(volume) / (1 + cpc)
+
+        candidates limits the ranking (and the relevance pass) to those
+        keywords, e.g. the ones phrase extraction already found on the page.
+        """
+        rows = self.rows(candidates) if candidates is not None else range(len(self.keywords))
+        ranked = []
+        for row, relevance in zip(rows, self.relevance(doc_id, rows)):
+            keyword, volume, cpc, competition = self.keywords[row]
+            if relevance <= 0:
+                continue
+            score = relevance * math.log1p(volume) / (1 + cpc)
+            ranked.append((score, relevance, keyword, volume, cpc, competition))
+        return [
+            {
+                "keyword": keyword,
+                "volume": volume,
+                "cpc": f"${cpc:.2f}",
+                "competition": competition,
+                "relevance": round(relevance, 4),
+                "score": round(score, 4)
+            }
+            for score, relevance, keyword, volume, cpc, competition
+            in heapq.nlargest(top, ranked, key=lambda row: row[0])
+        ]
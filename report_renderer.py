@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Precompiled report rendering for the Firecrawl keyword analyzer
+Compiles the report template once and streams Markdown, HTML or JSON
+straight to a file handle, reusing the static sections across reports
+"""
+
+import html
+import io
+import json
+import os
+import re
+from string import Formatter
+from typing import Dict, Iterable, List, TextIO, Tuple
+
+from keyword_record import json_default
+
+REPORT_TEMPLATE = """
+# CuraMedix Google Ads Keyword Analysis Report
+## Powered by Firecrawl API
+
+### Executive Summary
+- **Total Monthly Search Volume:** {total_monthly_searches:,} searches
+- **Average CPC:** {average_cpc}
+- **Primary Opportunity:** Section 179 tax-focused campaigns (year-end urgency)
+
+### 🎯 HIGH PRIORITY KEYWORDS (High Volume, High Intent)
+{high_priority_keywords}
+
+### 💰 SECTION 179 TAX KEYWORDS (Seasonal Opportunity)
+{section_179_keywords}
+
+### 🏥 TREATMENT-SPECIFIC KEYWORDS (Targeted Audiences)
+{treatment_specific_keywords}
+
+### 💎 LOW COMPETITION OPPORTUNITIES (Cost-Effective)
+{low_competition_opportunities}
+
+### 📊 RECOMMENDED CAMPAIGN STRUCTURE
+
+#### Campaign 1: Section 179 Tax Benefits
+- **Budget:** 40% of total spend
+- **Timing:** Increase spend Oct-Dec
+- **Landing Page:** Section 179 focused variant
+- **Key Message:** "Write off 100% before year-end"
+
+#### Campaign 2: Equipment Purchase Intent
+- **Budget:** 30% of total spend
+- **Keywords:** Brand and equipment-focused terms
+- **Landing Page:** Main product page
+- **Key Message:** "FDA-approved, proven ROI"
+
+#### Campaign 3: Treatment-Specific
+- **Budget:** 20% of total spend
+- **Keywords:** Condition-specific terms
+- **Landing Page:** Treatment-specific variants
+- **Key Message:** "95% success rate, non-invasive"
+
+#### Campaign 4: Competitor/Comparison
+- **Budget:** 10% of total spend
+- **Keywords:** "Best", "compare", "vs" terms
+- **Landing Page:** Comparison page
+- **Key Message:** "Industry-leading technology"
+
+### 💵 BUDGET RECOMMENDATIONS
+
+{budget_recommendations}
+
+### 📈 EXPECTED PERFORMANCE METRICS
+- **Click-Through Rate (CTR):** 3-5% for branded, 1-2% for generic
+- **Conversion Rate:** 2-4% for high-intent keywords
+- **Cost Per Lead:** $150-$300 (based on industry averages)
+- **ROI:** 3-5x with proper nurturing
+
+### 🚀 QUICK WINS
+1. **Immediate Action:** Launch Section 179 campaign (time-sensitive)
+2. **Ad Extensions:** Add sitelinks, callouts, price extensions
+3. **Negative Keywords:** Exclude "used", "rental", "cheap"
+4. **Geo-Targeting:** Focus on high-income medical practice areas
+5. **Ad Schedule:** Increase bids during business hours (8am-6pm)
+
+### 📝 AD COPY RECOMMENDATIONS
+
+**Headline Examples:**
+- "Section 179: Write Off 100% | Shockwave Therapy Equipment"
+- "FDA-Approved Shockwave Therapy | 95% Success Rate"
+- "Save $55K+ in Taxes | Medical Equipment Deduction"
+
+**Description Examples:**
+- "Limited time: Claim full tax deduction on shockwave therapy equipment. FDA-approved, proven ROI. Get instant quote."
+- "Join 3,000+ practices using our shockwave therapy. Non-invasive treatment, immediate results. Schedule demo today."
+        """
+
+# Keyword lists in the report show the top 5 of each category
+REPORT_TOP_N = 5
+
+FORMATS = ('markdown', 'html', 'json')
+EXTENSIONS = {'markdown': '.md', 'html': '.html', 'json': '.json'}
+
+KEYWORD_LIST_FIELDS = (
+    "high_priority_keywords",
+    "section_179_keywords",
+    "treatment_specific_keywords",
+    "low_competition_opportunities"
+)
+
+
+# -- Markdown slot writers -------------------------------------------------
+
+def write_keyword_list_markdown(fh: TextIO, keywords: List[Dict]):
+    if not keywords:
+        fh.write("No keywords in this category")
+        return
+    for i, kw in enumerate(keywords[:REPORT_TOP_N]):
+        if i:
+            fh.write("\n")
+        fh.write(
+            f"- **{kw['keyword']}**\n"
+            f"  - Volume: {kw['volume']:,} searches/month\n"
+            f"  - CPC: {kw['cpc']}\n"
+            f"  - Competition: {kw['competition']}\n"
+            f"  - Est. Monthly Budget: {kw['monthly_budget_estimate']}"
+        )
+
+
+def write_budgets_markdown(fh: TextIO, budgets: Dict):
+    for i, (level, details) in enumerate(budgets.items()):
+        if i:
+            fh.write("\n")
+        fh.write(
+            f"**{level.title()} Strategy:**\n"
+            f"- Monthly Budget: {details['monthly']}\n"
+            f"- Focus: {details['focus']}\n"
+            f"- Expected Results: {details['expected_clicks']}\n"
+        )
+
+
+# -- HTML slot writers -----------------------------------------------------
+
+def write_keyword_list_html(fh: TextIO, keywords: List[Dict]):
+    if not keywords:
+        fh.write("<p>No keywords in this category</p>")
+        return
+    fh.write("<ul>")
+    for kw in keywords[:REPORT_TOP_N]:
+        fh.write(
+            f"<li><strong>{html.escape(kw['keyword'])}</strong><ul>"
+            f"<li>Volume: {kw['volume']:,} searches/month</li>"
+            f"<li>CPC: {html.escape(str(kw['cpc']))}</li>"
+            f"<li>Competition: {html.escape(kw['competition'])}</li>"
+            f"<li>Est. Monthly Budget: {html.escape(str(kw['monthly_budget_estimate']))}</li>"
+            f"</ul></li>"
+        )
+    fh.write("</ul>")
+
+
+def write_budgets_html(fh: TextIO, budgets: Dict):
+    for level, details in budgets.items():
+        fh.write(
+            f"<p><strong>{html.escape(level.title())} Strategy:</strong></p><ul>"
+            f"<li>Monthly Budget: {html.escape(details['monthly'])}</li>"
+            f"<li>Focus: {html.escape(details['focus'])}</li>"
+            f"<li>Expected Results: {html.escape(details['expected_clicks'])}</li>"
+            f"</ul>"
+        )
+
+
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_HEADING = re.compile(r'^(#{1,6}) (.*)$')
+_ORDERED = re.compile(r'^\d+\. (.*)$')
+_PLACEHOLDER = re.compile('\x00(\\d+)\x00')
+_BLOCK_PLACEHOLDER = re.compile('<p>(\x00\\d+\x00)</p>')
+
+
+def markdown_to_html(text: str) -> str:
+    """Convert the Markdown subset used by the static report sections
+
+    Only run over template literals at compile time, never per report.
+    """
+    out = []
+    open_list = None
+
+    def inline(value: str) -> str:
+        return _BOLD.sub(r'<strong>\1</strong>', html.escape(value, quote=False))
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            out.append(f"</{open_list}>")
+            open_list = None
+
+    for line in text.split("\n"):
+        stripped = line.strip()
+        heading = _HEADING.match(stripped)
+        ordered = _ORDERED.match(stripped)
+        if not stripped:
+            close_list()
+        elif heading:
+            close_list()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{inline(heading.group(2))}</h{level}>")
+        elif stripped.startswith("- ") or ordered:
+            tag = "ol" if ordered else "ul"
+            if open_list != tag:
+                close_list()
+                out.append(f"<{tag}>")
+                open_list = tag
+            out.append(f"<li>{inline(ordered.group(1) if ordered else stripped[2:])}</li>")
+        else:
+            close_list()
+            out.append(f"<p>{inline(stripped)}</p>")
+    close_list()
+    return "\n".join(out)
+
+
+HTML_HEADER = (
+    "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+    "<title>CuraMedix Google Ads Keyword Analysis Report</title></head><body>\n"
+)
+HTML_FOOTER = "\n</body></html>\n"
+
+
+class CompiledReport:
+    """Report template split once into static text and slot writers"""
+
+    def __init__(self, template: str = REPORT_TEMPLATE, fmt: str = 'markdown'):
+        if fmt not in ('markdown', 'html'):
+            raise ValueError(f"Unsupported template format: {fmt}")
+        self.fmt = fmt
+        write_list = write_keyword_list_markdown if fmt == 'markdown' else write_keyword_list_html
+        write_budgets = write_budgets_markdown if fmt == 'markdown' else write_budgets_html
+
+        # (static text, slot writer) pairs; static text is converted to the
+        # output format here, once, rather than on every render
+        parsed = list(Formatter().parse(template))
+        slots = [
+            self._slot(field, spec, write_list, write_budgets, escape=fmt == 'html')
+            for _, field, spec, _ in parsed
+        ]
+        if fmt == 'markdown':
+            self.parts = [(literal, slot) for (literal, _, _, _), slot in zip(parsed, slots)]
+            return
+
+        # Convert the whole template with placeholders in place so inline
+        # slots stay inside their list items, then split at the placeholders
+        marked = ''.join(
+            literal + (f"\x00{i}\x00" if field is not None else '')
+            for i, (literal, field, _, _) in enumerate(parsed)
+        )
+        converted = _BLOCK_PLACEHOLDER.sub(r'\1', markdown_to_html(marked))
+        pieces = _PLACEHOLDER.split(converted)
+        self.parts = [
+            (pieces[i], slots[int(pieces[i + 1])] if i + 1 < len(pieces) else None)
+            for i in range(0, len(pieces), 2)
+        ]
+
+    @staticmethod
+    def _slot(field, spec, write_list, write_budgets, escape: bool):
+        if field is None:
+            return None
+        if field in KEYWORD_LIST_FIELDS:
+            return lambda fh, analysis: write_list(fh, analysis[field])
+        if field == "budget_recommendations":
+            return lambda fh, analysis: write_budgets(fh, analysis[field])
+        if escape:
+            return lambda fh, analysis: fh.write(html.escape(format(analysis[field], spec or '')))
+        return lambda fh, analysis: fh.write(format(analysis[field], spec or ''))
+
+    def render(self, analysis: Dict, fh: TextIO):
+        if self.fmt == 'html':
+            fh.write(HTML_HEADER)
+        for literal, slot in self.parts:
+            fh.write(literal)
+            if slot:
+                slot(fh, analysis)
+        if self.fmt == 'html':
+            fh.write(HTML_FOOTER)
+
+
+class ReportRenderer:
+    """Renders analyses as Markdown, HTML or JSON from precompiled templates"""
+
+    def __init__(self, template: str = REPORT_TEMPLATE):
+        self.template = template
+        self._compiled: Dict[str, CompiledReport] = {}
+
+    def compiled(self, fmt: str) -> CompiledReport:
+        report = self._compiled.get(fmt)
+        if report is None:
+            report = self._compiled[fmt] = CompiledReport(self.template, fmt)
+        return report
+
+    def render(self, analysis: Dict, fh: TextIO, fmt: str = 'markdown'):
+        """Stream one report to an open text file handle"""
+        if fmt == 'json':
+            json.dump(analysis, fh, indent=2, default=json_default)
+        elif fmt in FORMATS:
+            self.compiled(fmt).render(analysis, fh)
+        else:
+            raise ValueError(f"Unsupported report format: {fmt}")
+
+    def render_to_string(self, analysis: Dict, fmt: str = 'markdown') -> str:
+        buffer = io.StringIO()
+        self.render(analysis, buffer, fmt)
+        return buffer.getvalue()
+
+    def render_many(self, analyses: Iterable[Tuple[str, Dict]], output_dir: str,
+                    formats: Iterable[str] = ('markdown',)) -> List[str]:
+        """Write one report per (name, analysis) pair in each format
+
+        The compiled templates are shared across the whole batch.
+        """
+        formats = list(formats)
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for name, analysis in analyses:
+            for fmt in formats:
+                path = os.path.join(output_dir, name + EXTENSIONS[fmt])
+                with open(path, 'w', encoding='utf-8') as fh:
+                    self.render(analysis, fh, fmt)
+                written.append(path)
+        return written
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for scraped pages and keyword extraction results
+Backed by SQLite with TTL expiry, LRU eviction and content hashing
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_PATH = '.scrape_cache.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    cache_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    validator TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+CREATE TABLE IF NOT EXISTS extractions (
+    extraction_key TEXT PRIMARY KEY,
+    keywords TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS extractions_last_access ON extractions (last_access);
+"""
+
+
+def content_hash(content: str) -> str:
+    """Stable hash used to detect unchanged page content"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ScrapeCache:
+    """SQLite cache keyed by URL plus request options"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = 86400,
+                 max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'extraction_hits': 0,
+            'extraction_misses': 0,
+            'evictions': 0
+        }
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(url: str, options: Optional[Dict] = None) -> str:
+        raw = json.dumps([url, options or {}], sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, url: str, options: Optional[Dict] = None,
+            validator: Optional[str] = None) -> Optional[Dict]:
+        """Return a fresh cached page, or None on miss, expiry or changed validator"""
+        key = self.make_key(url, options)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, content_hash, etag, last_modified, validator, fetched_at "
+                "FROM pages WHERE cache_key = ?", (key,)
+            ).fetchone()
+            fresh = (
+                row is not None
+                and (self.ttl is None or now - row[5] <= self.ttl)
+                and (validator is None or validator == row[4])
+            )
+            if not fresh:
+                self.counters['misses'] += 1
+                return None
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self.counters['hits'] += 1
+        return {
+            'content': row[0],
+            'content_hash': row[1],
+            'etag': row[2],
+            'last_modified': row[3]
+        }
+
+    def put(self, url: str, content: str, options: Optional[Dict] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None,
+            validator: Optional[str] = None) -> str:
+        """Store a page and return its content hash"""
+        key = self.make_key(url, options)
+        digest = content_hash(content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, content, digest, etag, last_modified, validator, now, now)
+            )
+            self._evict('pages', 'cache_key')
+            self._conn.commit()
+        return digest
+
+    def get_extraction(self, extraction_key: str) -> Optional[List[str]]:
+        """Return cached keywords extracted from identical content"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT keywords FROM extractions WHERE extraction_key = ?", (extraction_key,)
+            ).fetchone()
+            if row is None:
+                self.counters['extraction_misses'] += 1
+                return None
+            self._conn.execute(
+                "UPDATE extractions SET last_access = ? WHERE extraction_key = ?",
+                (time.time(), extraction_key)
+            )
+            self._conn.commit()
+            self.counters['extraction_hits'] += 1
+        return json.loads(row[0])
+
+    def put_extraction(self, extraction_key: str, keywords: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?)",
+                (extraction_key, json.dumps(keywords), time.time())
+            )
+            self._evict('extractions', 'extraction_key')
+            self._conn.commit()
+
+    def _evict(self, table: str, key_column: str):
+        """Drop least recently used rows beyond max_entries"""
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE {key_column} IN "
+                f"(SELECT {key_column} FROM {table} ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self.counters['evictions'] += excess
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and entry counts for monitoring"""
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            extractions = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+            stats = dict(self.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['page_entries'] = pages
+        stats['extraction_entries'] = extractions
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Breadth-first site crawler for the keyword analyzer
+Follows internal links and sitemaps from a seed URL or local page, fetching
+pages concurrently and analyzing each one as soon as it arrives
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.request import url2pathname
+
+from bulk_analyze import DEFAULT_OUTPUT_DIR, merge_rollup
+from html_text import iter_links
+
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_MAX_PAGES = 200
+
+# Nested sitemap indexes are followed up to this many sitemap files
+MAX_SITEMAPS = 50
+
+LOCAL_PAGE_EXTENSIONS = ('.html', '.htm')
+
+# Links to these are assets, never pages worth scraping
+NON_PAGE_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico',
+    '.css', '.js', '.zip', '.mp4', '.mp3', '.docx', '.xml'
+)
+
+# Links in Firecrawl's markdown content: [text](url "title")
+_MARKDOWN_LINK = re.compile(r'\[[^\]]*\]\(\s*<?([^)\s>]+)')
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical form used for dedup: lowercase host, no fragment or default port"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https', 'file'):
+        return None
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def url_key(url: str) -> bytes:
+    """Fixed 8-byte fingerprint of a normalized URL for the seen set"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+
+
+def seed_url(seed: str) -> str:
+    """Turn a local path into a file:// URL; URLs pass through unchanged"""
+    if '://' in seed:
+        return seed
+    return Path(os.path.abspath(seed)).as_uri()
+
+
+def iter_sitemap_entries(source) -> Iterator[Tuple[str, str]]:
+    """Yield ('url' | 'sitemap', loc) pairs from a sitemap or sitemap index file"""
+    for _, element in ET.iterparse(source):
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in ('url', 'sitemap'):
+            for child in element:
+                if child.tag.rsplit('}', 1)[-1] == 'loc' and child.text:
+                    yield tag, child.text.strip()
+            element.clear()
+
+
+class SiteCrawler:
+    """Pipelined breadth-first crawl: fetches run in a thread pool while the
+    caller consumes analyzed pages in completion order"""
+
+    def __init__(self, analyzer, max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_pages: int = DEFAULT_MAX_PAGES, use_sitemap: bool = True,
+                 max_workers: Optional[int] = None):
+        self.analyzer = analyzer
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.use_sitemap = use_sitemap
+        self.max_workers = max_workers or analyzer.max_workers
+        self.seen = set()
+        self.frontier = deque()
+        self.queued = 0
+        self._root = None
+        self._root_dir = None
+
+    def in_scope(self, url: str) -> bool:
+        """Same site as the seed, and something that looks like a page"""
+        parts = urlsplit(url)
+        if parts.scheme == 'file':
+            path = url2pathname(parts.path)
+            return (
+                self._root.scheme == 'file'
+                and path.lower().endswith(LOCAL_PAGE_EXTENSIONS)
+                and os.path.commonpath([path, self._root_dir]) == self._root_dir
+                and os.path.isfile(path)
+            )
+        return (
+            parts.scheme in ('http', 'https')
+            and parts.netloc.removeprefix('www.') == self._root.netloc.removeprefix('www.')
+            and not parts.path.lower().endswith(NON_PAGE_EXTENSIONS)
+        )
+
+    def enqueue(self, url: str, depth: int) -> bool:
+        """Add a URL to the frontier unless it is out of scope, seen or over the page limit"""
+        if self.queued >= self.max_pages:
+            return False
+        url = normalize_url(url)
+        if url is None or not self.in_scope(url):
+            return False
+        key = url_key(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.frontier.append((url, depth))
+        self.queued += 1
+        return True
+
+    def sitemap_urls(self) -> Iterator[str]:
+        """Page URLs listed in the site's sitemap.xml, following sitemap indexes"""
+        if self._root.scheme == 'file':
+            pending = [Path(os.path.join(self._root_dir, 'sitemap.xml')).as_uri()]
+        else:
+            pending = [urlunsplit((self._root.scheme, self._root.netloc, '/sitemap.xml', '', ''))]
+
+        fetched = 0
+        while pending and fetched < MAX_SITEMAPS:
+            location = pending.pop(0)
+            fetched += 1
+            try:
+                if location.startswith('file://'):
+                    path = url2pathname(urlsplit(location).path)
+                    if not os.path.isfile(path):
+                        continue
+                    entries = list(iter_sitemap_entries(path))
+                else:
+                    response = self.analyzer.crawl_engine.get(location, rate_key=location)
+                    if response.status_code != 200:
+                        continue
+                    entries = list(iter_sitemap_entries(io.BytesIO(response.content)))
+            except Exception as e:
+                print(f"Error reading sitemap {location}: {e}")
+                continue
+
+            for kind, loc in entries:
+                if kind == 'sitemap':
+                    pending.append(urljoin(location, loc))
+                else:
+                    yield urljoin(location, loc)
+
+    def fetch(self, url: str) -> Tuple[Dict, List[str]]:
+        """Scraped page data plus the absolute URLs it links to"""
+        if url.startswith('file://'):
+            scraped = self.analyzer.fallback_analysis(url)
+            try:
+                links = [urljoin(url, href) for href in iter_links(url2pathname(urlsplit(url).path))]
+            except OSError:
+                links = []
+            return scraped, links
+
+        scraped = self.analyzer.scrape_with_firecrawl(url)
+        data = scraped.get('data', {})
+        links = [urljoin(url, href) for href in _MARKDOWN_LINK.findall(data.get('content', ''))]
+        links.extend(data.get('linksOnPage', []))
+        return scraped, links
+
+    def analyze(self, url: str, depth: int, scraped: Dict) -> Dict:
+        """Extraction stage for one fetched page"""
+        content = scraped.get('data', {}).get('content', '')
+        self.analyzer.relevance.add_document(url, content)
+        return {
+            "page": url,
+            "depth": depth,
+            "matched_keywords": self.analyzer.extract_keywords_cached(content, scraped.get('content_hash')),
+            "phrase_counts": self.analyzer.keyword_index.matcher.count(content)
+        }
+
+    def crawl(self, seed: str) -> Iterator[Dict]:
+        """Yield one page analysis per fetched page, as soon as each fetch completes"""
+        seed = normalize_url(seed_url(seed))
+        self._root = urlsplit(seed)
+        self._root_dir = os.path.dirname(url2pathname(self._root.path))
+        self.enqueue(seed, 0)
+        if self.use_sitemap:
+            for url in self.sitemap_urls():
+                self.enqueue(url, 1)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            in_flight = {}
+            while self.frontier or in_flight:
+                # Keep every worker busy; the FIFO frontier keeps the order breadth-first
+                while self.frontier and len(in_flight) < self.max_workers:
+                    url, depth = self.frontier.popleft()
+                    in_flight[pool.submit(self.fetch, url)] = (url, depth)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = in_flight.pop(future)
+                    scraped, links = future.result()
+                    if depth < self.max_depth:
+                        for link in links:
+                            self.enqueue(link, depth + 1)
+                    yield self.analyze(url, depth, scraped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a site and analyze every page for keywords")
+    parser.add_argument('seed', nargs='?',
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index.html'),
+                        help='Seed URL or local HTML page (default: index.html)')
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH)
+    parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES)
+    parser.add_argument('--no-sitemap', action='store_true', help='Only follow links, ignore sitemap.xml')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+    from scrape_cache import ScrapeCache
+
+    analyzer = FirecrawlKeywordAnalyzer(cache=ScrapeCache())
+    os.makedirs(args.output_dir, exist_ok=True)
+    pages_path = os.path.join(args.output_dir, 'site_crawl.jsonl')
+    rollup_path = os.path.join(args.output_dir, 'site_rollup.json')
+
+    results = []
+    with open(pages_path, 'w', encoding='utf-8') as f:
+        for page in analyzer.crawl_site(args.seed, max_depth=args.max_depth,
+                                        max_pages=args.max_pages, use_sitemap=not args.no_sitemap):
+            f.write(json.dumps(page) + '\n')
+            results.append(page)
+            print(f"  [{page['depth']}] {page['page']} - {len(page['matched_keywords'])} keywords")
+
+    rollup = merge_rollup(results)
+    rollup["relevance_ranked_keywords"] = {
+        page["page"]: analyzer.relevance.rank(page["page"], top=10, candidates=page["matched_keywords"])
+        for page in results
+    }
+    with open(rollup_path, 'w', encoding='utf-8') as f:
+        json.dump(rollup, f, indent=2)
+
+    print("\n✅ Site crawl complete!")
+    print(f"📄 Pages crawled: {len(results)} (saved to {pages_path})")
+    print(f"📊 Rollup saved to: {rollup_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Append-only history of keyword metrics, one compressed snapshot per run
+Indexes runs by date and keywords by a stable id, and diffs any two runs
+or reads one keyword's history without loading the rest of the history
+"""
+
+import argparse
+import bisect
+import json
+import os
+import tempfile
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from analysis_export import CSV_CATEGORIES
+from csv_export import KeywordRow
+from keyword_schema import COMPETITION_CODES, COMPETITION_LEVELS
+
+DEFAULT_HISTORY_DIR = 'keyword_history'
+
+HISTORY_VERSION = 1
+
+# Rows per compressed block; a single keyword lookup inflates one block
+# per column instead of the whole run
+BLOCK_ROWS = 1024
+
+# Snapshot columns, all indexed by keyword id. CPC is kept in whole cents,
+# which is the precision every report shows
+COLUMNS = {
+    'volume': np.int32,
+    'cpc_cents': np.int32,
+    'competition': np.uint8,
+    'flags': np.uint8
+}
+
+# flags: bit i = listed in CSV_CATEGORIES[i], PRESENT_FLAG = keyword in this run
+PRESENT_FLAG = 0x80
+
+_MAGIC = b'KWSNAP1\n'
+
+RunRef = Union[str, int]
+
+
+class RunSnapshot:
+    """One run file: a small JSON header, a block offset table and the
+    zlib-compressed column blocks, so any block can be read with one seek"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"Not a keyword snapshot: {path}")
+            header_length = int.from_bytes(f.read(4), 'little')
+            header = json.loads(f.read(header_length))
+            self._table_start = f.tell()
+        self.rows = header['rows']
+        self.block_rows = header['block_rows']
+        self.columns = header['columns']
+        self.blocks = -(-self.rows // self.block_rows)
+        self._data_start = self._table_start + 8 * (len(self.columns) * self.blocks + 1)
+
+    @staticmethod
+    def write(path: str, columns: Dict[str, np.ndarray], block_rows: int = BLOCK_ROWS):
+        rows = len(columns['flags'])
+        blobs = []
+        offsets = [0]
+        for name, dtype in COLUMNS.items():
+            values = np.ascontiguousarray(columns[name], dtype=dtype)
+            for start in range(0, rows, block_rows):
+                blobs.append(zlib.compress(_shuffle(values[start:start + block_rows]), 6))
+                offsets.append(offsets[-1] + len(blobs[-1]))
+
+        header = json.dumps({'rows': rows, 'block_rows': block_rows, 'columns': list(COLUMNS)}).encode('utf-8')
+        directory = os.path.dirname(path)
+        fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(len(header).to_bytes(4, 'little'))
+            f.write(header)
+            f.write(np.array(offsets, dtype='<u8').tobytes())
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+
+    def _offsets(self, f, name: str, first: int, count: int) -> np.ndarray:
+        """Data offsets bounding `count` consecutive blocks of a column"""
+        f.seek(self._table_start + 8 * (self.columns.index(name) * self.blocks + first))
+        return np.frombuffer(f.read(8 * (count + 1)), dtype='<u8').astype(np.int64)
+
+    def _read_blocks(self, f, name: str, first: int, count: int) -> List[np.ndarray]:
+        offsets = self._offsets(f, name, first, count)
+        f.seek(self._data_start + offsets[0])
+        data = f.read(offsets[-1] - offsets[0])
+        relative = offsets - offsets[0]
+        return [_unshuffle(zlib.decompress(data[relative[i]:relative[i + 1]]), COLUMNS[name])
+                for i in range(count)]
+
+    def column(self, name: str) -> np.ndarray:
+        """A whole column, one entry per keyword id known at this run"""
+        if not self.blocks:
+            return np.empty(0, dtype=COLUMNS[name])
+        with open(self.path, 'rb') as f:
+            return np.concatenate(self._read_blocks(f, name, 0, self.blocks))
+
+    def row(self, keyword_id: int) -> Optional[Dict]:
+        """One keyword's metrics, or None if it was not part of this run"""
+        if keyword_id >= self.rows:
+            return None
+        index, position = divmod(keyword_id, self.block_rows)
+        with open(self.path, 'rb') as f:
+            flags = int(self._read_blocks(f, 'flags', index, 1)[0][position])
+            if not flags & PRESENT_FLAG:
+                return None
+            volume, cpc_cents, competition = (
+                self._read_blocks(f, name, index, 1)[0][position]
+                for name in ('volume', 'cpc_cents', 'competition')
+            )
+        return {
+            'volume': int(volume),
+            'cpc': int(cpc_cents) / 100,
+            'competition': COMPETITION_LEVELS[competition],
+            'categories': [c for i, c in enumerate(CSV_CATEGORIES) if flags & (1 << i)]
+        }
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Group the bytes of each significance together so zlib finds the runs"""
+    return values.view(np.uint8).reshape(-1, values.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype) -> np.ndarray:
+    itemsize = np.dtype(dtype).itemsize
+    shuffled = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1)
+    return np.ascontiguousarray(shuffled.T).view(dtype).ravel()
+
+
+def _pad(values: np.ndarray, rows: int) -> np.ndarray:
+    if len(values) >= rows:
+        return values
+    return np.concatenate([values, np.zeros(rows - len(values), dtype=values.dtype)])
+
+
+class SnapshotHistory:
+    """Append-only snapshot store
+
+    Layout under the history directory:
+      keywords.txt    keyword per line; the line number is its stable id
+      manifest.jsonl  one line per run, written last, so a run only exists
+                      once its snapshot file is complete
+      runs/*.snap     per-run columns indexed by keyword id
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_DIR):
+        self.path = path
+        self.runs_dir = os.path.join(path, 'runs')
+        os.makedirs(self.runs_dir, exist_ok=True)
+        self._vocabulary_path = os.path.join(path, 'keywords.txt')
+        self._manifest_path = os.path.join(path, 'manifest.jsonl')
+
+        self.keywords: List[str] = []
+        if os.path.exists(self._vocabulary_path):
+            with open(self._vocabulary_path, 'r', encoding='utf-8', newline='') as f:
+                self.keywords = f.read().split('\n')[:-1]
+        self._keyword_ids: Optional[Dict[str, int]] = None
+
+        self.runs: List[Dict] = []
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                self.runs = [json.loads(line) for line in f if line.strip()]
+        self.runs.sort(key=lambda run: run['recorded_at'])
+        self._dates = [run['recorded_at'] for run in self.runs]
+
+    @property
+    def keyword_ids(self) -> Dict[str, int]:
+        """keyword -> stable id, built on first use so diffs skip it"""
+        if self._keyword_ids is None:
+            self._keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+        return self._keyword_ids
+
+    # -- Recording --------------------------------------------------------
+
+    def record(self, analysis: Dict, rows: Iterable[KeywordRow],
+               recorded_at: Optional[datetime] = None) -> str:
+        """Append a snapshot of keyword metrics and category membership; returns the run id"""
+        recorded_at = (recorded_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        run_id = recorded_at.strftime('%Y%m%dT%H%M%S%fZ')
+
+        keyword_ids = self.keyword_ids
+        new_keywords = []
+        entries = []
+        for keyword, volume, cpc, competition in rows:
+            keyword_id = keyword_ids.get(keyword)
+            if keyword_id is None:
+                if '\n' in keyword:
+                    raise ValueError(f"Keyword contains a newline: {keyword!r}")
+                keyword_id = keyword_ids[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+                new_keywords.append(keyword)
+            entries.append((keyword_id, volume, cpc, COMPETITION_CODES[competition.lower()]))
+
+        columns = {name: np.zeros(len(self.keywords), dtype=dtype) for name, dtype in COLUMNS.items()}
+        if entries:
+            ids, volume, cpc, competition = (np.array(column) for column in zip(*entries))
+            columns['volume'][ids] = volume
+            columns['cpc_cents'][ids] = np.round(cpc * 100)
+            columns['competition'][ids] = competition
+            columns['flags'][ids] = PRESENT_FLAG
+        for bit, category in enumerate(CSV_CATEGORIES):
+            for item in analysis.get(category, ()):
+                keyword_id = self.keyword_ids.get(item['keyword'])
+                if keyword_id is not None:
+                    columns['flags'][keyword_id] |= 1 << bit
+
+        RunSnapshot.write(os.path.join(self.runs_dir, f'{run_id}.snap'), columns)
+        if new_keywords:
+            with open(self._vocabulary_path, 'a', encoding='utf-8', newline='') as f:
+                f.write(''.join(keyword + '\n' for keyword in new_keywords))
+
+        run = {
+            'version': HISTORY_VERSION,
+            'run_id': run_id,
+            'recorded_at': recorded_at.isoformat(),
+            'keywords': int(np.count_nonzero(columns['flags'] & PRESENT_FLAG)),
+            'total_volume': int(columns['volume'].sum()),
+            'file': f'{run_id}.snap'
+        }
+        with open(self._manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run) + '\n')
+        index = bisect.bisect_right(self._dates, run['recorded_at'])
+        self.runs.insert(index, run)
+        self._dates.insert(index, run['recorded_at'])
+        return run_id
+
+    # -- Lookup -----------------------------------------------------------
+
+    def resolve(self, ref: RunRef) -> Dict:
+        """Find a run by run id, list index (-1 = latest) or date (latest run that day)"""
+        if isinstance(ref, str):
+            try:
+                ref = int(ref)
+            except ValueError:
+                pass
+        if isinstance(ref, int):
+            if not -len(self.runs) <= ref < len(self.runs):
+                raise KeyError(f"No run matches {ref!r}: {len(self.runs)} runs recorded")
+            return self.runs[ref]
+        for run in self.runs:
+            if run['run_id'] == ref:
+                return run
+        day = self.runs_between(ref, ref)
+        if day:
+            return day[-1]
+        raise KeyError(f"No run matches {ref!r}")
+
+    def runs_between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Runs recorded from start to end inclusive; dates are ISO 'YYYY-MM-DD' or full timestamps"""
+        lo = bisect.bisect_left(self._dates, start) if start else 0
+        if end and len(end) == len('YYYY-MM-DD'):
+            # A bare date as the end bound covers that whole day
+            end += '\uffff'
+        hi = bisect.bisect_right(self._dates, end) if end else len(self.runs)
+        return self.runs[lo:hi]
+
+    def snapshot(self, ref: RunRef) -> RunSnapshot:
+        return RunSnapshot(os.path.join(self.runs_dir, self.resolve(ref)['file']))
+
+    def keyword_history(self, keyword: str, start: Optional[str] = None,
+                        end: Optional[str] = None) -> List[Dict]:
+        """Metrics for one keyword in every run between start and end
+
+        Reads one compressed block per column from each run file.
+        """
+        keyword_id = self.keyword_ids.get(keyword)
+        if keyword_id is None:
+            return []
+        history = []
+        for run in self.runs_between(start, end):
+            row = RunSnapshot(os.path.join(self.runs_dir, run['file'])).row(keyword_id)
+            if row is not None:
+                history.append({'run_id': run['run_id'], 'recorded_at': run['recorded_at'], **row})
+        return history
+
+    # -- Diffing ----------------------------------------------------------
+
+    def diff(self, before: RunRef = -2, after: RunRef = -1, top: int = 20) -> Dict:
+        """Volume and CPC changes plus category entries and exits between two runs"""
+        if len(self.runs) < 2:
+            raise ValueError(f"Diff needs at least two recorded runs, found {len(self.runs)}")
+        runs = (self.resolve(before), self.resolve(after))
+        snapshots = [RunSnapshot(os.path.join(self.runs_dir, run['file'])) for run in runs]
+        rows = max(snapshot.rows for snapshot in snapshots)
+        (volume_a, cpc_a, flags_a), (volume_b, cpc_b, flags_b) = (
+            tuple(_pad(snapshot.column(name), rows) for name in ('volume', 'cpc_cents', 'flags'))
+            for snapshot in snapshots
+        )
+
+        present_a = (flags_a & PRESENT_FLAG) != 0
+        present_b = (flags_b & PRESENT_FLAG) != 0
+        both = present_a & present_b
+        volume_delta = volume_b.astype(np.int64) - volume_a
+        cpc_delta = cpc_b.astype(np.int64) - cpc_a
+        changed = np.flatnonzero(both & ((volume_delta != 0) | (cpc_delta != 0)))
+        magnitude = -np.abs(volume_delta[changed])
+        if len(changed) > top:
+            # Only the top changes are reported, so skip sorting the rest
+            keep = np.argpartition(magnitude, top)[:top]
+            changed_top, magnitude = changed[keep], magnitude[keep]
+        else:
+            changed_top = changed
+        order = changed_top[np.lexsort((changed_top, magnitude))]
+
+        categories = {}
+        for bit, category in enumerate(CSV_CATEGORIES):
+            in_a = (flags_a & (1 << bit)) != 0
+            in_b = (flags_b & (1 << bit)) != 0
+            entered, left = np.flatnonzero(in_b & ~in_a), np.flatnonzero(in_a & ~in_b)
+            if len(entered) or len(left):
+                categories[category] = {
+                    'entered': [self.keywords[i] for i in entered],
+                    'left': [self.keywords[i] for i in left]
+                }
+
+        return {
+            'before': runs[0]['run_id'],
+            'after': runs[1]['run_id'],
+            'keywords_added': [self.keywords[i] for i in np.flatnonzero(present_b & ~present_a)],
+            'keywords_removed': [self.keywords[i] for i in np.flatnonzero(present_a & ~present_b)],
+            'keywords_changed': len(changed),
+            'total_volume_change': int(volume_delta[both].sum()),
+            'top_changes': [
+                {
+                    'keyword': self.keywords[i],
+                    'volume_before': int(volume_a[i]),
+                    'volume_after': int(volume_b[i]),
+                    'volume_change': int(volume_delta[i]),
+                    'cpc_before': f"${cpc_a[i] / 100:.2f}",
+                    'cpc_after': f"${cpc_b[i] / 100:.2f}",
+                    'cpc_change': int(cpc_delta[i]) / 100
+                }
+                for i in order
+            ],
+            'categories': categories
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the keyword snapshot history")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='List recorded runs')
+    diff_parser = commands.add_parser('diff', help='Compare two runs (run id, index or date)')
+    diff_parser.add_argument('before', nargs='?', default='-2')
+    diff_parser.add_argument('after', nargs='?', default='-1')
+    diff_parser.add_argument('--top', type=int, default=20)
+    keyword_parser = commands.add_parser('keyword', help="One keyword's metrics over time")
+    keyword_parser.add_argument('keyword')
+    keyword_parser.add_argument('--start')
+    keyword_parser.add_argument('--end')
+    args = parser.parse_args()
+
+    history = SnapshotHistory(args.history)
+    if args.command == 'list':
+        for run in history.runs:
+            print(f"{run['run_id']}  {run['recorded_at']}  {run['keywords']:>8,} keywords  "
+                  f"{run['total_volume']:>12,} searches")
+        print(f"📚 {len(history.runs)} runs, {len(history.keywords):,} keywords tracked")
+    elif args.command == 'diff':
+        try:
+            diff = history.diff(args.before, args.after, top=args.top)
+        except (KeyError, ValueError) as e:
+            parser.error(e.args[0])
+        print(json.dumps(diff, indent=2))
+    else:
+        print(json.dumps(history.keyword_history(args.keyword, args.start, args.end), indent=2))
+
+
+if __name__ == "__main__":
+    main()
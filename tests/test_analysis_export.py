@@ -0,0 +1,32 @@
+"""
+Tests for the multi-format analysis export
+"""
+
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analysis_export import AnalysisExporter, ExportRecords
+
+ROWS = [('shockwave therapy', 900, 2.5, 'low'), ('tendon pain', 4400, 1.25, 'high'),
+        ('plantar fasciitis', 2400, 3.0, 'medium')]
+
+
+def test_every_writer_streams_its_own_pass_over_all_rows(tmp_path):
+    passes = []
+
+    def all_rows():
+        passes.append(1)
+        yield from ROWS
+
+    records = ExportRecords({}, all_rows)
+    assert passes == []
+    assert records.summary.rows == 3
+
+    written = AnalysisExporter().export({}, str(tmp_path), ['csv'], all_rows=all_rows)
+    with open(written['all_csv'], newline='', encoding='utf-8') as f:
+        keywords = [row['Keyword'] for row in csv.DictReader(f)]
+    assert keywords == ['tendon pain', 'plantar fasciitis', 'shockwave therapy']
+    assert len(passes) == 2
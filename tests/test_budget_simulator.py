@@ -0,0 +1,22 @@
+"""
+Tests for budget allocation and simulation
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from budget_simulator import BudgetSimulator
+from keyword_store import KeywordStore
+
+
+def test_leads_objective_prefers_high_intent_keywords():
+    store = KeywordStore.from_records([
+        ('shockwave therapy research', 1000, 2.0, 'low', True),
+        ('shockwave therapy device cost', 1000, 3.0, 'low', True)
+    ])
+    simulator = BudgetSimulator(store, seed=0)
+
+    assert simulator.allocate(50, 'clicks').tolist() == [50, 0]
+    assert simulator.allocate(50, 'leads').tolist() == [0, 50]
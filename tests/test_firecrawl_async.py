@@ -0,0 +1,55 @@
+"""
+Regression tests for the asyncio Firecrawl pipeline
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_async import AsyncFirecrawlClient, FirecrawlError
+
+URLS = [f"https://example.com/page-{i}" for i in range(50)]
+
+
+@pytest.fixture
+def client():
+    client = AsyncFirecrawlClient('test-key', max_concurrency=4)
+    yield client
+    client.close()
+
+
+def run(coroutine, timeout: float = 5.0):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout))
+
+
+async def fetch_ok(url: str):
+    return {'data': {'content': url}}
+
+
+def test_consumer_error_stops_pipeline(client):
+    def consume(url, result):
+        raise ValueError(f"cannot analyze {url}")
+
+    # The queue is far smaller than the url list, so producers are blocked
+    # on it when the consumer fails; the pipeline must still return
+    with pytest.raises(ValueError, match="cannot analyze"):
+        run(client.pipeline(URLS, consume, fetch=fetch_ok, queue_size=2))
+
+
+def test_unexpected_fetch_error_fails_only_that_url(client):
+    async def fetch(url: str):
+        if url.endswith('-7'):
+            raise ValueError("response body is not JSON")
+        return await fetch_ok(url)
+
+    results = {}
+    run(client.pipeline(URLS, results.__setitem__, fetch=fetch, queue_size=2))
+
+    assert len(results) == len(URLS)
+    assert isinstance(results[URLS[7]], FirecrawlError)
+    assert isinstance(results[URLS[7]].__cause__, ValueError)
+    assert all(results[url] == {'data': {'content': url}} for url in URLS if url != URLS[7])
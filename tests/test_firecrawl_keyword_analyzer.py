@@ -0,0 +1,32 @@
+"""
+Tests for the keyword analyzer's public analysis
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+
+
+def test_analysis_is_plain_json():
+    analyzer = FirecrawlKeywordAnalyzer()
+    analysis = analyzer.analyze_scraped('https://example.com', {'data': {'content': 'Shockwave therapy equipment'}})
+
+    assert json.loads(json.dumps(analysis))['high_priority_keywords'] == analysis['high_priority_keywords']
+
+
+def test_ranking_follows_on_page_relevance():
+    analyzer = FirecrawlKeywordAnalyzer()
+    tax = analyzer.analyze_scraped('tax', {'data': {'content': 'Section 179 deduction 2025 for medical equipment'}})
+    plantar = analyzer.analyze_scraped('plantar', {'data': {'content': (
+        'Shockwave therapy for plantar fasciitis. Plantar fasciitis shockwave therapy works.'
+    )}})
+
+    for analysis in (tax, plantar):
+        ranked = [row['keyword'] for row in analysis['relevance_ranked_keywords']]
+        assert ranked and set(ranked) <= set(analysis['matched_keywords'])
+    assert tax['relevance_ranked_keywords'][0]['keyword'] == 'section 179 deduction 2025'
+    assert plantar['relevance_ranked_keywords'][0]['keyword'] == 'plantar fasciitis shockwave therapy'
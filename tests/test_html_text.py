@@ -0,0 +1,32 @@
+"""
+Tests for streaming HTML-to-text extraction
+"""
+
+import glob
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from html_text import DEFAULT_CHUNK_SIZE, extract_text, iter_sections
+from keyword_schema import BASE_DIR
+
+PAGES = sorted(glob.glob(os.path.join(BASE_DIR, '*.html')))
+
+
+@pytest.fixture
+def large_page(tmp_path):
+    # Copy that straddles the default chunk boundary mid-word
+    page = tmp_path / 'large.html'
+    filler = 'x' * (DEFAULT_CHUNK_SIZE - 20)
+    page.write_text(f'<main><p>{filler}</p><p>shockwave therapy equipment</p></main>', encoding='utf-8')
+    return str(page)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, DEFAULT_CHUNK_SIZE])
+def test_text_does_not_depend_on_chunk_size(chunk_size, large_page):
+    for page in PAGES + [large_page]:
+        assert extract_text(page, chunk_size) == extract_text(page, 1 << 30)
+        assert list(iter_sections(page, chunk_size)) == list(iter_sections(page, 1 << 30))
@@ -0,0 +1,22 @@
+"""
+Tests for module-aware HubSpot page analysis
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+from hubspot_modules import ModuleLibrary
+
+
+def test_explicit_modules_do_not_stick_to_the_cached_page(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text('<main><p>Shockwave therapy</p>{% module "hero" path="hero-section" %}</main>',
+                    encoding='utf-8')
+    library = ModuleLibrary(FirecrawlKeywordAnalyzer())
+
+    assert library.analyze_page(str(page), ['booking-form'])['modules'] == ['hero_section', 'booking_form']
+    assert library.analyze_page(str(page), ['booking-form'])['modules'] == ['hero_section', 'booking_form']
+    assert library.analyze_page(str(page))['modules'] == ['hero_section']
@@ -0,0 +1,25 @@
+"""
+Tests for stage timers and memory tracing
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from instrumentation import Instrumentation
+
+
+def test_nested_stage_keeps_the_outer_peak():
+    metrics = Instrumentation(trace_memory=True)
+    try:
+        with metrics.stage('outer'):
+            block = bytearray(8 * 1024 * 1024)
+            del block
+            with metrics.stage('inner'):
+                pass
+    finally:
+        metrics.stop()
+
+    assert metrics.timers['outer'].peak_bytes >= 8 * 1024 * 1024
+    assert metrics.timers['inner'].peak_bytes < 8 * 1024 * 1024
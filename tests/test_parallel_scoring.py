@@ -0,0 +1,25 @@
+"""
+Tests for shared-memory parallel keyword scoring
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from keyword_store import KeywordStore
+from parallel_scoring import ParallelScorer
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_empty_store_scores_no_matches(workers):
+    store = KeywordStore.from_records([('shockwave therapy', 900, 2.5, 'low', True)])
+    empty = store.select(np.zeros(len(store), dtype=np.bool_))
+
+    results = ParallelScorer(empty, workers).score({'index.html': 'Shockwave therapy for tendon pain'})
+
+    assert results['index.html']['matched_keywords'] == 0
+    assert results['index.html']['relevance_ranked_keywords'] == []
@@ -0,0 +1,22 @@
+"""
+Tests for the keyword snapshot history
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from snapshot_history import SnapshotHistory
+
+
+def test_diff_needs_two_runs(tmp_path):
+    history = SnapshotHistory(str(tmp_path))
+    history.record({}, [('shockwave therapy', 900, 2.5, 'low')])
+
+    with pytest.raises(ValueError, match='at least two recorded runs'):
+        history.diff()
+    with pytest.raises(KeyError):
+        history.resolve(-2)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Watch mode: re-analyze local landing pages and HubSpot modules on save
+Keeps one analyzer warm, watches the inputs with inotify (polling elsewhere),
+debounces bursts of saves and rewrites only the reports whose inputs changed
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from bulk_analyze import output_name
+from hubspot_modules import file_validator, module_key, parse_module_tags
+from keyword_record import json_default
+from keyword_schema import BASE_DIR, DEFAULT_SEED_PATH
+
+DEFAULT_PAGES = [os.path.join(BASE_DIR, 'index.html'), os.path.join(BASE_DIR, 'hubspot-final-complete.html')]
+DEFAULT_OUTPUT_DIR = os.path.join('keyword_reports', 'watch')
+
+# A batch of changes is analyzed once no further save arrives for this long,
+# or once it has been collecting for MAX_DEBOUNCE_DELAY
+DEFAULT_DEBOUNCE = 0.05
+MAX_DEBOUNCE_DELAY = 1.0
+
+DEFAULT_POLL_INTERVAL = 0.05
+
+# Per-run details that are printed but kept out of the written reports, so
+# a save that changes no copy leaves the report file untouched
+RUN_FIELDS = ('changed_sections', 'updated_categories', 'parsed')
+
+# inotify(7) event bits
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+# Editors either rewrite a file in place (close-after-write) or save a
+# temporary file and rename it over the original (moved-to)
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+_EVENT = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Portable watcher that compares mtime and size on every poll"""
+
+    name = 'polling'
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self._files: Dict[str, str] = {}
+        self._dirs: Dict[str, Dict[str, str]] = {}
+
+    @staticmethod
+    def _listing(directory: str) -> Dict[str, str]:
+        try:
+            return {entry.path: file_validator(entry.path) for entry in os.scandir(directory) if entry.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    def watch(self, paths: Iterable[str]):
+        """Watch files, or every file directly inside a directory"""
+        for path in map(os.path.abspath, paths):
+            if os.path.isdir(path):
+                self._dirs[path] = self._listing(path)
+            else:
+                self._files[path] = file_validator(path)
+
+    def _scan(self) -> Set[str]:
+        changed = set()
+        for path, validator in self._files.items():
+            current = file_validator(path)
+            if current != validator:
+                self._files[path] = current
+                changed.add(path)
+        for directory, listing in self._dirs.items():
+            current = self._listing(directory)
+            changed.update(path for path in listing.keys() | current.keys() if listing.get(path) != current.get(path))
+            self._dirs[directory] = current
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Changed paths, blocking until there are some or timeout seconds pass"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._scan()
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux watcher on inotify, called through ctypes
+
+    Watches the directories holding the files, so saves that replace a
+    file by renaming a new one over it are still seen.
+    """
+
+    name = 'inotify'
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.fd = fd
+        self._wd: Dict[int, str] = {}
+        self._files: Set[str] = set()
+        self._whole_dirs: Set[str] = set()
+
+    def _watch_dir(self, directory: str):
+        if directory in self._wd.values():
+            return
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._wd[wd] = directory
+
+    def watch(self, paths: Iterable[str]):
+        """Watch files, or every file directly inside a directory"""
+        for path in map(os.path.abspath, paths):
+            if os.path.isdir(path):
+                self._whole_dirs.add(path)
+                self._watch_dir(path)
+            else:
+                self._files.add(path)
+                self._watch_dir(os.path.dirname(path))
+
+    def _read(self) -> Set[str]:
+        data = b''
+        while True:
+            try:
+                chunk = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            data += chunk
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0'))
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; treat everything watched as changed
+                changed.update(self._files)
+                changed.update(os.path.join(d, n) for d in self._whole_dirs for n in os.listdir(d))
+                continue
+            directory = self._wd.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if path in self._files or directory in self._whole_dirs:
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Changed paths, blocking until there are some or timeout seconds pass"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if ready:
+                changed = self._read()
+                if changed:
+                    return changed
+            elif deadline is not None:
+                return set()
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(poll: bool = False, interval: float = DEFAULT_POLL_INTERVAL):
+    """inotify where the platform has it, otherwise a polling watcher"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval)
+
+
+def next_batch(watcher, debounce: float = DEFAULT_DEBOUNCE, max_delay: float = MAX_DEBOUNCE_DELAY) -> Set[str]:
+    """Block for the next change, then keep collecting until saves stop for `debounce` seconds"""
+    changed = watcher.wait()
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return changed
+        more = watcher.wait(min(debounce, remaining))
+        if not more:
+            return changed
+        changed |= more
+
+
+class WatchSession:
+    """Report targets, the files each one was built from, and their last output
+
+    Plain pages go through the section-level incremental analyzer; pages
+    with HubSpot module tags and the modules themselves go through the
+    module library, so an edited module only re-renders that module.
+    """
+
+    def __init__(self, analyzer, pages: Iterable[str] = DEFAULT_PAGES, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 seed_path: str = DEFAULT_SEED_PATH):
+        self.analyzer = analyzer
+        self.library = analyzer.module_library
+        self.pages = [os.path.abspath(page) for page in pages]
+        self.output_dir = output_dir
+        self.seed_path = os.path.abspath(seed_path)
+        self.inputs: Dict[str, Set[str]] = {}
+        self._reports: Dict[str, str] = {}
+        self._keywords: Dict[str, List[str]] = {}
+
+    @property
+    def modules(self) -> List[str]:
+        """HTML path of every local module"""
+        return sorted({os.path.abspath(html_path) for html_path, _ in self.library.sources.values()})
+
+    def watched_paths(self) -> List[str]:
+        return self.pages + [os.path.abspath(self.library.module_dir), self.seed_path]
+
+    def targets(self) -> List[str]:
+        return self.pages + self.modules
+
+    def _module_files(self, name: str) -> Set[str]:
+        source = self.library.sources.get(module_key(name))
+        return {os.path.abspath(path) for path in source if path} if source else set()
+
+    def analyze(self, target: str) -> Dict:
+        """Analyze one target and record which files it was built from"""
+        if target not in self.pages:
+            self.inputs[target] = self._module_files(target)
+            return self.analyzer.analyze_hubspot_page(modules=[target])
+
+        with open(target, 'r', encoding='utf-8') as f:
+            references = parse_module_tags(f.read())
+        inputs = {target}
+        if not references:
+            self.inputs[target] = inputs
+            return self.analyzer.analyze_incremental(target)
+        for name, _ in references:
+            inputs |= self._module_files(name)
+        self.inputs[target] = inputs
+        return self.analyzer.analyze_hubspot_page(target)
+
+    def emit(self, target: str) -> Dict:
+        """Re-analyze a target and rewrite its report if the result changed"""
+        start = time.perf_counter()
+        try:
+            result = self.analyze(target)
+        except FileNotFoundError:
+            self.inputs[target] = {target}
+            return {'target': target, 'missing': True}
+        details = {field: result.pop(field) for field in RUN_FIELDS if field in result}
+
+        report = json.dumps(result, indent=2, default=json_default)
+        path = os.path.join(self.output_dir, output_name(target) + '.json')
+        written = self._reports.get(target) != report
+        if written:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(report)
+            os.replace(path + '.tmp', path)
+            self._reports[target] = report
+            self.analyzer.metrics.incr('watch_reports_written')
+
+        keywords = result['matched_keywords']
+        previous = set(self._keywords.get(target, keywords))
+        self._keywords[target] = keywords
+        return {
+            'target': target,
+            'report': path,
+            'written': written,
+            'keywords': len(keywords),
+            'added': [k for k in keywords if k not in previous],
+            'removed': sorted(previous.difference(keywords)),
+            'details': details,
+            'ms': (time.perf_counter() - start) * 1000
+        }
+
+    def emit_all(self) -> List[Dict]:
+        return [self.emit(target) for target in self.targets()]
+
+    def refresh(self, changed: Iterable[str]) -> List[Dict]:
+        """Re-emit the reports built from any of the changed files"""
+        changed = {os.path.abspath(path) for path in changed}
+        if self.seed_path in changed:
+            # New keyword data: every index and every report is rebuilt
+            from keyword_store import load_store
+            self.analyzer.set_store(load_store(self.seed_path).core_keywords())
+            self._reports.clear()
+            return self.emit_all()
+
+        modules_changed = False
+        module_dir = os.path.abspath(self.library.module_dir)
+        if any(os.path.dirname(path) == module_dir for path in changed):
+            before = self.modules
+            self.library.rescan()
+            modules_changed = self.modules != before
+            for target in set(self.inputs).difference(self.targets()):
+                # The module is gone, and so is its report
+                del self.inputs[target]
+                self._reports.pop(target, None)
+                self._keywords.pop(target, None)
+                report = os.path.join(self.output_dir, output_name(target) + '.json')
+                if os.path.exists(report):
+                    os.remove(report)
+
+        # With a module added or removed, any page's module tags may now
+        # resolve differently
+        affected = [
+            target for target in self.targets()
+            if target not in self.inputs or self.inputs[target] & changed
+            or (modules_changed and target in self.pages)
+        ]
+        return [self.emit(target) for target in affected]
+
+    def run(self, watcher, debounce: float = DEFAULT_DEBOUNCE):
+        """Watch until interrupted, printing one line per re-emitted report"""
+        watcher.watch(self.watched_paths())
+        while True:
+            changed = next_batch(watcher, debounce)
+            self.analyzer.metrics.incr('watch_batches')
+            for summary in self.refresh(changed):
+                print(format_summary(summary), flush=True)
+
+
+def format_summary(summary: Dict) -> str:
+    name = os.path.relpath(summary['target'])
+    if summary.get('missing'):
+        return f"⚠️  {name}: not found, waiting for it to reappear"
+    details = summary['details']
+    if 'changed_sections' in details:
+        work = f"{details['changed_sections']} sections re-matched"
+    elif 'parsed' in details:
+        work = f"{details['parsed']['modules']} modules re-rendered"
+    else:
+        work = ''
+    changes = [f"+{k}" for k in summary['added']] + [f"-{k}" for k in summary['removed']]
+    delta = f"  {', '.join(changes[:5])}{', …' if len(changes) > 5 else ''}" if changes else ''
+    state = 'updated' if summary['written'] else 'unchanged'
+    return (f"{'🔄' if summary['written'] else '✔️ '} {name}: {summary['keywords']} keywords {state}"
+            f"{' (' + work + ')' if work else ''} in {summary['ms']:.1f} ms{delta}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-analyze landing pages and HubSpot modules on every save")
+    parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES, help='Local pages to watch')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='Seconds of quiet after a save before re-analyzing')
+    parser.add_argument('--poll', action='store_true', help='Poll file timestamps instead of using inotify')
+    parser.add_argument('--once', action='store_true', help='Write every report once and exit')
+    args = parser.parse_args(argv)
+
+    from firecrawl_keyword_analyzer import FirecrawlKeywordAnalyzer
+
+    session = WatchSession(FirecrawlKeywordAnalyzer(), args.pages, args.output_dir)
+    for summary in session.emit_all():
+        print(format_summary(summary))
+    if args.once:
+        return
+
+    watcher = create_watcher(args.poll)
+    print(f"👀 Watching {len(session.pages)} pages and {len(session.modules)} modules "
+          f"({watcher.name}); reports in {args.output_dir}/")
+    try:
+        session.run(watcher, args.debounce)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()